@@ -0,0 +1,46 @@
+"""add_timeline_entries
+
+Revision ID: 3b9d41c7e2a0
+Revises: ec5c8ba3a84f
+Create Date: 2026-10-18 11:40:02.517204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9d41c7e2a0'
+down_revision: Union[str, Sequence[str], None] = 'ec5c8ba3a84f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('timeline_entries',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('author_id', sa.Integer(), nullable=False),
+    sa.Column('fecha_creacion', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['author_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'post_id', name='unique_timeline_entry')
+    )
+    op.create_index('ix_timeline_user_fecha_post', 'timeline_entries', ['user_id', 'fecha_creacion', 'post_id'], unique=False)
+    op.create_index(op.f('ix_timeline_entries_post_id'), 'timeline_entries', ['post_id'], unique=False)
+    # Publicaciones por autor (lectura de autores celebridad en el feed)
+    op.create_index('ix_posts_owner_fecha_id', 'posts', ['owner_id', 'fecha_creacion', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_posts_owner_fecha_id', table_name='posts')
+    op.drop_index(op.f('ix_timeline_entries_post_id'), table_name='timeline_entries')
+    op.drop_index('ix_timeline_user_fecha_post', table_name='timeline_entries')
+    op.drop_table('timeline_entries')
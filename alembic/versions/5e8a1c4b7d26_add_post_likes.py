@@ -0,0 +1,43 @@
+"""add_post_likes
+
+Revision ID: 5e8a1c4b7d26
+Revises: 7c2e5f0a9d13
+Create Date: 2026-10-18 14:22:41.517930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8a1c4b7d26'
+down_revision: Union[str, Sequence[str], None] = '7c2e5f0a9d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('post_likes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('post_id', sa.Integer(), nullable=False),
+    sa.Column('fecha_creacion', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['post_id'], ['posts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'post_id', name='unique_post_like')
+    )
+    op.create_index(op.f('ix_post_likes_id'), 'post_likes', ['id'], unique=False)
+    op.create_index(op.f('ix_post_likes_post_id'), 'post_likes', ['post_id'], unique=False)
+    op.add_column('posts', sa.Column('likes_count', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('posts', 'likes_count')
+    op.drop_index(op.f('ix_post_likes_post_id'), table_name='post_likes')
+    op.drop_index(op.f('ix_post_likes_id'), table_name='post_likes')
+    op.drop_table('post_likes')
@@ -0,0 +1,30 @@
+"""add_uploads_writing_claim
+
+Revision ID: 6a1f0c8e3d52
+Revises: f2c6d8a4b915
+Create Date: 2026-10-18 22:47:09.316824
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6a1f0c8e3d52'
+down_revision: Union[str, Sequence[str], None] = 'f2c6d8a4b915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('uploads', sa.Column('writing_token', sa.String(length=32), nullable=True))
+    op.add_column('uploads', sa.Column('writing_until', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('uploads', 'writing_until')
+    op.drop_column('uploads', 'writing_token')
@@ -0,0 +1,43 @@
+"""add_user_counters
+
+Revision ID: 7c2e5f0a9d13
+Revises: 3b9d41c7e2a0
+Create Date: 2026-10-18 13:05:27.904311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c2e5f0a9d13'
+down_revision: Union[str, Sequence[str], None] = '3b9d41c7e2a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('post_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('users', sa.Column('follower_count', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('users', sa.Column('following_count', sa.Integer(), server_default='0', nullable=False))
+    op.create_index(op.f('ix_users_follower_count'), 'users', ['follower_count'], unique=False)
+
+    # Valores iniciales; después se mantienen en cada escritura
+    # (python -m app.services.user_stats corrige la deriva por bloques)
+    op.execute(
+        "UPDATE users SET "
+        "post_count = (SELECT COUNT(*) FROM posts WHERE posts.owner_id = users.id), "
+        "follower_count = (SELECT COUNT(*) FROM user_follows WHERE user_follows.followed_id = users.id), "
+        "following_count = (SELECT COUNT(*) FROM user_follows WHERE user_follows.follower_id = users.id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_users_follower_count'), table_name='users')
+    op.drop_column('users', 'following_count')
+    op.drop_column('users', 'follower_count')
+    op.drop_column('users', 'post_count')
@@ -0,0 +1,59 @@
+"""add_posts_full_text_search
+
+Revision ID: 9d4f2b6a1e58
+Revises: 5e8a1c4b7d26
+Create Date: 2026-10-18 15:10:03.284716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d4f2b6a1e58'
+down_revision: Union[str, Sequence[str], None] = '5e8a1c4b7d26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Misma expresión que app.models.posts.post_search_vector
+SEARCH_VECTOR = (
+    "(setweight(to_tsvector('spanish'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('spanish'::regconfig, coalesce(content, '')), 'B'))"
+)
+
+SQLITE_FTS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5("
+    "title, content, content='posts', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN "
+    "INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF title, content ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content); "
+    "INSERT INTO posts_fts(rowid, title, content) VALUES (new.id, new.title, new.content); END",
+    # Indexar las publicaciones existentes
+    "INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')",
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.create_index('ix_posts_search', 'posts', [sa.text(SEARCH_VECTOR)], unique=False, postgresql_using='gin')
+    elif dialect == 'sqlite':
+        for statement in SQLITE_FTS:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.drop_index('ix_posts_search', table_name='posts', postgresql_using='gin')
+    elif dialect == 'sqlite':
+        for trigger in ('posts_fts_ai', 'posts_fts_ad', 'posts_fts_au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS posts_fts")
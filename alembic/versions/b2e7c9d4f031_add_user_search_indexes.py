@@ -0,0 +1,40 @@
+"""add_user_search_indexes
+
+Revision ID: b2e7c9d4f031
+Revises: 9d4f2b6a1e58
+Create Date: 2026-10-18 16:02:47.193305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e7c9d4f031'
+down_revision: Union[str, Sequence[str], None] = '9d4f2b6a1e58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_user_profiles_user_id'), 'user_profiles', ['user_id'], unique=False)
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.create_index(
+            'ix_users_username_lower_pattern', 'users', [sa.text('lower(username) text_pattern_ops')], unique=False
+        )
+        op.create_index(
+            'ix_user_profiles_full_name_trgm', 'user_profiles', [sa.text('full_name gin_trgm_ops')],
+            unique=False, postgresql_using='gin'
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_user_profiles_full_name_trgm', table_name='user_profiles', postgresql_using='gin')
+        op.drop_index('ix_users_username_lower_pattern', table_name='users')
+    op.drop_index(op.f('ix_user_profiles_user_id'), table_name='user_profiles')
@@ -0,0 +1,29 @@
+"""add_users_fecha_actualizacion
+
+Revision ID: c81f3a5e6b9d
+Revises: b2e7c9d4f031
+Create Date: 2026-10-18 16:48:12.604381
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81f3a5e6b9d'
+down_revision: Union[str, Sequence[str], None] = 'b2e7c9d4f031'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('fecha_actualizacion', sa.DateTime(), nullable=True))
+    op.execute("UPDATE users SET fecha_actualizacion = fecha_creacion")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'fecha_actualizacion')
@@ -0,0 +1,28 @@
+"""add_posts_video_url
+
+Revision ID: e5b8f3d20a71
+Revises: d4a7e2c91f60
+Create Date: 2026-10-18 19:12:08.551320
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b8f3d20a71'
+down_revision: Union[str, Sequence[str], None] = 'd4a7e2c91f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('posts', sa.Column('video_url', sa.String(length=255), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('posts', 'video_url')
@@ -0,0 +1,28 @@
+"""add_posts_keyset_index
+
+Revision ID: ec5c8ba3a84f
+Revises: f61ffe6bc07e
+Create Date: 2026-10-18 09:12:40.118532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ec5c8ba3a84f'
+down_revision: Union[str, Sequence[str], None] = 'f61ffe6bc07e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Índice compuesto para la paginación por cursor de /api/posts/
+    op.create_index('ix_posts_published_fecha_id', 'posts', ['is_published', 'fecha_creacion', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_posts_published_fecha_id', table_name='posts')
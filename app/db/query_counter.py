@@ -0,0 +1,44 @@
+"""
+Contador de consultas SQL por petición
+Permite detectar (y comprobar en tests) problemas N+1 en las rutas
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """Número de sentencias SQL ejecutadas dentro de un contexto"""
+
+    def __init__(self):
+        self.count = 0
+
+
+_current_counter: ContextVar[Optional[QueryCounter]] = ContextVar(
+    "sql_query_counter", default=None
+)
+
+
+@contextmanager
+def count_queries():
+    """
+    Cuenta las sentencias ejecutadas por cualquier engine (síncrono o asíncrono)
+    dentro del bloque, incluido el código que corre en el threadpool de FastAPI
+    """
+    counter = QueryCounter()
+    token = _current_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        _current_counter.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _current_counter.get()
+    if counter is not None:
+        counter.count += 1
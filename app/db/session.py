@@ -1,6 +1,7 @@
 from app.db.base import Base
 from app.config import load_settings  # ✅ Cambiado a load_settings
 from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
 
 # Cargar configuración
@@ -23,6 +24,38 @@ SessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
+
+# Convierte la URL síncrona en su equivalente asíncrono (asyncpg / aiosqlite)
+def to_async_url(url: str) -> str:
+    if url.startswith(("postgres://", "postgresql://", "postgresql+psycopg2://")):
+        return "postgresql+asyncpg://" + url.split("://", 1)[1]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url.split("://", 1)[1]
+    return url
+
+
+ASYNC_DATABASE_URL = to_async_url(str(settings.DATABASE_URL))
+
+# Crear engine asíncrono para las rutas `async def`
+if ASYNC_DATABASE_URL.startswith("sqlite"):
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=settings.DEBUG)
+else:
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_size=10,
+        max_overflow=20,
+        pool_recycle=3600,
+        echo=settings.DEBUG
+    )
+
+# Crear session factory asíncrona
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 # Función para obtener sesión de base de datos
 def get_db():
     db = SessionLocal()
@@ -31,6 +64,12 @@ def get_db():
     finally:
         db.close()
 
+
+# Función para obtener sesión asíncrona de base de datos (rutas `async def`)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # Función para testear conexión a la base de datos
 def test_db_connection():
     try:
@@ -40,4 +79,4 @@ def test_db_connection():
         return True
     except Exception as e:
         print(f"Error de conexión a la base de datos: {e}")
-        return False
\ No newline at end of file
+        return False
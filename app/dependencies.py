@@ -1,46 +1,97 @@
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.db.session import get_async_db
 from app.models.user_models import User
 from app.schemas.user_schemas import Token
-import os
+from app.security import verify_token
+from app.services.identity_cache import AuthIdentity, get_identity, identity_cache
 
 # Configuración
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/login")
-SECRET_KEY = os.getenv("SECRET_KEY")
-ALGORITHM = os.getenv("ALGORITHM", "HS256")
+optional_oauth2_scheme = OAuth2PasswordBearer(
+    tokenUrl="api/auth/login", auto_error=False
+)
 
-async def get_current_user(
+
+async def get_current_identity(
+    request: Request,
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_async_db)
+) -> AuthIdentity:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="No se pudieron validar las credenciales",
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")  # Cambiado de user_id a username
-        if username is None:
-            raise credentials_exception
-    except JWTError:
+    # Verificación con caché compartida (app.security.verify_token)
+    payload = verify_token(token)
+    if payload is None:
         raise credentials_exception
     
-    # Buscar por username en lugar de ID
-    user = db.query(User).filter(User.username == username).first()
-    if user is None or not user.es_activo:
+    username: str = payload.get("sub")  # Cambiado de user_id a username
+    if username is None:
         raise credentials_exception
     
+    # Buscar por username (caché de identidades, la base solo se consulta en un fallo)
+    identity = await get_identity(db, username)
+    if identity is None or not identity.is_active:
+        raise credentials_exception
+
+    # Para el log de la petición (RequestContextMiddleware)
+    request.state.user_id = identity.id
+    return identity
+
+
+async def get_optional_identity(
+    request: Request,
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[AuthIdentity]:
+    # Rutas públicas que personalizan la respuesta si hay sesión (p. ej. is_liked)
+    if not token:
+        return None
+    payload = verify_token(token)
+    if payload is None or payload.get("sub") is None:
+        return None
+    identity = await get_identity(db, payload["sub"])
+    if identity is None or not identity.is_active:
+        return None
+    request.state.user_id = identity.id
+    return identity
+
+
+async def get_current_active_identity(
+    identity: AuthIdentity = Depends(get_current_identity)
+) -> AuthIdentity:
+    if not identity.is_active:
+        raise HTTPException(status_code=400, detail="User inactivo")
+    return identity
+
+
+async def get_current_user(
+    identity: AuthIdentity = Depends(get_current_identity),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    # Solo para rutas que necesitan el usuario completo (p. ej. /users/me)
+    user = await db.get(User, identity.id)
+    if user is None:
+        identity_cache.invalidate(user_id=identity.id, username=identity.username)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="No se pudieron validar las credenciales",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     return user
 
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
-    if not current_user.es_activo:
+    if not current_user.is_active:
         raise HTTPException(status_code=400, detail="User inactivo")
-    return current_user
\ No newline at end of file
+    return current_user
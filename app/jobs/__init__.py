@@ -0,0 +1,8 @@
+"""
+Handlers de la cola de trabajos (app.services.job_queue)
+
+Importar este paquete registra todos los tipos de trabajo; los workers
+(`python -m app.worker`) lo importan al arrancar.
+"""
+
+from app.jobs import feed, maintenance, videos  # noqa: F401
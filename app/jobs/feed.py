@@ -0,0 +1,12 @@
+"""
+Trabajos del feed
+"""
+
+from app.services.feed import fan_out_post_in_background
+from app.services.job_queue import JobContext, job_handler
+
+
+@job_handler("feed.fan_out")
+def fan_out(ctx: JobContext):
+    """Fan-out por lotes de una publicación de un autor con muchos seguidores"""
+    fan_out_post_in_background(ctx.db.get_bind(), ctx.payload["post_id"])
@@ -0,0 +1,19 @@
+"""
+Trabajos de mantenimiento
+"""
+
+from app.services.job_queue import JobContext, job_handler
+from app.services.uploads import expire_uploads
+from app.services.user_stats import reconcile_user_stats
+
+
+@job_handler("user_stats.reconcile")
+def reconcile_user_counters(ctx: JobContext) -> dict:
+    """Corrige la deriva de los contadores desnormalizados de usuarios"""
+    return {"fixed": reconcile_user_stats(ctx.db)}
+
+
+@job_handler("uploads.expire")
+def expire_abandoned_uploads(ctx: JobContext) -> dict:
+    """Borra las subidas por fragmentos abandonadas (UPLOAD_EXPIRE_HOURS)"""
+    return {"expired": expire_uploads(ctx.db)}
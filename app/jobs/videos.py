@@ -0,0 +1,101 @@
+"""
+Render de videos (trabajos `video.render`, ver app.services.videos)
+"""
+
+import hashlib
+import os
+
+from app.models.posts import Post
+from app.services import feed
+from app.services.assets import asset_url, store_asset
+from app.services.derivatives import render_derivatives_now
+from app.services.job_queue import JobContext, enqueue_job, job_handler
+from app.services.media_storage import media_path
+from app.services.response_cache import first_page_tag, response_cache
+from app.services.user_stats import counter_update
+from app.services.video_renderer import RenderRequest, load_renderer
+from app.services.videos import VIDEO_JOB_KIND
+
+# Cada cuántos puntos porcentuales se guarda el progreso (cada guardado es un UPDATE)
+PROGRESS_STEP = 5
+
+
+@job_handler(VIDEO_JOB_KIND)
+def render_video(ctx: JobContext) -> dict:
+    payload = ctx.payload
+    request = RenderRequest(
+        prompt=payload["prompt"],
+        width=payload["width"],
+        height=payload["height"],
+        fps=payload["fps"],
+        duration_seconds=payload["duration_seconds"],
+    )
+    reported = 0
+
+    def progress(fraction: float):
+        nonlocal reported
+        # El 100 % lo marca complete_job junto con la publicación
+        percent = min(99, int(fraction * 100))
+        if percent >= reported + PROGRESS_STEP:
+            reported = percent
+            ctx.report_progress(percent)
+
+    # Se escribe en un temporal que pasa a ser un asset:
+    # nunca queda un video a medias publicado
+    owner_id = payload["owner_id"]
+    partial = media_path(f"uploads/render-{ctx.job.id}-{ctx.job.lock_token}.part")
+    digest = hashlib.sha256()
+    try:
+        with open(partial, "wb") as output:
+            result = load_renderer()(request, _HashingWriter(output, digest), progress)
+        asset = store_asset(
+            ctx.db,
+            partial,
+            digest.hexdigest(),
+            os.path.getsize(partial),
+            result.media_type,
+            owner_id,
+        )
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    # El worker ya corre fuera del proceso web: portada y miniatura se generan aquí
+    render_derivatives_now(asset.sha256, media_path(asset.path), asset.media_type)
+
+    post = Post(
+        title=payload["title"],
+        content=payload["prompt"],
+        video_url=asset_url(asset),
+        is_published=payload["is_published"],
+        owner_id=owner_id,
+    )
+    db = ctx.db
+    db.add(post)
+    db.flush()
+    db.execute(counter_update(owner_id, post_count=1))
+    strategy = feed.publish_post(db, post) if post.is_published else None
+    if strategy == feed.FANOUT_BACKGROUND:
+        # Se reparte en otro trabajo, que solo será visible si este termina bien
+        enqueue_job(db, "feed.fan_out", {"post_id": post.id})
+    if response_cache.shared:
+        # Después del commit: antes, una lectura concurrente volvería a cachear
+        # la página sin el video
+        ctx.after_commit(response_cache.invalidate, first_page_tag(post.is_published))
+    return {
+        "post_id": post.id,
+        "video_url": post.video_url,
+        "frames": result.frames,
+        "media_type": result.media_type,
+    }
+
+
+class _HashingWriter:
+    """Calcula el SHA-256 del video mientras el renderer lo escribe"""
+
+    def __init__(self, output, digest):
+        self.output = output
+        self.digest = digest
+
+    def write(self, data: bytes) -> int:
+        self.digest.update(data)
+        return self.output.write(data)
@@ -0,0 +1,178 @@
+"""
+Configuración de logging para Visart Backend
+
+Los registros se encolan desde el bucle de eventos (QueueHandler) y un hilo en
+segundo plano (QueueListener) los formatea como JSON y los escribe en stdout,
+así que ninguna petición espera a la E/S del log.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+# Configuración
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # json | text
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+LOG_SAMPLE_RATE_2XX = float(os.getenv("LOG_SAMPLE_RATE_2XX", 1.0))
+LOG_SLOW_REQUEST_MS = float(os.getenv("LOG_SLOW_REQUEST_MS", 1000))
+
+# Atributos propios de LogRecord; el resto (p. ej. los de `extra=`) se añaden al JSON
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message",
+    "asctime",
+}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Una línea JSON por registro con los campos de `extra=` al mismo nivel
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Añade el request_id de la petición en curso a todos los registros
+
+    Se ejecuta en el hilo que registra (antes de encolar), donde el ContextVar
+    todavía tiene valor.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            from app.middlewares.request_context import get_request_id
+
+            request_id = get_request_id()
+            if request_id is not None:
+                record.request_id = request_id
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler que descarta registros (y los cuenta) si la cola está llena,
+    en lugar de bloquear o escribir un traceback por cada uno
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Como QueueHandler.prepare pero conserva los campos de `extra=` y deja
+        # el traceback ya formateado en exc_text
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def should_log_request(
+    status_code: int, duration_ms: float, sample_rate: Optional[float] = None
+) -> bool:
+    """
+    Los errores (>= 400) y las peticiones lentas se registran siempre; el resto,
+    con probabilidad LOG_SAMPLE_RATE_2XX
+    """
+    if status_code >= 400 or duration_ms >= LOG_SLOW_REQUEST_MS:
+        return True
+    rate = LOG_SAMPLE_RATE_2XX if sample_rate is None else sample_rate
+    return rate >= 1 or random.random() < rate
+
+
+def request_log_level(status_code: int, duration_ms: float) -> int:
+    if status_code >= 500:
+        return logging.ERROR
+    if status_code >= 400 or duration_ms >= LOG_SLOW_REQUEST_MS:
+        return logging.WARNING
+    return logging.INFO
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[DroppingQueueHandler] = None
+
+
+def setup_logging(
+    level="INFO", log_format: str = LOG_FORMAT, stream=None
+) -> QueueListener:
+    """
+    Sustituye los handlers del logger raíz por un QueueHandler y arranca el
+    QueueListener que escribe en `stream` (stdout por defecto)
+    """
+    global _listener, _queue_handler
+    shutdown_logging()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    if log_format == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(
+            logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s")
+        )
+
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    _queue_handler = DroppingQueueHandler(log_queue)
+    _queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(level.upper() if isinstance(level, str) else level)
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """
+    Vacía la cola y detiene el hilo escritor (idempotente)
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def logging_stats() -> dict:
+    """Contadores para monitorización"""
+    if _queue_handler is None:
+        return {"queued": 0, "dropped": 0}
+    return {"queued": _queue_handler.queue.qsize(), "dropped": _queue_handler.dropped}
+
+
+atexit.register(shutdown_logging)
@@ -3,15 +3,30 @@ from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 from app.config import load_settings
+from app.middlewares.query_count import QueryCountMiddleware
+from app.middlewares.request_context import RequestContextMiddleware
+from app.db.session import async_engine
+from app.services.password_hashing import password_hasher
+from app.services.identity_cache import identity_cache
+from app.services.like_counter import like_counter
+from app.services.user_search import user_index
+from app.services.response_cache import response_cache
+from app.services.email_queue import email_queue
+from app.services.derivatives import derivative_generator
+from app.services.notifications import notification_hub
+from app.security import token_cache_stats
+from app.logging_config import logging_stats, setup_logging
+from app.utils.responses import DefaultJSONResponse
 import logging
-
-# Configurar logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger("visart-backend")
+import os
 
 # Cargar configuración
 settings = load_settings()
 
+# Configurar logging (JSON en un hilo escritor; las peticiones solo encolan)
+setup_logging(settings.LOG_LEVEL)
+logger = logging.getLogger("visart-backend")
+
 # Crear motor de base de datos
 engine = create_engine(str(settings.DATABASE_URL), echo=settings.DEBUG)
 
@@ -24,6 +39,12 @@ try:
     from app.routes.user_routes import router as user_routes_router
     from app.routes.auth import router as auth_router
     from app.routes.health import router as health_router
+    from app.routes.feed import router as feed_router
+    from app.routes.jobs import router as jobs_router
+    from app.routes.videos import router as videos_router
+    from app.routes.uploads import router as uploads_router
+    from app.routes.assets import router as assets_router
+    from app.routes.notifications import router as notifications_router
     HAS_ROUTERS = True
 except ImportError as e:
     logger.warning(f"Algunos routers no disponibles: {e}")
@@ -33,7 +54,8 @@ except ImportError as e:
 app = FastAPI(
     title="Visart Backend API",
     version="1.0.0",
-    description="API para la generación de videos con IA"
+    description="API para la generación de videos con IA",
+    default_response_class=DefaultJSONResponse
 )
 
 # Configurar CORS
@@ -45,6 +67,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Cabecera X-SQL-Query-Count (diagnóstico de N+1; desactivada por defecto)
+if os.getenv("SQL_QUERY_COUNT_HEADER", "false").lower() in ("1", "true", "yes"):
+    app.add_middleware(QueryCountMiddleware)
+
+# Log, X-Request-ID y X-Response-Time en una sola pasada ASGI
+# (se añade la última: es la más externa)
+app.add_middleware(RequestContextMiddleware)
+
 # Dependencia para obtener la sesión de base de datos
 def get_db():
     db = SessionLocal()
@@ -65,7 +95,12 @@ async def root():
             "docs": "/docs",
             "users": "/api/users",
             "auth": "/api/auth",
-            "posts": "/api/posts"
+            "posts": "/api/posts",
+            "feed": "/api/feed",
+            "jobs": "/api/jobs",
+            "videos": "/api/videos",
+            "uploads": "/api/uploads",
+            "assets": "/api/assets"
         }
     }
 
@@ -77,7 +112,18 @@ async def health_check():
             "status": "healthy", 
             "service": "visart-backend",
             "environment": settings.ENV,
-            "routers_loaded": HAS_ROUTERS
+            "routers_loaded": HAS_ROUTERS,
+            "caches": {
+                "identity": identity_cache.stats(),
+                "tokens": token_cache_stats(),
+                "responses": response_cache.stats()
+            },
+            "likes_buffer": like_counter.stats(),
+            "user_search": user_index.stats(),
+            "email_queue": email_queue.stats(),
+            "derivatives": derivative_generator.stats(),
+            "notifications": notification_hub.stats(),
+            "logging": logging_stats()
         }
     except Exception as e:
         logger.error(f"Health check failed: {e}")
@@ -89,18 +135,78 @@ if HAS_ROUTERS:
     app.include_router(posts_router, prefix="/api/posts", tags=["posts"])
     app.include_router(user_routes_router, prefix="/api", tags=["users"])
     app.include_router(auth_router, prefix="/api/auth", tags=["auth"])
+    app.include_router(feed_router, prefix="/api", tags=["feed"])
+    app.include_router(jobs_router, prefix="/api", tags=["jobs"])
+    app.include_router(videos_router, prefix="/api", tags=["videos"])
+    app.include_router(uploads_router, prefix="/api", tags=["uploads"])
+    app.include_router(assets_router, prefix="/api", tags=["assets"])
+    app.include_router(notifications_router, tags=["notifications"])
 else:
     logger.warning("Algunos routers no se cargaron")
 
-# Middleware para logging
-@app.middleware("http")
-async def log_requests(request, call_next):
-    logger.info(f"Peticion: {request.method} {request.url}")
-    response = await call_next(request)
-    logger.info(f"Respuesta: {response.status_code} para {request.method} {request.url}")
-    return response
+
+# Volcado periódico de los contadores de likes
+@app.on_event("startup")
+async def start_like_counter():
+    like_counter.start()
+
+
+@app.on_event("shutdown")
+async def stop_like_counter():
+    await like_counter.stop()
+
+
+# Índice en memoria para el autocompletado de usuarios
+@app.on_event("startup")
+async def start_user_index():
+    user_index.start()
+
+
+@app.on_event("shutdown")
+async def stop_user_index():
+    await user_index.stop()
+
+
+# Workers de la cola de correo (conexiones SMTP persistentes)
+@app.on_event("startup")
+async def start_email_queue():
+    email_queue.start()
+
+
+@app.on_event("shutdown")
+async def stop_email_queue():
+    await email_queue.stop()
+
+
+# Canales de notificaciones por WebSocket
+@app.on_event("startup")
+async def start_notification_hub():
+    notification_hub.start()
+
+
+@app.on_event("shutdown")
+async def stop_notification_hub():
+    await notification_hub.stop()
+
+
+# Detener el pool de hashing de contraseñas al apagar la aplicación
+@app.on_event("shutdown")
+def shutdown_password_hasher():
+    password_hasher.shutdown()
+
+
+# Detener el pool de generación de miniaturas
+@app.on_event("shutdown")
+def shutdown_derivative_generator():
+    derivative_generator.shutdown()
+
+
+# Cerrar las conexiones del engine asíncrono al apagar la aplicación
+@app.on_event("shutdown")
+async def shutdown_async_engine():
+    await async_engine.dispose()
 
 # Si se ejecuta directamente
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
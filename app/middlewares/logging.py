@@ -1,14 +1,8 @@
-import logging
+from app.middlewares.request_context import RequestContextMiddleware
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
 
-logger = logging.getLogger("visart-backend")
-logging.basicConfig(level=logging.INFO)
+class LoggingMiddleware(RequestContextMiddleware):
+    """Solo el log por petición (ASGI puro, ver RequestContextMiddleware)"""
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        logger.info(f"Petición: {request.method} {request.url}")
-        response = await call_next(request)
-        logger.info(f"Respuesta: {response.status_code} para {request.method} {request.url}")
-        return response
\ No newline at end of file
+    def __init__(self, app):
+        super().__init__(app, log=True, timing_header=False)
@@ -0,0 +1,27 @@
+from starlette.datastructures import MutableHeaders
+
+from app.db.query_counter import count_queries
+
+
+class QueryCountMiddleware:
+    """
+    Middleware ASGI que añade la cabecera X-SQL-Query-Count a cada respuesta
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with count_queries() as counter:
+
+            async def send_with_count(message):
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("X-SQL-Query-Count", str(counter.count))
+                await send(message)
+
+            await self.app(scope, receive, send_with_count)
@@ -0,0 +1,113 @@
+import logging
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+
+from app.logging_config import request_log_level, should_log_request
+
+logger = logging.getLogger("visart-backend")
+
+# Identificador de la petición en curso (disponible en logs y servicios)
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    return request_id_var.get()
+
+
+class RequestContextMiddleware:
+    """
+    Middleware ASGI puro que en una sola pasada asigna un X-Request-ID, mide la
+    duración con perf_counter_ns (X-Response-Time hasta el inicio de la
+    respuesta) y escribe un registro estructurado al terminar de enviar el cuerpo
+
+    El registro lleva método, plantilla de la ruta (`/api/posts/{post_id}`),
+    estado, duración y el usuario que dejan las dependencias de autenticación en
+    `request.state.user_id`. Las respuestas 2xx rápidas se muestrean
+    (LOG_SAMPLE_RATE_2XX); errores y peticiones lentas se registran siempre.
+
+    A diferencia de BaseHTTPMiddleware no crea tareas ni reempaqueta el cuerpo,
+    así que las respuestas en streaming pasan intactas.
+    """
+
+    def __init__(
+        self,
+        app,
+        log: bool = True,
+        timing_header: bool = True,
+        request_id_header: str = "X-Request-ID",
+    ):
+        self.app = app
+        self.log = log
+        self.timing_header = timing_header
+        self.request_id_header = request_id_header
+        self._request_id_key = request_id_header.lower().encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter_ns()
+        request_id = self._incoming_request_id(scope) or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+        status_code = 500
+        # Estado compartido con Request.state (las dependencias guardan aquí user_id)
+        state = scope.setdefault("state", {})
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(self.request_id_header, request_id)
+                if self.timing_header:
+                    headers.append(
+                        "X-Response-Time",
+                        f"{(time.perf_counter_ns() - start) / 1e9:.4f}s",
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if self.log:
+                duration_ms = (time.perf_counter_ns() - start) / 1e6
+                if should_log_request(status_code, duration_ms):
+                    self._log_request(
+                        scope, state, status_code, duration_ms, request_id
+                    )
+            request_id_var.reset(token)
+
+    def _log_request(
+        self, scope, state, status_code: int, duration_ms: float, request_id: str
+    ):
+        route = scope.get("route")
+        path = getattr(route, "path", None) or scope["path"]
+        logger.log(
+            request_log_level(status_code, duration_ms),
+            "%s %s %s %.1fms",
+            scope["method"],
+            path,
+            status_code,
+            duration_ms,
+            extra={
+                "method": scope["method"],
+                "path": path,
+                "status": status_code,
+                "duration_ms": round(duration_ms, 3),
+                "user_id": state.get("user_id"),
+                "request_id": request_id,
+            },
+        )
+
+    def _incoming_request_id(self, scope) -> Optional[str]:
+        # Se respeta el id que envía un proxy o balanceador (acotado para evitar abusos)
+        for key, value in scope["headers"]:
+            if key == self._request_id_key:
+                value = value.decode("latin-1")
+                return value if 0 < len(value) <= 128 else None
+        return None
@@ -1,13 +1,8 @@
-import time
+from app.middlewares.request_context import RequestContextMiddleware
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
 
+class TimingMiddleware(RequestContextMiddleware):
+    """Solo la cabecera X-Response-Time (ASGI puro, ver RequestContextMiddleware)"""
 
-class TimingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        response = await call_next(request)
-        duration = time.time() - start_time
-        response.headers["X-Response-Time"] = f"{duration:.4f}s"
-        return response
\ No newline at end of file
+    def __init__(self, app):
+        super().__init__(app, log=False, timing_header=True)
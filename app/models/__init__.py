@@ -1,4 +1,11 @@
 from app.db.base import Base
 from app.models.user_models import User, UserProfile, UserFollows
+from app.models.feed_models import TimelineEntry
+from app.models.like_models import PostLike
+from app.models.job_models import Job
+from app.models.media_models import MediaAsset, Upload
 
-__all__ = ["Base", "User", "UserProfile", "UserFollows"]
\ No newline at end of file
+__all__ = [
+    "Base", "User", "UserProfile", "UserFollows", "TimelineEntry", "PostLike", "Job",
+    "MediaAsset", "Upload",
+]
@@ -0,0 +1,37 @@
+"""
+Modelos del feed (timeline materializado) para la aplicación Visart
+"""
+
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index, UniqueConstraint
+from app.db.base import Base
+
+
+class TimelineEntry(Base):
+    """
+    Entrada del timeline de un usuario: una publicación de alguien a quien sigue
+
+    Se rellena al publicar (fan-out on write); `fecha_creacion` es la de la
+    publicación, copiada para poder paginar el feed solo con esta tabla.
+    """
+
+    __tablename__ = "timeline_entries"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    post_id = Column(
+        Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    author_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    fecha_creacion = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "post_id", name="unique_timeline_entry"),
+        Index("ix_timeline_user_fecha_post", "user_id", "fecha_creacion", "post_id"),
+    )
+
+    def __repr__(self):
+        return f"<TimelineEntry(user_id={self.user_id}, post_id={self.post_id})>"
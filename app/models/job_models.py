@@ -0,0 +1,62 @@
+"""
+Modelo de trabajos en segundo plano para la aplicación Visart
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, JSON
+from sqlalchemy.orm import synonym
+from app.db.base import Base
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+
+class Job(Base):
+    """
+    Trabajo de la cola persistente (app.services.job_queue)
+
+    Un worker lo reclama poniendo status=running, `lock_token` y `locked_until`
+    (visibility timeout). Si el worker muere sin terminarlo, al vencer
+    `locked_until` otro worker puede volver a reclamarlo.
+    """
+
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(100), nullable=False)
+    payload = Column(JSON, nullable=False, default=dict)
+    status = Column(String(20), nullable=False, default=JOB_QUEUED)
+    priority = Column(
+        Integer, nullable=False, default=0, server_default="0"
+    )  # mayor = antes
+    progress = Column(Integer, nullable=False, default=0, server_default="0")  # 0-100
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    max_attempts = Column(Integer, nullable=False, default=3, server_default="3")
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    owner_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True
+    )
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+    lock_token = Column(String(32), nullable=True)
+    locked_by = Column(String(100), nullable=True)
+    locked_until = Column(DateTime, nullable=True)
+    fecha_creacion = Column(DateTime, default=datetime.utcnow)
+    fecha_actualizacion = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    # Nombre usado por JobResponse
+    created_at = synonym("fecha_creacion")
+
+    __table_args__ = (
+        # Orden de reclamación: estado, prioridad y antigüedad
+        Index("ix_jobs_claim", "status", "priority", "id"),
+    )
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, kind='{self.kind}', status='{self.status}')>"
@@ -0,0 +1,36 @@
+"""
+Modelo de "me gusta" para la aplicación Visart
+"""
+
+from datetime import datetime
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import synonym
+from app.db.base import Base
+
+
+class PostLike(Base):
+    """
+    Un usuario indica que le gusta una publicación
+
+    Esta tabla es la fuente de verdad; Post.likes_count es un contador
+    desnormalizado que se actualiza por lotes (app.services.like_counter).
+    """
+
+    __tablename__ = "post_likes"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    post_id = Column(
+        Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    fecha_creacion = Column(DateTime, default=datetime.utcnow)
+
+    # Nombre usado por LikeResponse
+    created_at = synonym("fecha_creacion")
+
+    __table_args__ = (UniqueConstraint("user_id", "post_id", name="unique_post_like"),)
+
+    def __repr__(self):
+        return f"<PostLike(user_id={self.user_id}, post_id={self.post_id})>"
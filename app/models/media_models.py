@@ -0,0 +1,65 @@
+"""
+Modelos de ficheros multimedia subidos para la aplicación Visart
+"""
+
+from datetime import datetime
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Integer, String
+from app.db.base import Base
+
+UPLOAD_PENDING = "pending"
+UPLOAD_COMPLETE = "complete"
+
+
+class MediaAsset(Base):
+    """
+    Fichero almacenado por contenido: la clave es su SHA-256, así que subir
+    dos veces el mismo fichero no ocupa espacio dos veces
+    """
+
+    __tablename__ = "media_assets"
+
+    sha256 = Column(String(64), primary_key=True)
+    size = Column(BigInteger, nullable=False)
+    media_type = Column(String(100), nullable=False)
+    path = Column(String(255), nullable=False)  # relativa a MEDIA_ROOT
+    owner_id = Column(
+        Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )  # primero en subirlo
+    fecha_creacion = Column(DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<MediaAsset(sha256='{self.sha256[:12]}', size={self.size})>"
+
+
+class Upload(Base):
+    """
+    Subida por fragmentos reanudable (app.services.uploads)
+
+    `bytes_received` es el offset confirmado: solo avanza cuando un fragmento
+    se ha escrito entero y su checksum coincide. `writing_token` es la reserva
+    del PUT que está escribiendo (hasta `writing_until`).
+    """
+
+    __tablename__ = "uploads"
+
+    id = Column(String(32), primary_key=True)  # aleatorio: no se puede adivinar
+    owner_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    filename = Column(String(255), nullable=False)
+    media_type = Column(String(100), nullable=False)
+    size = Column(BigInteger, nullable=False)
+    bytes_received = Column(BigInteger, nullable=False, default=0, server_default="0")
+    expected_sha256 = Column(String(64), nullable=True)
+    sha256 = Column(String(64), ForeignKey("media_assets.sha256"), nullable=True)
+    status = Column(String(20), nullable=False, default=UPLOAD_PENDING)
+    writing_token = Column(String(32), nullable=True)
+    writing_until = Column(DateTime, nullable=True)
+    fecha_creacion = Column(DateTime, default=datetime.utcnow)
+    fecha_actualizacion = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    def __repr__(self):
+        progress = f"{self.bytes_received}/{self.size}"
+        return f"<Upload(id='{self.id}', status='{self.status}', {progress})>"
@@ -4,11 +4,39 @@ Actualizado para mantener consistencia con la base de datos
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Index, DDL, event,
+    func, literal_column,
+)
+from sqlalchemy.orm import relationship, synonym
 from app.db.base import Base
 
 
+# Búsqueda de texto completo (app.services.post_search)
+# - PostgreSQL: índice GIN sobre una expresión tsvector; el título pesa más (A)
+#   que el contenido (B)
+# - SQLite: tabla FTS5 con contenido externo (posts_fts) que mantienen los triggers
+# En ambos casos la base de datos sincroniza el índice en cada INSERT/UPDATE/DELETE.
+POSTS_SEARCH_CONFIG = "spanish"
+
+
+def post_search_vector(title, content):
+    """
+    Expresión tsvector de una publicación; debe coincidir con la del índice
+    ix_posts_search
+    (de ahí los literales en lugar de parámetros)
+    """
+    config = literal_column(f"'{POSTS_SEARCH_CONFIG}'::regconfig")
+    empty = literal_column("''")
+    weighted_title = func.setweight(
+        func.to_tsvector(config, func.coalesce(title, empty)), literal_column("'A'")
+    )
+    weighted_content = func.setweight(
+        func.to_tsvector(config, func.coalesce(content, empty)), literal_column("'B'")
+    )
+    return weighted_title.op("||")(weighted_content)
+
+
 class Post(Base):
     """
     Modelo de publicación para el sistema Visart
@@ -19,13 +47,65 @@ class Post(Base):
     title = Column(String(200), nullable=False)
     content = Column(Text, nullable=False)
     image_url = Column(String(255), nullable=True)
+    # Video generado (app.jobs.videos); las publicaciones normales no lo tienen
+    video_url = Column(String(255), nullable=True)
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     fecha_creacion = Column(DateTime, default=datetime.utcnow)
     fecha_actualizacion = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_published = Column(Boolean, default=True)
+    # Contador desnormalizado de "me gusta"
+    # (actualizado por lotes, ver app.services.like_counter)
+    likes_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Nombres usados por los esquemas de respuesta (PostResponse)
+    created_at = synonym("fecha_creacion")
+    updated_at = synonym("fecha_actualizacion")
 
     # Relación con el usuario (propietario)
     owner = relationship("User", back_populates="posts")
 
+    # Índice para la paginación por cursor de /api/posts/ (más recientes primero)
+    __table_args__ = (
+        Index("ix_posts_published_fecha_id", "is_published", "fecha_creacion", "id"),
+        # Lectura de publicaciones por autor (feed de autores "celebridad")
+        Index("ix_posts_owner_fecha_id", "owner_id", "fecha_creacion", "id"),
+        # Búsqueda de texto completo en PostgreSQL (en SQLite se usa posts_fts)
+        Index(
+            "ix_posts_search",
+            post_search_vector(title, content),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
+
     def __repr__(self):
         return f"<Post(id={self.id}, title='{self.title}', owner_id={self.owner_id})>"
+
+
+# Índice FTS5 de SQLite
+POSTS_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5("
+    "title, content, content='posts', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN "
+    "INSERT INTO posts_fts(rowid, title, content) "
+    "VALUES (new.id, new.title, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS posts_fts_au "
+    "AFTER UPDATE OF title, content ON posts BEGIN "
+    "INSERT INTO posts_fts(posts_fts, rowid, title, content) "
+    "VALUES ('delete', old.id, old.title, old.content); "
+    "INSERT INTO posts_fts(rowid, title, content) "
+    "VALUES (new.id, new.title, new.content); END",
+]
+
+for statement in POSTS_FTS_DDL:
+    event.listen(
+        Post.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Post.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS posts_fts").execute_if(dialect="sqlite"),
+)
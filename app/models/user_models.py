@@ -4,7 +4,10 @@ Este módulo define las estructuras de datos relacionadas con usuarios
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import (
+    Column, Integer, String, DateTime, Boolean, ForeignKey, UniqueConstraint, Index,
+    DDL, event, func,
+)
 from sqlalchemy.orm import relationship
 from app.db.base import Base  # ✅ Cambiado de app.database a app.db.base
 
@@ -21,14 +24,33 @@ class User(Base):
     email = Column(String(100), unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     fecha_creacion = Column(DateTime, default=datetime.utcnow)
+    # Versión del usuario para ETag/Last-Modified (app.utils.conditional)
+    fecha_actualizacion = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
     is_active = Column(Boolean, default=True)
     last_login = Column(DateTime, nullable=True)
+
+    # Contadores desnormalizados (UserStatsResponse), actualizados en la misma
+    # transacción que crea/elimina publicaciones y seguimientos
+    post_count = Column(Integer, nullable=False, default=0, server_default="0")
+    follower_count = Column(
+        Integer, nullable=False, default=0, server_default="0", index=True
+    )
+    following_count = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relación con posts
     posts = relationship("Post", back_populates="owner", cascade="all, delete-orphan")
     
     # Relación con perfiles (uno a uno)
-    profile = relationship("UserProfile", back_populates="user", uselist=False, cascade="all, delete-orphan")
+    # Carga "selectin": las sesiones asíncronas no pueden hacer lazy loading implícito
+    profile = relationship(
+        "UserProfile",
+        back_populates="user",
+        uselist=False,
+        cascade="all, delete-orphan",
+        lazy="selectin",
+    )
     
     # Relación de seguidores (muchos a muchos)
     followers = relationship(
@@ -39,6 +61,25 @@ class User(Base):
         backref="following"
     )
 
+    # Datos del perfil usados por PostOwnerResponse (el perfil se carga con "selectin")
+    @property
+    def full_name(self):
+        return self.profile.full_name if self.profile else None
+
+    @property
+    def avatar_url(self):
+        return self.profile.avatar_url if self.profile else None
+
+    # Autocompletado por prefijo en PostgreSQL: lower(username) LIKE 'pre%'
+    # (app.services.user_search)
+    __table_args__ = (
+        Index(
+            "ix_users_username_lower_pattern",
+            func.lower(username).label("username_lower"),
+            postgresql_ops={"username_lower": "text_pattern_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
+
     def __repr__(self):
         return f"<User(id={self.id}, username='{self.username}', email='{self.email}')>"
 
@@ -50,7 +91,7 @@ class UserProfile(Base):
     __tablename__ = "user_profiles"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     full_name = Column(String(100), nullable=True)
     bio = Column(String(500), nullable=True)
     avatar_url = Column(String(255), nullable=True)
@@ -65,6 +106,14 @@ class UserProfile(Base):
 
     user = relationship("User", back_populates="profile")
 
+    # Búsqueda de nombres (ILIKE) en PostgreSQL con un índice trigram (pg_trgm)
+    __table_args__ = (
+        Index(
+            "ix_user_profiles_full_name_trgm", full_name,
+            postgresql_using="gin", postgresql_ops={"full_name": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
+
     def __repr__(self):
         return f"<UserProfile(user_id={self.user_id}, full_name='{self.full_name}')>"
 
@@ -89,6 +138,12 @@ class UserFollows(Base):
         return f"<UserFollows(follower_id={self.follower_id}, followed_id={self.followed_id})>"
 
 
+event.listen(
+    UserProfile.__table__, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+
+
 # Funciones de utilidad para operaciones con usuarios
 def create_user(db, username: str, email: str, password: str, **kwargs):
     """
@@ -0,0 +1,118 @@
+"""
+Router de ficheros multimedia (ver app.services.assets)
+
+Público y sin sesión: las URLs de los assets se publican en image_url,
+video_url y avatar_url. Las peticiones Range (reproducción y saltos en un
+video) se responden con 206 leyendo solo el tramo pedido. Las miniaturas de
+cada asset cuelgan de su SHA-256 (ver app.services.derivatives).
+"""
+
+import os
+import re
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db
+from app.services.assets import (
+    ASSET_ACCEL_REDIRECT_PREFIX,
+    AssetFileResponse,
+    AssetLocation,
+    asset_etag,
+    asset_headers,
+    asset_locations,
+    locate_asset,
+)
+from app.services.derivatives import (
+    DERIVATIVE_VARIANTS,
+    DerivativesBusy,
+    derivative_etag,
+    derivative_generator,
+)
+from app.services.media_storage import media_path
+from app.utils.conditional import is_not_modified, not_modified_response
+
+ASSET_NAME = re.compile(r"^([0-9a-f]{64})(\.[0-9A-Za-z]+)?$")
+SHA256 = re.compile(r"^[0-9a-f]{64}$")
+
+router = APIRouter(prefix="/assets", tags=["assets"])
+
+
+async def find_asset(db: AsyncSession, sha256: Optional[str]) -> AssetLocation:
+    # Solo se consulta la base la primera vez que se pide cada asset
+    location = asset_locations.get(sha256) if sha256 else None
+    if location is None and sha256:
+        location = await db.run_sync(locate_asset, sha256)
+    if location is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Fichero no encontrado"
+        )
+    return location
+
+
+@router.api_route("/{name}", methods=["GET", "HEAD"])
+async def get_asset_file(
+    name: str, request: Request, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Fichero completo o un tramo (`Range: bytes=inicio-fin` → 206), con ETag
+    fuerte (el SHA-256) y caché de un año
+    """
+    match = ASSET_NAME.match(name)
+    location = await find_asset(db, match.group(1) if match else None)
+
+    headers = asset_headers(asset_etag(location.sha256), location.media_type)
+    if is_not_modified(request, headers["ETag"]):
+        return not_modified_response(headers)
+    if ASSET_ACCEL_REDIRECT_PREFIX:
+        # El proxy (nginx) sirve el fichero con sendfile, Range incluido
+        relative = location.path.removeprefix("assets/")
+        headers["X-Accel-Redirect"] = (
+            ASSET_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + relative
+        )
+        return Response(media_type=location.media_type, headers=headers)
+    path = media_path(location.path)
+    if not os.path.exists(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Fichero no encontrado"
+        )
+    return AssetFileResponse(path, media_type=location.media_type, headers=headers)
+
+
+@router.api_route("/{sha256}/{variant}.jpg", methods=["GET", "HEAD"])
+async def get_asset_derivative(
+    sha256: str,
+    variant: str,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Miniatura, tamaño de avatar o fotograma de portada (JPEG) de un asset;
+    se genera la primera vez que se pide y queda guardado en disco
+    """
+    if variant not in DERIVATIVE_VARIANTS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Variante no encontrada"
+        )
+    location = await find_asset(db, sha256 if SHA256.match(sha256) else None)
+
+    headers = asset_headers(derivative_etag(location.sha256, variant), "image/jpeg")
+    if is_not_modified(request, headers["ETag"]):
+        return not_modified_response(headers)
+    try:
+        path = await derivative_generator.ensure(
+            location.sha256, media_path(location.path), location.media_type, variant
+        )
+    except DerivativesBusy:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Servidor ocupado generando miniaturas, inténtalo de nuevo",
+            headers={"Retry-After": "1"},
+        )
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Este fichero no tiene miniaturas",
+        )
+    return AssetFileResponse(path, media_type="image/jpeg", headers=headers)
@@ -1,9 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
-from app.security import verify_password, get_password_hash, create_access_token, verify_token
+from app.db.session import get_async_db
+from app.security import create_access_token, verify_token
+from app.services.password_hashing import password_hasher, PasswordHasherBusy
+from app.services.identity_cache import get_identity, identity_cache
+from app.services.user_search import user_index
 from app.models.user_models import User
 from app.schemas.user_schemas import UserCreate, UserResponse, Token
 
@@ -13,8 +17,11 @@ router = APIRouter(tags=["autenticación"])
 # Esquema OAuth2 para compatibilidad
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+
 # Función de dependencia para obtener el usuario actual
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -29,19 +36,34 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     if username is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.username == username).first()
+    identity = await get_identity(db, username)
+    if identity is None:
+        raise credentials_exception
+
+    user = await db.get(User, identity.id)
     if user is None:
+        identity_cache.invalidate(user_id=identity.id, username=username)
         raise credentials_exception
     
     return user
 
+
+# Excepción para cuando el pool de hashing está saturado
+def hashing_busy_exception():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Servidor ocupado, intenta de nuevo en unos segundos",
+        headers={"Retry-After": "1"},
+    )
+
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Registrar nuevo usuario
     """
     # Verificar si usuario ya existe por email
-    db_user_email = db.query(User).filter(User.email == user.email).first()
+    result = await db.execute(select(User).where(User.email == user.email))
+    db_user_email = result.scalars().first()
     if db_user_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -49,15 +71,19 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Verificar si usuario ya existe por username
-    db_user_username = db.query(User).filter(User.username == user.username).first()
+    result = await db.execute(select(User).where(User.username == user.username))
+    db_user_username = result.scalars().first()
     if db_user_username:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="El nombre de usuario ya existe"
         )
     
-    # Crear nuevo usuario
-    hashed_password = get_password_hash(user.password)
+    # Crear nuevo usuario (bcrypt se ejecuta en el pool de procesos)
+    try:
+        hashed_password = await password_hasher.hash(user.password)
+    except PasswordHasherBusy:
+        raise hashing_busy_exception()
     db_user = User(
         username=user.username,
         email=user.email,
@@ -65,26 +91,37 @@ def register(user: UserCreate, db: Session = Depends(get_db)):
     )
     
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    user_index.upsert(db_user.id, db_user.username)
     
     return db_user
 
 @router.post("/token", response_model=Token)
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Iniciar sesión y obtener token de acceso (compatible con OAuth2)
     """
     # Buscar usuario por username o email
-    db_user = db.query(User).filter(
-        (User.username == form_data.username) | 
-        (User.email == form_data.username)
-    ).first()
+    result = await db.execute(
+        select(User).where(
+            (User.username == form_data.username) |
+            (User.email == form_data.username)
+        )
+    )
+    db_user = result.scalars().first()
     
-    if not db_user or not verify_password(form_data.password, db_user.hashed_password):
+    try:
+        password_ok = bool(db_user) and await password_hasher.verify(
+            form_data.password, db_user.hashed_password
+        )
+    except PasswordHasherBusy:
+        raise hashing_busy_exception()
+
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciales incorrectas",
@@ -108,17 +145,27 @@ def login_for_access_token(
     }
 
 @router.post("/login", response_model=Token)
-def login(user: UserCreate, db: Session = Depends(get_db)):
+async def login(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Iniciar sesión alternativa (usando JSON en lugar de form-data)
     """
     # Buscar usuario por username o email
-    db_user = db.query(User).filter(
-        (User.username == user.username) | 
-        (User.email == user.username)
-    ).first()
+    result = await db.execute(
+        select(User).where(
+            (User.username == user.username) |
+            (User.email == user.username)
+        )
+    )
+    db_user = result.scalars().first()
     
-    if not db_user or not verify_password(user.password, db_user.hashed_password):
+    try:
+        password_ok = bool(db_user) and await password_hasher.verify(
+            user.password, db_user.hashed_password
+        )
+    except PasswordHasherBusy:
+        raise hashing_busy_exception()
+
+    if not password_ok:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciales incorrectas",
@@ -146,4 +193,4 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
     """
     Obtener información del usuario autenticado
     """
-    return current_user
\ No newline at end of file
+    return current_user
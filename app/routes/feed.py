@@ -0,0 +1,37 @@
+"""
+Router del feed de publicaciones de los usuarios seguidos
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.dependencies import get_current_active_identity
+from app.schemas.post import PostListResponse
+from app.services import feed
+from app.services.identity_cache import AuthIdentity
+from app.utils.serialization import dump_post_list, json_bytes_response
+
+router = APIRouter(prefix="/feed", tags=["feed"])
+
+
+@router.get("", response_model=PostListResponse)
+def read_feed(
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: AuthIdentity = Depends(get_current_active_identity),
+):
+    """
+    Feed del usuario: publicaciones propias y de quienes sigue, más recientes primero
+    """
+    try:
+        page = feed.read_feed(db, current_user.id, cursor=cursor, limit=limit)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginación inválido",
+        )
+    return json_bytes_response(dump_post_list(page.items, limit, page.next_cursor))
@@ -3,16 +3,17 @@ Router para health checks
 """
 
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
 
 router = APIRouter(prefix="/api/health", tags=["health"])
 
 @router.get("")
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_async_db)):
     # Verificar conexión a la base de datos
     try:
-        db.execute("SELECT 1")
+        await db.execute(text("SELECT 1"))
         db_status = "connected"
     except Exception:
         db_status = "disconnected"
@@ -24,10 +25,10 @@ async def health_check(db: Session = Depends(get_db)):
     }
 
 @router.get("/db")
-async def health_check_db(db: Session = Depends(get_db)):
+async def health_check_db(db: AsyncSession = Depends(get_async_db)):
     """Health check específico para la base de datos"""
     try:
-        result = db.execute("SELECT 1").scalar()
+        result = (await db.execute(text("SELECT 1"))).scalar()
         return {
             "status": "healthy",
             "database": "connected",
@@ -0,0 +1,55 @@
+"""
+Router de estado y progreso de los trabajos en segundo plano
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.dependencies import get_current_active_identity
+from app.models.job_models import Job
+from app.schemas.job_schemas import JobListResponse, JobResponse
+from app.services.identity_cache import AuthIdentity
+from app.utils.pagination import paginate
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("", response_model=JobListResponse)
+def list_jobs(
+    job_status: Optional[str] = Query(None, alias="status"),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: AuthIdentity = Depends(get_current_active_identity),
+):
+    """Trabajos del usuario actual, más recientes primero (paginación por cursor)"""
+    query = db.query(Job).filter(Job.owner_id == current_user.id)
+    if job_status:
+        query = query.filter(Job.status == job_status)
+    try:
+        page = paginate(query, limit=limit, cursor=cursor, keys=(Job.id,))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginación inválido",
+        )
+    return {"jobs": page.items, "page_size": limit, "next_cursor": page.next_cursor}
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+def get_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: AuthIdentity = Depends(get_current_active_identity),
+):
+    """Estado y progreso de un trabajo (para consultar periódicamente)"""
+    job = db.get(Job, job_id)
+    # Los trabajos de otros usuarios no se revelan
+    if job is None or (job.owner_id != current_user.id and not current_user.is_admin):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Trabajo no encontrado"
+        )
+    return job
@@ -0,0 +1,78 @@
+"""
+Router de notificaciones en tiempo real (ver app.services.notifications)
+"""
+
+import asyncio
+import time
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, Depends, WebSocket, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db
+from app.security import verify_token
+from app.services.identity_cache import AuthIdentity, get_identity
+from app.services.notifications import (
+    CLOSE_TRY_AGAIN_LATER,
+    TooManyConnections,
+    notification_hub,
+)
+
+router = APIRouter(tags=["notifications"])
+
+
+async def socket_identity(
+    websocket: WebSocket, token: Optional[str], db: AsyncSession
+) -> Tuple[Optional[AuthIdentity], Optional[float]]:
+    """Identidad del token y su expiración (`exp`, segundos epoch; None si no caduca)"""
+    # Los navegadores no permiten cabeceras en WebSocket: el JWT puede ir en ?token=
+    if not token:
+        scheme, _, credentials = websocket.headers.get("authorization", "").partition(
+            " "
+        )
+        token = credentials if scheme.lower() == "bearer" else None
+    payload = verify_token(token) if token else None
+    if payload is None or payload.get("sub") is None:
+        return None, None
+    identity = await get_identity(db, payload["sub"])
+    if identity is None or not identity.is_active:
+        return None, None
+    return identity, payload.get("exp")
+
+
+@router.websocket("/ws/notifications")
+async def notifications_socket(
+    websocket: WebSocket,
+    token: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Canal de notificaciones del usuario autenticado (`Authorization: Bearer`
+    o `?token=`). Solo envía eventos JSON; lo que mande el cliente se ignora.
+    Se cierra con 1008 al caducar el token o al desactivarse la cuenta.
+    """
+    identity, expires_at = await socket_identity(websocket, token, db)
+    # La conexión puede durar horas: no retiene una conexión a la base
+    await db.close()
+    if identity is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    try:
+        subscriber = notification_hub.subscribe(identity.id, websocket)
+    except TooManyConnections:
+        await websocket.close(code=CLOSE_TRY_AGAIN_LATER)
+        return
+    # Un solo temporizador por conexión: al caducar el token se cierra
+    expires_in = expires_at - time.time() if expires_at is not None else None
+    try:
+        async with asyncio.timeout(expires_in):
+            while True:
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+    except TimeoutError:
+        await notification_hub.close(subscriber, status.WS_1008_POLICY_VIOLATION)
+    finally:
+        notification_hub.unsubscribe(subscriber)
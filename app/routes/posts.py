@@ -1,21 +1,60 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import (
+    APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response, status
+)
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload
+from typing import NamedTuple, Optional
 from datetime import datetime
+import os
 
 from app.db.session import get_db
-from app.models.user_models import User
+from app.models.user_models import User, UserProfile
 from app.models.posts import Post  # ✅ Corregida la importación
-from app.schemas.post import PostCreate, PostResponse, PostUpdate
-from app.dependencies import get_current_active_user
+from app.models.like_models import PostLike
+from app.schemas.post import (
+    PostCreate, PostResponse, PostDetailResponse, PostUpdate, PostListResponse,
+    LikeResponse, PostSearchFilters,
+)
+from app.dependencies import get_current_active_identity, get_optional_identity
+from app.services.identity_cache import AuthIdentity
+from app.services import feed
+from app.services.job_queue import enqueue_job
+from app.services.post_search import search_posts
+from app.services.user_stats import counter_update
+from app.services.like_counter import like_counter
+from app.services.notifications import (
+    notification_hub, notification_message, post_notification
+)
+from app.services.response_cache import (
+    first_page_tag, list_tag, post_tag, response_cache
+)
+from app.utils.pagination import paginate
+from app.utils.serialization import dump_post_list, json_bytes_response
+from app.utils.singleflight import SingleFlight
+from app.utils.conditional import (
+    is_not_modified, make_etag, not_modified_response, validator_headers
+)
 
 router = APIRouter(tags=["posts"])  # ✅ Eliminado el prefix para evitar duplicación
 
+# Coalescencia de lecturas de GET /{post_id} (avalanchas al compartir una publicación)
+post_reads = SingleFlight(
+    enabled=os.getenv("POST_SINGLE_FLIGHT", "true").lower() in ("1", "true", "yes")
+)
+
+
+# Consulta base de lectura: propietario en el mismo JOIN y su perfil en una
+# única consulta "selectin" (User.profile), sin N+1 al serializar PostResponse
+def post_read_query(db: Session):
+    return db.query(Post).options(joinedload(Post.owner))
+
 @router.post("/", response_model=PostResponse, status_code=status.HTTP_201_CREATED)
 def create_post(
     post: PostCreate, 
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthIdentity = Depends(get_current_active_identity)
 ):
     """Crear una nueva publicación"""
     try:
@@ -28,8 +67,25 @@ def create_post(
         )
         
         db.add(new_post)
+        db.flush()
+        db.execute(counter_update(current_user.id, post_count=1))
+
+        # Repartir la publicación en los timelines de los seguidores
+        strategy = feed.publish_post(db, new_post) if new_post.is_published else None
+        if strategy == feed.FANOUT_BACKGROUND:
+            # Trabajo persistente: sobrevive a un reinicio del proceso web
+            enqueue_job(db, "feed.fan_out", {"post_id": new_post.id})
+
         db.commit()
         db.refresh(new_post)
+        # Una publicación nueva solo cambia la primera página de su lista
+        response_cache.invalidate(first_page_tag(new_post.is_published))
+        if new_post.is_published:
+            # Aviso en tiempo real a los seguidores conectados
+            background_tasks.add_task(
+                notification_hub.notify_followers, db.get_bind(), current_user.id,
+                post_notification(new_post, current_user.username)
+            )
         return new_post
     except Exception as e:
         db.rollback()
@@ -38,34 +94,251 @@ def create_post(
             detail=f"Error al crear la publicación: {str(e)}"
         )
 
-@router.get("/{post_id}", response_model=PostResponse)
-def get_post(post_id: int, db: Session = Depends(get_db)):
-    """Obtener una publicación específica por ID"""
-    post = db.query(Post).filter(Post.id == post_id).first()
+
+@router.get("/search", response_model=PostListResponse)
+def search(
+    q: Optional[str] = None,
+    filters: PostSearchFilters = Depends(),
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Búsqueda de texto completo (más relevantes primero) con paginación por cursor"""
+    try:
+        page = search_posts(db, filters, q=q, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return json_bytes_response(dump_post_list(page.items, limit, page.next_cursor))
+
+
+# Solo las columnas que determinan la versión de PostDetailResponse (para responder 304)
+def post_version_query(db: Session, post_id: int):
+    return (
+        db.query(
+            Post.fecha_actualizacion,
+            Post.likes_count,
+            User.fecha_actualizacion.label("owner_updated"),
+            UserProfile.fecha_actualizacion.label("profile_updated"),
+        )
+        .join(User, User.id == Post.owner_id)
+        .outerjoin(UserProfile, UserProfile.user_id == Post.owner_id)
+        .filter(Post.id == post_id)
+    )
+
+
+def viewer_likes_post(
+    db: Session, post_id: int, viewer: Optional[AuthIdentity]
+) -> bool:
+    if viewer is None:
+        return False
+    return db.query(PostLike.id).filter(
+        PostLike.post_id == post_id, PostLike.user_id == viewer.id
+    ).first() is not None
+
+
+def post_etag(
+    post_id, updated, owner_updated, profile_updated, likes_count, viewer, is_liked
+):
+    """
+    ETag de una publicación tal como la ve `viewer`
+
+    Sin Last-Modified: los likes no cambian ninguna fecha y la representación
+    depende del usuario (is_liked), así que solo el ETag identifica la versión.
+    """
+    viewer_id = viewer.id if viewer is not None else None
+    return make_etag(
+        "post", post_id, updated, owner_updated, profile_updated, likes_count,
+        viewer_id, is_liked
+    )
+
+
+class PostSnapshot(NamedTuple):
+    """Vista anónima de una publicación, compartida entre lecturas concurrentes"""
+    detail: PostDetailResponse
+    body: bytes
+    owner_updated: Optional[datetime]
+    profile_updated: Optional[datetime]
+
+
+def load_post_snapshot(db: Session, post_id: int) -> Optional[PostSnapshot]:
+    post = post_read_query(db).filter(Post.id == post_id).first()
     if not post:
+        return None
+    # El contador en base de datos más lo que este proceso aún no ha volcado
+    detail = PostDetailResponse.model_validate(post).model_copy(
+        update={"likes_count": post.likes_count + like_counter.pending(post.id)}
+    )
+    return PostSnapshot(
+        detail=detail,
+        body=detail.model_dump_json().encode(),
+        owner_updated=post.owner.fecha_actualizacion,
+        profile_updated=(
+            post.owner.profile.fecha_actualizacion if post.owner.profile else None
+        ),
+    )
+
+
+@router.get("/{post_id}", response_model=PostDetailResponse)
+def get_post(
+    post_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    current_user: Optional[AuthIdentity] = Depends(get_optional_identity)
+):
+    """Obtener una publicación específica por ID (admite If-None-Match)"""
+    is_liked = None
+    if "if-none-match" in request.headers:
+        version = post_version_query(db, post_id).first()
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Publicación no encontrada"
+            )
+        is_liked = viewer_likes_post(db, post_id, current_user)
+        etag = post_etag(
+            post_id, version.fecha_actualizacion, version.owner_updated,
+            version.profile_updated,
+            version.likes_count + like_counter.pending(post_id), current_user, is_liked
+        )
+        if is_not_modified(request, etag):
+            return not_modified_response(
+                validator_headers(etag, private=current_user is not None)
+            )
+
+    # Las lecturas concurrentes de la misma publicación comparten consulta
+    # y serialización
+    snapshot = post_reads.do(post_id, load_post_snapshot, db, post_id)
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Publicación no encontrada"
+        )
+
+    detail = snapshot.detail
+    if is_liked is None:
+        is_liked = viewer_likes_post(db, post_id, current_user)
+    etag = post_etag(
+        post_id, detail.updated_at, snapshot.owner_updated, snapshot.profile_updated,
+        detail.likes_count, current_user, is_liked
+    )
+    headers = validator_headers(etag, private=current_user is not None)
+    if current_user is None:
+        return Response(
+            content=snapshot.body, media_type="application/json", headers=headers
+        )
+
+    response.headers.update(headers)
+    return detail.model_copy(
+        update={"is_owner": detail.owner_id == current_user.id, "is_liked": is_liked}
+    )
+
+
+@router.post(
+    "/{post_id}/like", response_model=LikeResponse, status_code=status.HTTP_201_CREATED
+)
+def like_post(
+    post_id: int,
+    db: Session = Depends(get_db),
+    current_user: AuthIdentity = Depends(get_current_active_identity)
+):
+    """Dar me gusta a una publicación"""
+    owner_id = db.query(Post.owner_id).filter(Post.id == post_id).scalar()
+    if owner_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Publicación no encontrada"
         )
-    return post
 
-@router.get("/", response_model=List[PostResponse])
+    like = PostLike(user_id=current_user.id, post_id=post_id)
+    db.add(like)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Ya has dado me gusta a esta publicación"
+        )
+
+    # El contador se actualiza por lotes (app.services.like_counter)
+    like_counter.add(post_id, 1)
+    if owner_id != current_user.id:
+        notification_hub.publish(
+            owner_id,
+            notification_message(
+                "like", post_id=post_id, user_id=current_user.id,
+                username=current_user.username
+            )
+        )
+    return like
+
+
+@router.delete("/{post_id}/like", status_code=status.HTTP_204_NO_CONTENT)
+def unlike_post(
+    post_id: int,
+    db: Session = Depends(get_db),
+    current_user: AuthIdentity = Depends(get_current_active_identity)
+):
+    """Quitar el me gusta de una publicación"""
+    result = db.execute(
+        delete(PostLike).where(
+            PostLike.post_id == post_id, PostLike.user_id == current_user.id
+        )
+    )
+    if result.rowcount == 0:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No has dado me gusta a esta publicación"
+        )
+    db.commit()
+    like_counter.add(post_id, -1)
+    return None
+
+
+@router.get("/", response_model=PostListResponse)
 def list_posts(
-    skip: int = 0, 
-    limit: int = 10, 
+    cursor: Optional[str] = None,
+    limit: int = Query(10, ge=1, le=100),
     is_published: bool = True,
     db: Session = Depends(get_db)
 ):
-    """Listar publicaciones con paginación"""
-    posts = db.query(Post).filter(Post.is_published == is_published).offset(skip).limit(limit).all()
-    return posts
+    """Listar publicaciones (más recientes primero) con paginación por cursor"""
+    # Las páginas se sirven desde la caché de respuestas (app.services.response_cache)
+    cache_key = f"posts:list:{is_published}:{limit}:{cursor or ''}"
+    body = response_cache.get(cache_key)
+    if body is not None:
+        return json_bytes_response(body, headers={"X-Cache": "HIT"})
+
+    query = post_read_query(db).filter(Post.is_published == is_published)
+    try:
+        page = paginate(
+            query, limit=limit, cursor=cursor, keys=(Post.fecha_creacion, Post.id)
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginación inválido"
+        )
+
+    body = dump_post_list(page.items, limit, page.next_cursor)
+    tags = [list_tag(is_published), *(post_tag(post.id) for post in page.items)]
+    if not cursor:
+        tags.append(first_page_tag(is_published))
+    response_cache.set(cache_key, body, tags)
+    return json_bytes_response(body, headers={"X-Cache": "MISS"})
 
 @router.put("/{post_id}", response_model=PostResponse)
 def update_post(
     post_id: int, 
     post_update: PostUpdate, 
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthIdentity = Depends(get_current_active_identity)
 ):
     """Actualizar una publicación existente"""
     db_post = db.query(Post).filter(Post.id == post_id).first()
@@ -83,21 +356,40 @@ def update_post(
         )
     
     # Actualizar solo los campos proporcionados
+    was_published = db_post.is_published
     update_data = post_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_post, field, value)
     
     db_post.fecha_actualizacion = datetime.utcnow()
     
+    # Sincronizar los timelines si cambia la visibilidad
+    strategy = None
+    if was_published and not db_post.is_published:
+        feed.remove_post_from_timelines(db, db_post.id)
+    elif db_post.is_published and not was_published:
+        strategy = feed.publish_post(db, db_post)
+        if strategy == feed.FANOUT_BACKGROUND:
+            enqueue_job(db, "feed.fan_out", {"post_id": db_post.id})
+
     db.commit()
     db.refresh(db_post)
+    if was_published != db_post.is_published:
+        response_cache.invalidate(list_tag(True), list_tag(False))
+    else:
+        response_cache.invalidate(post_tag(db_post.id))
+    if strategy is not None:
+        background_tasks.add_task(
+            notification_hub.notify_followers, db.get_bind(), current_user.id,
+            post_notification(db_post, current_user.username)
+        )
     return db_post
 
 @router.delete("/{post_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_post(
     post_id: int, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    current_user: AuthIdentity = Depends(get_current_active_identity)
 ):
     """Eliminar una publicación"""
     db_post = db.query(Post).filter(Post.id == post_id).first()
@@ -114,6 +406,10 @@ def delete_post(
             detail="No tienes permisos para eliminar esta publicación"
         )
     
+    feed.remove_post_from_timelines(db, db_post.id)
+    db.execute(delete(PostLike).where(PostLike.post_id == db_post.id))
+    db.execute(counter_update(db_post.owner_id, post_count=-1))
     db.delete(db_post)
     db.commit()
-    return None
\ No newline at end of file
+    response_cache.invalidate(post_tag(post_id))
+    return None
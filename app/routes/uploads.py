@@ -0,0 +1,245 @@
+"""
+Router de subidas de ficheros multimedia por fragmentos (ver app.services.uploads)
+"""
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import ClientDisconnect
+
+from app.db.session import get_async_db
+from app.dependencies import get_current_active_identity
+from app.models.media_models import UPLOAD_COMPLETE, Upload
+from app.schemas.upload_schemas import UploadCreate, UploadResponse
+from app.services.assets import asset_url, get_asset
+from app.services.derivatives import derivative_generator
+from app.services.media_storage import media_path
+from app.services.identity_cache import AuthIdentity
+from app.services.uploads import (
+    UPLOAD_CHUNK_BYTES,
+    UPLOAD_MAX_CHUNK_BYTES,
+    ChecksumMismatch,
+    InvalidChecksum,
+    UnsupportedMediaType,
+    UploadTooLarge,
+    advance_upload,
+    claim_chunk,
+    complete_upload,
+    create_upload,
+    discard_partial,
+    file_sha256,
+    parse_checksum,
+    release_claim,
+    write_chunk,
+)
+
+router = APIRouter(prefix="/uploads", tags=["uploads"])
+
+CHUNK_TOO_LARGE_DETAIL = (
+    f"Cada fragmento admite hasta {UPLOAD_MAX_CHUNK_BYTES} bytes "
+    "y no puede pasar del tamaño declarado"
+)
+
+
+async def upload_response(
+    request: Request, response: Response, db: AsyncSession, upload: Upload
+) -> dict:
+    asset = await db.run_sync(get_asset, upload.sha256)
+    response.headers["Upload-Offset"] = str(upload.bytes_received)
+    return {
+        "upload_id": upload.id,
+        "status": upload.status,
+        "filename": upload.filename,
+        "media_type": upload.media_type,
+        "size": upload.size,
+        "offset": upload.bytes_received,
+        "chunk_size": UPLOAD_CHUNK_BYTES,
+        "sha256": upload.sha256,
+        "url": asset_url(asset) if asset is not None else None,
+        "upload_url": str(request.url_for("upload_chunk", upload_id=upload.id).path),
+    }
+
+
+async def get_owned_upload(
+    db: AsyncSession, upload_id: str, current_user: AuthIdentity
+) -> Upload:
+    upload = await db.get(Upload, upload_id, populate_existing=True)
+    if upload is None or upload.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Subida no encontrada"
+        )
+    return upload
+
+
+def offset_conflict(offset: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="El fragmento no empieza en el offset confirmado",
+        headers={"Upload-Offset": str(offset)},
+    )
+
+
+@router.post("", response_model=UploadResponse, status_code=status.HTTP_201_CREATED)
+async def start_upload(
+    upload: UploadCreate,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthIdentity = Depends(get_current_active_identity),
+):
+    """
+    Inicia una subida; si ya existe un fichero con el mismo `sha256` queda
+    completada al momento
+    """
+    try:
+        new_upload = await db.run_sync(
+            create_upload,
+            current_user.id,
+            upload.filename,
+            upload.media_type,
+            upload.size,
+            upload.sha256,
+        )
+    except UnsupportedMediaType:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=(
+                "Solo se admiten imágenes rasterizadas "
+                "(JPEG, PNG, GIF, WebP, AVIF, BMP) y videos"
+            ),
+        )
+    except UploadTooLarge:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail="El fichero supera el tamaño máximo permitido",
+        )
+    return await upload_response(request, response, db, new_upload)
+
+
+@router.get("/{upload_id}", response_model=UploadResponse)
+async def get_upload(
+    upload_id: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthIdentity = Depends(get_current_active_identity),
+):
+    """Estado de la subida; `offset` indica desde dónde reanudar"""
+    upload = await get_owned_upload(db, upload_id, current_user)
+    return await upload_response(request, response, db, upload)
+
+
+@router.put("/{upload_id}", response_model=UploadResponse, name="upload_chunk")
+async def upload_chunk(
+    upload_id: str,
+    request: Request,
+    response: Response,
+    upload_offset: int = Header(..., ge=0),
+    upload_checksum: str = Header(...),
+    content_length: int = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthIdentity = Depends(get_current_active_identity),
+):
+    """
+    Escribe un fragmento en `Upload-Offset`, verificado con
+    `Upload-Checksum: sha256 <base64 o hex>`; el último completa la subida
+    """
+    upload = await get_owned_upload(db, upload_id, current_user)
+    if upload.status == UPLOAD_COMPLETE or upload_offset != upload.bytes_received:
+        raise offset_conflict(upload.bytes_received)
+    size = upload.size
+    if content_length is not None and (
+        content_length > UPLOAD_MAX_CHUNK_BYTES or upload_offset + content_length > size
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=CHUNK_TOO_LARGE_DETAIL,
+        )
+    try:
+        checksum = parse_checksum(upload_checksum)
+    except InvalidChecksum:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Upload-Checksum debe ser 'sha256 <base64 o hex>'",
+        )
+    # Solo un PUT escribe a la vez (p. ej. el reintento de un fragmento que aún
+    # está llegando recibe 409). El commit de la reserva libera además la
+    # conexión a la base mientras llega el cuerpo.
+    token = await db.run_sync(claim_chunk, upload_id, upload_offset)
+    if token is None:
+        upload = await get_owned_upload(db, upload_id, current_user)
+        raise offset_conflict(upload.bytes_received)
+
+    try:
+        new_offset = await write_chunk(
+            upload_id, upload_offset, size, request.stream(), checksum
+        )
+    except Exception as e:
+        # El fragmento no cuenta: se libera la reserva para que el cliente lo reenvíe
+        await db.run_sync(release_claim, upload_id, token)
+        if isinstance(e, ChecksumMismatch):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="El checksum del fragmento no coincide; reenvíalo",
+                headers={"Upload-Offset": str(upload_offset)},
+            )
+        if isinstance(e, UploadTooLarge):
+            raise HTTPException(
+                status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+                detail=CHUNK_TOO_LARGE_DETAIL,
+            )
+        if isinstance(e, TimeoutError):
+            raise HTTPException(
+                status_code=status.HTTP_408_REQUEST_TIMEOUT,
+                detail=(
+                    "El fragmento tardó demasiado; "
+                    "reenvíalo en fragmentos más pequeños"
+                ),
+                headers={"Upload-Offset": str(upload_offset)},
+            )
+        if isinstance(e, ClientDisconnect):
+            return Response(status_code=status.HTTP_400_BAD_REQUEST)
+        raise
+
+    if not await db.run_sync(
+        advance_upload, upload_id, token, new_offset, new_offset == size
+    ):
+        upload = await get_owned_upload(db, upload_id, current_user)
+        raise offset_conflict(upload.bytes_received)
+
+    if new_offset == size:
+        sha256 = await file_sha256(upload_id)
+        try:
+            upload = await db.run_sync(complete_upload, upload_id, sha256)
+        except ChecksumMismatch:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail=(
+                    "El fichero completo no coincide con el sha256 anunciado; "
+                    "la subida vuelve a empezar"
+                ),
+                headers={"Upload-Offset": "0"},
+            )
+        # Miniatura (y portada de los videos) lista antes de que se publique el post
+        asset = await db.run_sync(get_asset, upload.sha256)
+        derivative_generator.prefetch(
+            asset.sha256, media_path(asset.path), asset.media_type
+        )
+    else:
+        upload = await get_owned_upload(db, upload_id, current_user)
+    return await upload_response(request, response, db, upload)
+
+
+@router.delete("/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def cancel_upload(
+    upload_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthIdentity = Depends(get_current_active_identity),
+):
+    """
+    Cancela una subida y borra lo recibido (los ficheros ya completados se conservan)
+    """
+    upload = await get_owned_upload(db, upload_id, current_user)
+    if upload.status != UPLOAD_COMPLETE:
+        discard_partial(upload_id)
+    await db.delete(upload)
+    await db.commit()
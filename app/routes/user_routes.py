@@ -1,31 +1,119 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Optional
 
-from app.database import get_db
-from app.dependencies import get_current_user, get_current_active_user
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db
+from app.dependencies import (
+    get_current_user, get_current_active_user, get_current_active_identity
+)
+from app.services.identity_cache import AuthIdentity, invalidate_user
 from app import security
 
 # ✅ Importaciones corregidas
-from app.models.user_models import User
-from app.schemas.user_schemas import UserResponse, UserUpdate
+from app.models.user_models import User, UserFollows, UserProfile
+from app.schemas.user_schemas import (
+    UserResponse, UserUpdate, FollowResponse, UserStatsResponse, UserListResponse,
+    UserSearchFilters,
+)
+from app.services import feed
+from app.services.notifications import notification_hub, notification_message
+from app.services.response_cache import list_tag, response_cache
+from app.services.user_search import index_user, search_users, user_index
+from app.services.user_export import (
+    EXPORT_FORMATS, EXPORT_SECTIONS, csv_export, ndjson_export
+)
+from app.utils.conditional import (
+    has_conditional_headers, is_not_modified, latest, make_etag, not_modified_response,
+    validator_headers,
+)
+from app.services.user_stats import follow_updates, stats_query
+from app.utils.serialization import dump_user_list, json_bytes_response
 
 # ✅ Router correctamente configurado
 router = APIRouter(prefix="/users", tags=["users"])
 
+
+# Solo las fechas que determinan la versión de UserResponse (para responder 304)
+def user_version_query(user_id: int):
+    return (
+        select(
+            User.id,
+            User.fecha_actualizacion,
+            UserProfile.fecha_actualizacion.label("profile_updated"),
+        )
+        .outerjoin(UserProfile, UserProfile.user_id == User.id)
+        .where(User.id == user_id)
+    )
+
+
+def user_validators(user_id: int, updated, profile_updated):
+    """ETag y Last-Modified de un usuario"""
+    etag = make_etag("user", user_id, updated, profile_updated)
+    return etag, latest(updated, profile_updated)
+
+
+async def not_modified_user(
+    request: Request, db: AsyncSession, user_id: int
+) -> Optional[Response]:
+    """Respuesta 304 si el cliente ya tiene la versión actual (o None)"""
+    if not has_conditional_headers(request):
+        return None
+    version = (await db.execute(user_version_query(user_id))).first()
+    if version is None:
+        return None
+    etag, last_modified = user_validators(
+        version.id, version.fecha_actualizacion, version.profile_updated
+    )
+    if is_not_modified(request, etag, last_modified):
+        return not_modified_response(
+            validator_headers(etag, last_modified, private=True)
+        )
+    return None
+
+
+def set_user_validators(response: Response, user: User):
+    etag, last_modified = user_validators(
+        user.id,
+        user.fecha_actualizacion,
+        user.profile.fecha_actualizacion if user.profile else None,
+    )
+    response.headers.update(validator_headers(etag, last_modified, private=True))
+
 # ✅ Endpoint para obtener usuario actual
 @router.get("/me", response_model=UserResponse)
-async def read_user_me(current_user: User = Depends(get_current_active_user)):
+async def read_user_me(
+    request: Request,
+    response: Response,
+    current_user: AuthIdentity = Depends(get_current_active_identity),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     Obtener información del usuario actualmente autenticado
+    (admite If-None-Match / If-Modified-Since)
     """
-    return current_user
+    not_modified = await not_modified_user(request, db, current_user.id)
+    if not_modified is not None:
+        return not_modified
+
+    user = await db.get(User, current_user.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="No se pudieron validar las credenciales",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    set_user_validators(response, user)
+    return user
 
 # ✅ Endpoint para actualizar usuario
 @router.put("/me", response_model=UserResponse)
 async def update_user_me(
     user_update: UserUpdate,
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Actualizar información del usuario actual
@@ -33,9 +121,10 @@ async def update_user_me(
     update_data = user_update.model_dump(exclude_unset=True)
     
     if "username" in update_data and update_data["username"] != current_user.username:
-        existing_user = db.query(User).filter(
-            User.username == update_data["username"]
-        ).first()
+        result = await db.execute(
+            select(User).where(User.username == update_data["username"])
+        )
+        existing_user = result.scalars().first()
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -43,9 +132,10 @@ async def update_user_me(
             )
     
     if "email" in update_data and update_data["email"] != current_user.email:
-        existing_user = db.query(User).filter(
-            User.email == update_data["email"]
-        ).first()
+        result = await db.execute(
+            select(User).where(User.email == update_data["email"])
+        )
+        existing_user = result.scalars().first()
         if existing_user:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -53,11 +143,21 @@ async def update_user_me(
             )
     
     # Actualizar campos
+    previous_username = current_user.username
     for field, value in update_data.items():
         setattr(current_user, field, value)
     
-    db.commit()
-    db.refresh(current_user)
+    await db.commit()
+    await db.refresh(current_user)
+    invalidate_user(current_user, previous_username=previous_username)
+    if not current_user.is_active or current_user.username != previous_username:
+        # Cuenta desactivada, o tokens con el username anterior:
+        # se cierran sus notificaciones
+        notification_hub.disconnect_user(current_user.id)
+    if current_user.username != previous_username:
+        # Las páginas de GET /api/posts/ incluyen el username de cada autor
+        response_cache.invalidate(list_tag(True), list_tag(False))
+    index_user(current_user)
     
     return current_user
 
@@ -65,26 +165,107 @@ async def update_user_me(
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user_me(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Eliminar (desactivar) la cuenta del usuario actual
     """
     current_user.is_active = False
-    db.commit()
+    await db.commit()
+    invalidate_user(current_user)
+    notification_hub.disconnect_user(current_user.id)
+    user_index.remove(current_user.id)
     return None
 
+
+# ✅ Endpoint de exportación de datos del usuario actual (en streaming)
+@router.get("/me/export")
+async def export_user_me(
+    export_format: str = Query("ndjson", alias="format"),
+    section: str = Query("posts"),
+    current_user: AuthIdentity = Depends(get_current_active_identity),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Exportar perfil, publicaciones y seguimientos del usuario actual
+
+    NDJSON incluye todas las secciones (campo `type`); CSV, solo la indicada en
+    `section` (profile, posts, following o followers). La respuesta se genera
+    por lotes, sin cargar todas las filas en memoria.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Formato no soportado; usa uno de: {', '.join(EXPORT_FORMATS)}"
+        )
+    if export_format == "csv" and section not in EXPORT_SECTIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Sección no válida; usa una de: {', '.join(EXPORT_SECTIONS)}"
+        )
+
+    if export_format == "csv":
+        body = csv_export(db, current_user.id, section)
+        media_type = "text/csv; charset=utf-8"
+        filename = f"visart-{current_user.username}-{section}.csv"
+    else:
+        body = ndjson_export(db, current_user.id)
+        media_type = "application/x-ndjson"
+        filename = f"visart-{current_user.username}.ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# ✅ Endpoint de búsqueda y autocompletado de usuarios
+@router.get("/search", response_model=UserListResponse)
+async def search(
+    q: Optional[str] = None,
+    filters: UserSearchFilters = Depends(),
+    limit: int = Query(10, ge=1, le=50),
+    current_user: AuthIdentity = Depends(get_current_active_identity),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Autocompletar usuarios por prefijo de username o nombre completo
+    Filtrar por email o por usuarios inactivos es solo para administradores
+    """
+    # Revelarían si un email está registrado, de quién es
+    # y qué cuentas están desactivadas
+    if (filters.email or filters.is_active is False) and not current_user.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=(
+                "Solo los administradores pueden filtrar por email "
+                "o por usuarios inactivos"
+            )
+        )
+    users = await db.run_sync(search_users, q, filters, limit)
+    return json_bytes_response(dump_user_list(users, limit))
+
 # ✅ Endpoint para obtener usuario por ID (solo admin o propio usuario)
 @router.get("/{user_id}", response_model=UserResponse)
 async def read_user(
     user_id: int,
-    current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    current_user: AuthIdentity = Depends(get_current_active_identity),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Obtener información de un usuario específico
+    (admite If-None-Match / If-Modified-Since)
     """
-    user = db.query(User).filter(User.id == user_id).first()
+    # Solo permitir ver el propio perfil o si es admin
+    allowed = user_id == current_user.id or current_user.is_admin
+    if allowed:
+        not_modified = await not_modified_user(request, db, user_id)
+        if not_modified is not None:
+            return not_modified
+
+    user = await db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -92,11 +273,121 @@ async def read_user(
             detail="Usuario no encontrado"
         )
     
-    # Solo permitir ver el propio perfil o si es admin
-    if user.id != current_user.id and not current_user.is_admin:
+    if not allowed:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="No tienes permisos para ver este usuario"
         )
     
+    set_user_validators(response, user)
     return user
+
+
+# ✅ Endpoint para seguir a un usuario
+@router.post(
+    "/{user_id}/follow",
+    response_model=FollowResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+async def follow_user(
+    user_id: int,
+    current_user: AuthIdentity = Depends(get_current_active_identity),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Seguir a un usuario (su contenido reciente se añade al feed)
+    """
+    if user_id == current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No puedes seguirte a ti mismo"
+        )
+
+    if await db.get(User, user_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Usuario no encontrado"
+        )
+
+    result = await db.execute(
+        select(UserFollows).where(
+            UserFollows.follower_id == current_user.id,
+            UserFollows.followed_id == user_id
+        )
+    )
+    if result.scalars().first():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Ya sigues a este usuario"
+        )
+
+    follow = UserFollows(follower_id=current_user.id, followed_id=user_id)
+    db.add(follow)
+    await db.flush()
+    for statement in follow_updates(current_user.id, user_id, 1):
+        await db.execute(statement)
+    await db.run_sync(feed.backfill_timeline, current_user.id, user_id)
+    await db.commit()
+    notification_hub.publish(
+        user_id,
+        notification_message(
+            "follower", user_id=current_user.id, username=current_user.username
+        ),
+    )
+
+    return follow
+
+
+# ✅ Endpoint para dejar de seguir a un usuario
+@router.delete("/{user_id}/follow", status_code=status.HTTP_204_NO_CONTENT)
+async def unfollow_user(
+    user_id: int,
+    current_user: AuthIdentity = Depends(get_current_active_identity),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Dejar de seguir a un usuario (su contenido sale del feed)
+    """
+    result = await db.execute(
+        select(UserFollows).where(
+            UserFollows.follower_id == current_user.id,
+            UserFollows.followed_id == user_id
+        )
+    )
+    follow = result.scalars().first()
+    if not follow:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No sigues a este usuario"
+        )
+
+    await db.delete(follow)
+    for statement in follow_updates(current_user.id, user_id, -1):
+        await db.execute(statement)
+    await db.run_sync(feed.remove_author_from_timeline, current_user.id, user_id)
+    await db.commit()
+    return None
+
+
+# ✅ Endpoint de estadísticas públicas de un usuario
+@router.get("/{user_id}/stats", response_model=UserStatsResponse)
+async def read_user_stats(
+    user_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Obtener número de publicaciones, seguidores y seguidos (contadores desnormalizados)
+    """
+    row = (await db.execute(stats_query(user_id))).first()
+    if row is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Usuario no encontrado"
+        )
+
+    return UserStatsResponse(
+        user_id=row.id,
+        post_count=row.post_count,
+        follower_count=row.follower_count,
+        following_count=row.following_count
+    )
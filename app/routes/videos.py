@@ -0,0 +1,155 @@
+"""
+Router de generación de videos
+
+POST encola el render y responde 202 al instante; el progreso se consulta con
+GET /videos/{job_id} o se sigue como Server-Sent Events en
+GET /videos/{job_id}/events.
+"""
+
+import asyncio
+import json
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db
+from app.dependencies import get_current_active_identity
+from app.models.job_models import JOB_FAILED, JOB_SUCCEEDED, Job
+from app.schemas.video_schemas import VideoCreate, VideoJobResponse
+from app.services.identity_cache import AuthIdentity
+from app.services.videos import (
+    VIDEO_JOB_KIND,
+    VIDEO_RETRY_AFTER_SECONDS,
+    TooManyPendingVideos,
+    VideoQueueFull,
+    submit_video,
+    video_job_view,
+)
+
+# Configuración
+VIDEO_EVENTS_POLL_SECONDS = float(os.getenv("VIDEO_EVENTS_POLL_SECONDS", 1))
+VIDEO_EVENTS_KEEPALIVE_SECONDS = float(os.getenv("VIDEO_EVENTS_KEEPALIVE_SECONDS", 15))
+
+router = APIRouter(prefix="/videos", tags=["videos"])
+
+
+def video_job_response(request: Request, job: Job) -> dict:
+    return {
+        **video_job_view(job),
+        "status_url": str(request.url_for("get_video_job", job_id=job.id).path),
+        "events_url": str(request.url_for("video_job_events", job_id=job.id).path),
+    }
+
+
+async def get_owned_video_job(
+    db: AsyncSession, job_id: int, current_user: AuthIdentity
+) -> Job:
+    job = await db.get(Job, job_id, populate_existing=True)
+    # Los trabajos de otros usuarios no se revelan
+    if (
+        job is None
+        or job.kind != VIDEO_JOB_KIND
+        or (job.owner_id != current_user.id and not current_user.is_admin)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Video no encontrado"
+        )
+    return job
+
+
+@router.post("", response_model=VideoJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_video(
+    video: VideoCreate,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthIdentity = Depends(get_current_active_identity),
+):
+    """
+    Encola la generación de un video; la publicación se crea al terminar el render
+    """
+    try:
+        job = await db.run_sync(
+            submit_video,
+            current_user.id,
+            video.prompt,
+            video.title,
+            video.duration_seconds,
+            video.is_published,
+        )
+    except TooManyPendingVideos:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Ya tienes el máximo de videos en proceso; espera a que terminen",
+            headers={"Retry-After": str(VIDEO_RETRY_AFTER_SECONDS)},
+        )
+    except VideoQueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="La cola de videos está llena; inténtalo más tarde",
+            headers={"Retry-After": str(VIDEO_RETRY_AFTER_SECONDS)},
+        )
+    return video_job_response(request, job)
+
+
+@router.get("/{job_id}", response_model=VideoJobResponse, name="get_video_job")
+async def get_video_job(
+    job_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthIdentity = Depends(get_current_active_identity),
+):
+    """Estado y progreso del render (para consultar periódicamente)"""
+    job = await get_owned_video_job(db, job_id, current_user)
+    return video_job_response(request, job)
+
+
+@router.get("/{job_id}/events", name="video_job_events")
+async def video_job_events(
+    job_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: AuthIdentity = Depends(get_current_active_identity),
+):
+    """
+    Progreso como Server-Sent Events: un evento `progress` por cada cambio y
+    un `done` final con la publicación (o el error)
+    """
+    job = await get_owned_video_job(db, job_id, current_user)
+    view = VideoJobResponse(**video_job_response(request, job))
+    # No se retiene la conexión a la base entre consultas (rollback expira `job`)
+    await db.rollback()
+
+    async def events():
+        nonlocal view
+        last = None
+        idle = 0.0
+        while True:
+            data = view.model_dump_json()
+            if view.status in (JOB_SUCCEEDED, JOB_FAILED):
+                yield f"event: done\ndata: {data}\n\n"
+                return
+            if data != last:
+                last, idle = data, 0.0
+                yield f"event: progress\ndata: {data}\n\n"
+            elif idle >= VIDEO_EVENTS_KEEPALIVE_SECONDS:
+                idle = 0.0
+                yield ": keepalive\n\n"
+            if await request.is_disconnected():
+                return
+            await asyncio.sleep(VIDEO_EVENTS_POLL_SECONDS)
+            idle += VIDEO_EVENTS_POLL_SECONDS
+            job = await db.get(Job, job_id, populate_existing=True)
+            if job is None:
+                deleted = json.dumps({"job_id": job_id, "status": "deleted"})
+                yield f"event: done\ndata: {deleted}\n\n"
+                return
+            view = VideoJobResponse(**video_job_response(request, job))
+            await db.rollback()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
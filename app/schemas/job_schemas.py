@@ -0,0 +1,34 @@
+"""
+Esquemas Pydantic para trabajos en segundo plano
+"""
+
+from datetime import datetime
+from typing import Any, List, Optional
+from pydantic import BaseModel, ConfigDict
+
+
+class JobResponse(BaseModel):
+    """Estado y progreso de un trabajo"""
+
+    id: int
+    kind: str
+    status: str
+    priority: int
+    progress: int
+    attempts: int
+    max_attempts: int
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class JobListResponse(BaseModel):
+    """Lista de trabajos (más recientes primero)"""
+
+    jobs: List[JobResponse]
+    page_size: int
+    next_cursor: Optional[str] = None
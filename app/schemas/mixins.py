@@ -0,0 +1,19 @@
+"""
+Campos calculados compartidos por varios esquemas Pydantic
+"""
+
+from typing import Dict, Optional
+
+from pydantic import BaseModel, computed_field
+
+from app.utils.asset_urls import avatar_derivative_urls
+
+
+class AvatarUrlsMixin(BaseModel):
+    """Añade `avatar_urls` a un esquema con el campo `avatar_url`"""
+
+    @computed_field
+    @property
+    def avatar_urls(self) -> Optional[Dict[str, str]]:
+        """Avatar en 64, 128 y 256 px; solo si avatar_url es un asset subido"""
+        return avatar_derivative_urls(self.avatar_url)
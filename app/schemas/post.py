@@ -5,7 +5,10 @@ Define las estructuras de datos para validación y serialización de publicacion
 
 from datetime import datetime
 from typing import Optional, List
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, computed_field
+
+from app.schemas.mixins import AvatarUrlsMixin
+from app.utils.asset_urls import derivative_url
 
 
 # Esquemas base
@@ -33,7 +36,7 @@ class PostUpdate(BaseModel):
 
 
 # Esquemas para respuesta - Propietario
-class PostOwnerResponse(BaseModel):
+class PostOwnerResponse(AvatarUrlsMixin):
     """Esquema simplificado del propietario para respuesta de publicación"""
     id: int
     username: str
@@ -49,11 +52,30 @@ class PostResponse(PostBase):
     id: int
     owner_id: int
     owner: PostOwnerResponse
+    video_url: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     
     model_config = ConfigDict(from_attributes=True)
 
+    # Derivados (solo para imágenes y videos subidos como asset;
+    # se generan bajo demanda)
+    @computed_field
+    @property
+    def thumbnail_url(self) -> Optional[str]:
+        """Miniatura de la imagen o del fotograma de portada del video"""
+        return derivative_url(self.image_url or self.video_url, "thumb")
+
+    @computed_field
+    @property
+    def medium_url(self) -> Optional[str]:
+        return derivative_url(self.image_url, "medium")
+
+    @computed_field
+    @property
+    def poster_url(self) -> Optional[str]:
+        return derivative_url(self.video_url, "poster")
+
 
 class PostDetailResponse(PostResponse):
     """Esquema de respuesta detallada para publicación"""
@@ -65,11 +87,12 @@ class PostDetailResponse(PostResponse):
 
 # Esquemas para listas
 class PostListResponse(BaseModel):
-    """Esquema de respuesta para lista de publicaciones"""
+    """Esquema de respuesta para lista de publicaciones (paginación por cursor)"""
     posts: List[PostResponse]
-    total_count: int
-    page: int
+    total_count: Optional[int] = None
+    page: Optional[int] = None
     page_size: int
+    next_cursor: Optional[str] = None
 
 
 # Esquemas para interacciones (likes)
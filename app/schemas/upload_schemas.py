@@ -0,0 +1,33 @@
+"""
+Esquemas Pydantic para las subidas de ficheros multimedia
+"""
+
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class UploadCreate(BaseModel):
+    """Inicio de una subida; con `sha256` se evita transferir lo ya almacenado"""
+
+    filename: str = Field(..., min_length=1, max_length=255)
+    media_type: str = Field(..., max_length=100)
+    size: int = Field(..., gt=0)
+    sha256: Optional[str] = Field(None, pattern="^[0-9a-f]{64}$")
+
+
+class UploadResponse(BaseModel):
+    """
+    Estado de una subida: `offset` es lo ya confirmado (desde ahí se reanuda);
+    `url` aparece al completarse y sirve como image_url, video_url o avatar_url
+    """
+
+    upload_id: str
+    status: str
+    filename: str
+    media_type: str
+    size: int
+    offset: int
+    chunk_size: int
+    sha256: Optional[str] = None
+    url: Optional[str] = None
+    upload_url: str
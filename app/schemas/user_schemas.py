@@ -7,6 +7,8 @@ from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel, EmailStr, ConfigDict
 
+from app.schemas.mixins import AvatarUrlsMixin
+
 
 # Esquemas base
 class UserBase(BaseModel):
@@ -55,7 +57,7 @@ class UserPasswordUpdate(BaseModel):
 
 
 # Esquemas para respuesta
-class UserProfileResponse(BaseModel):
+class UserProfileResponse(AvatarUrlsMixin):
     """Esquema de respuesta para perfil de usuario"""
     id: int
     user_id: int
@@ -82,7 +84,7 @@ class UserResponse(UserBase):
     model_config = ConfigDict(from_attributes=True)
 
 
-class UserPublicResponse(BaseModel):
+class UserPublicResponse(AvatarUrlsMixin):
     """Esquema de respuesta pública para usuario (sin información sensible)"""
     id: int
     username: str
@@ -143,8 +145,8 @@ class UserStatsResponse(BaseModel):
 class UserListResponse(BaseModel):
     """Esquema de respuesta para lista de usuarios"""
     users: List[UserPublicResponse]
-    total_count: int
-    page: int
+    total_count: Optional[int] = None
+    page: Optional[int] = None
     page_size: int
 
 
@@ -0,0 +1,33 @@
+"""
+Esquemas Pydantic para la generación de videos
+"""
+
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, Field
+
+from app.services.videos import VIDEO_MAX_DURATION_SECONDS
+
+
+class VideoCreate(BaseModel):
+    """Pedido de generación de un video a partir de un prompt"""
+
+    prompt: str = Field(..., min_length=3, max_length=2000)
+    title: Optional[str] = Field(None, max_length=200)
+    duration_seconds: int = Field(4, ge=1, le=VIDEO_MAX_DURATION_SECONDS)
+    is_published: bool = True
+
+
+class VideoJobResponse(BaseModel):
+    """Estado del render; post_id y video_url aparecen al terminar"""
+
+    job_id: int
+    status: str
+    progress: int
+    post_id: Optional[int] = None
+    video_url: Optional[str] = None
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    status_url: str
+    events_url: str
@@ -5,8 +5,12 @@ Manejo de contraseñas y tokens JWT
 
 from passlib.context import CryptContext
 from jose import JWTError, jwt
+from collections import OrderedDict
 from datetime import datetime, timedelta
+import hashlib
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 # Cargar variables de entorno
@@ -17,6 +21,12 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 SECRET_KEY = os.getenv("SECRET_KEY", "tu-clave-secreta-muy-segura-aqui-cambia-esto-en-produccion")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", 30))
+TOKEN_CACHE_MAX_SIZE = int(os.getenv("TOKEN_CACHE_MAX_SIZE", 10000))
+
+# Caché de payloads ya verificados: sha256(token) -> (payload, exp)
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+_token_cache_stats = {"hits": 0, "misses": 0}
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -49,13 +59,61 @@ def verify_token(token: str):
     """
     Verifica y decodifica un token JWT
     Retorna el payload si es válido, None si no lo es
+
+    Los payloads verificados se guardan en caché (clave: sha256 del token) hasta
+    el `exp` del propio token, así la firma se comprueba una sola vez.
     """
+    key = hashlib.sha256(token.encode()).digest()
+    now = time.time()
+
+    with _token_cache_lock:
+        entry = _token_cache.get(key)
+        if entry is not None:
+            payload, exp = entry
+            if exp > now:
+                _token_cache.move_to_end(key)
+                _token_cache_stats["hits"] += 1
+                return dict(payload)
+            del _token_cache[key]
+        _token_cache_stats["misses"] += 1
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
 
+    # Solo se cachean tokens con expiración
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)) and TOKEN_CACHE_MAX_SIZE > 0:
+        with _token_cache_lock:
+            _token_cache[key] = (payload, exp)
+            _token_cache.move_to_end(key)
+            while len(_token_cache) > TOKEN_CACHE_MAX_SIZE:
+                _token_cache.popitem(last=False)
+
+    return dict(payload)
+
+
+def clear_token_cache():
+    """
+    Vacía la caché de tokens verificados
+    """
+    with _token_cache_lock:
+        _token_cache.clear()
+
+
+def token_cache_stats() -> dict:
+    """
+    Contadores de la caché de tokens para monitorización
+    """
+    with _token_cache_lock:
+        return {
+            "size": len(_token_cache),
+            "max_size": TOKEN_CACHE_MAX_SIZE,
+            "hits": _token_cache_stats["hits"],
+            "misses": _token_cache_stats["misses"],
+        }
+
 def create_refresh_token(data: dict) -> str:
     """
     Crea un token de refresh con mayor tiempo de expiración
@@ -102,4 +160,4 @@ def is_admin_user(token: str) -> bool:
     if not payload:
         return False
     
-    return payload.get("is_admin", False)
\ No newline at end of file
+    return payload.get("is_admin", False)
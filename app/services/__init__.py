@@ -0,0 +1,3 @@
+"""
+Servicios de la aplicación Visart (lógica de negocio fuera de las rutas)
+"""
@@ -0,0 +1,189 @@
+"""
+Ficheros multimedia almacenados por contenido (MediaAsset)
+
+Cada fichero vive en MEDIA_ROOT/assets/ab/cd/<sha256>.<ext> y se sirve en
+GET /api/assets/<sha256>.<ext>. Como el contenido de una URL no cambia nunca,
+el ETag es el propio SHA-256 (fuerte) y la respuesta se puede cachear un año
+(`immutable`); los Range se responden con 206 sin leer el resto del fichero.
+"""
+
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.responses import FileResponse
+
+from app.models.media_models import MediaAsset
+from app.services.media_storage import media_path
+
+# Configuración
+ASSETS_URL = "/api/assets"
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Aunque alguien llegue a abrir un asset como documento, no puede ejecutar nada
+ASSET_CONTENT_SECURITY_POLICY = "default-src 'none'; sandbox"
+ASSET_CHUNK_BYTES = int(os.getenv("ASSET_CHUNK_BYTES", 1024**2))
+# Con nginx delante: prefijo de un `location internal` con alias a MEDIA_ROOT/assets
+ASSET_ACCEL_REDIRECT_PREFIX = os.getenv("ASSET_ACCEL_REDIRECT_PREFIX", "")
+ASSET_LOCATION_CACHE_SIZE = int(os.getenv("ASSET_LOCATION_CACHE_SIZE", 10000))
+
+# Tipos admitidos: imágenes rasterizadas y video, que el navegador no ejecuta.
+# Nada de image/svg+xml ni HTML: se servirían desde el origen de la API.
+ASSET_MEDIA_TYPES = frozenset(
+    {
+        "image/jpeg",
+        "image/png",
+        "image/gif",
+        "image/webp",
+        "image/avif",
+        "image/bmp",
+        "video/mp4",
+        "video/webm",
+        "video/ogg",
+        "video/quicktime",
+        "video/x-matroska",
+        "video/x-yuv4mpeg",
+    }
+)
+
+
+class AssetLocation(NamedTuple):
+    sha256: str
+    path: str  # relativa a MEDIA_ROOT
+    media_type: str
+    size: int
+
+
+class AssetFileResponse(FileResponse):
+    """
+    FileResponse (Range, If-Range, 416, HEAD y `pathsend` si el servidor lo
+    ofrece) que lee en bloques de ASSET_CHUNK_BYTES: menos saltos a hilos por
+    cada MB servido que los 64 KB por defecto
+    """
+
+    chunk_size = ASSET_CHUNK_BYTES
+
+
+def normalize_media_type(media_type: str) -> str:
+    """`Video/MP4; codecs=...` -> `video/mp4`"""
+    return media_type.split(";", 1)[0].strip().lower()
+
+
+def asset_relative_path(sha256: str, media_type: str) -> str:
+    extension = mimetypes.guess_extension(media_type) or ""
+    return f"assets/{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}"
+
+
+def asset_url(asset: MediaAsset) -> str:
+    return f"{ASSETS_URL}/{os.path.basename(asset.path)}"
+
+
+def asset_etag(sha256: str) -> str:
+    return f'"{sha256}"'
+
+
+def asset_headers(etag: str, media_type: str) -> dict:
+    """
+    Cabeceras de un asset: caché inmutable, sin sniffing de tipo y CSP
+    restrictiva; lo que no es de ASSET_MEDIA_TYPES (assets anteriores a la
+    lista) se sirve como descarga, nunca inline
+    """
+    headers = {
+        "ETag": etag,
+        "Cache-Control": ASSET_CACHE_CONTROL,
+        "X-Content-Type-Options": "nosniff",
+        "Content-Security-Policy": ASSET_CONTENT_SECURITY_POLICY,
+    }
+    if normalize_media_type(media_type) not in ASSET_MEDIA_TYPES:
+        headers["Content-Disposition"] = "attachment"
+    return headers
+
+
+def get_asset(db: Session, sha256: Optional[str]) -> Optional[MediaAsset]:
+    return db.get(MediaAsset, sha256) if sha256 else None
+
+
+def store_asset(
+    db: Session,
+    source: str,
+    sha256: str,
+    size: int,
+    media_type: str,
+    owner_id: Optional[int] = None,
+) -> MediaAsset:
+    """
+    Mueve `source` a la ruta de su contenido y registra el asset (flush, sin
+    commit); si ese contenido ya estaba almacenado, `source` se borra.
+
+    Si otro proceso registra el mismo contenido a la vez se hace rollback de
+    la sesión: llámese antes de añadir otros cambios a `db`.
+    """
+    asset = db.get(MediaAsset, sha256)
+    if asset is not None:
+        os.remove(source)
+        return asset
+
+    relative = asset_relative_path(sha256, media_type)
+    os.replace(source, media_path(relative))
+    asset = MediaAsset(
+        sha256=sha256,
+        size=size,
+        media_type=media_type,
+        path=relative,
+        owner_id=owner_id,
+    )
+    db.add(asset)
+    try:
+        db.flush()
+    except IntegrityError:
+        # Mismo contenido, misma ruta: el fichero que quedó es idéntico
+        db.rollback()
+        asset = db.get(MediaAsset, sha256)
+    return asset
+
+
+class _AssetLocations:
+    """
+    Ubicación de los assets ya consultados: el contenido de un SHA-256 no
+    cambia, así que se guarda sin caducidad (LRU) y las peticiones Range de
+    un mismo video no vuelven a consultar la base
+    """
+
+    def __init__(self, max_size: int = ASSET_LOCATION_CACHE_SIZE):
+        self.max_size = max_size
+        self._locations = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, sha256: str) -> Optional[AssetLocation]:
+        with self._lock:
+            location = self._locations.get(sha256)
+            if location is not None:
+                self._locations.move_to_end(sha256)
+            return location
+
+    def put(self, location: AssetLocation):
+        with self._lock:
+            self._locations[location.sha256] = location
+            while len(self._locations) > self.max_size:
+                self._locations.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._locations.clear()
+
+
+asset_locations = _AssetLocations()
+
+
+def locate_asset(db: Session, sha256: str) -> Optional[AssetLocation]:
+    location = asset_locations.get(sha256)
+    if location is None:
+        asset = db.get(MediaAsset, sha256)
+        if asset is None:
+            return None
+        location = AssetLocation(asset.sha256, asset.path, asset.media_type, asset.size)
+        asset_locations.put(location)
+    return location
@@ -0,0 +1,311 @@
+"""
+Derivados de imágenes y videos (miniaturas, tamaños de avatar y fotograma
+de portada) para Visart Backend
+
+Cada derivado se guarda en MEDIA_ROOT/derivatives/v1/ab/<sha256>-<variante>.jpg:
+depende solo del contenido de origen y de la variante, así que se genera una
+vez y se sirve como un asset más (GET /api/assets/<sha256>/<variante>.jpg).
+
+Se generan al subir el fichero (en segundo plano) o, si no, en la primera
+petición. Pillow decodifica y redimensiona en un pool de procesos dedicado para
+no bloquear el event loop; las peticiones simultáneas del mismo derivado
+esperan a una única generación (single-flight).
+"""
+
+import asyncio
+import io
+import logging
+import os
+import shutil
+import subprocess
+import uuid
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from app.services.media_storage import media_path
+from app.utils.asset_urls import AVATAR_SIZES
+from app.utils.process_pool import BoundedProcessPool
+
+logger = logging.getLogger(__name__)
+
+# Configuración
+DERIVATIVE_WORKERS = int(os.getenv("DERIVATIVE_WORKERS", os.cpu_count() or 1))
+DERIVATIVE_MAX_PENDING = int(os.getenv("DERIVATIVE_MAX_PENDING", 64))
+DERIVATIVE_INLINE = os.getenv("DERIVATIVE_INLINE", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+DERIVATIVE_PREFETCH = os.getenv("DERIVATIVE_PREFETCH", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+DERIVATIVE_JPEG_QUALITY = int(os.getenv("DERIVATIVE_JPEG_QUALITY", 82))
+DERIVATIVE_POSTER_SECONDS = float(os.getenv("DERIVATIVE_POSTER_SECONDS", 1))
+# Cambiarla invalida los derivados ya generados (nuevas rutas y ETags)
+DERIVATIVE_VERSION = 1
+
+
+class Variant(NamedTuple):
+    width: int
+    height: int
+    crop: bool  # True: recorta al tamaño exacto; False: cabe dentro sin deformar
+
+
+DERIVATIVE_VARIANTS: Dict[str, Variant] = {
+    "thumb": Variant(320, 320, False),
+    "medium": Variant(1080, 1080, False),
+    "poster": Variant(1280, 720, False),
+    **{f"avatar-{size}": Variant(size, size, True) for size in AVATAR_SIZES},
+}
+
+# Lo que se genera al subir cada tipo de fichero; el resto, bajo demanda
+PREFETCH_VARIANTS = {"image/": ("thumb",), "video/": ("poster", "thumb")}
+
+
+class DerivativesBusy(Exception):
+    """
+    Se lanza cuando hay demasiados derivados generándose a la vez
+    """
+
+
+def derivative_relative_path(sha256: str, variant: str) -> str:
+    return f"derivatives/v{DERIVATIVE_VERSION}/{sha256[:2]}/{sha256}-{variant}.jpg"
+
+
+def derivative_etag(sha256: str, variant: str) -> str:
+    return f'"{sha256}-{variant}-v{DERIVATIVE_VERSION}"'
+
+
+# Funciones ejecutadas dentro de los procesos del pool (deben ser picklables)
+def _poster_frame(source: str, media_type: str):
+    from PIL import Image
+
+    if media_type == "video/x-yuv4mpeg":
+        # YUV4MPEG2 4:2:0: se lee solo el primer fotograma
+        with open(source, "rb") as video:
+            header = video.readline().split()
+            width = int(next(field[1:] for field in header if field.startswith(b"W")))
+            height = int(next(field[1:] for field in header if field.startswith(b"H")))
+            video.readline()  # "FRAME"
+            luma = Image.frombytes("L", (width, height), video.read(width * height))
+            chroma = [
+                Image.frombytes(
+                    "L", (width // 2, height // 2), video.read(width * height // 4)
+                ).resize((width, height))
+                for _ in range(2)
+            ]
+        return Image.merge("YCbCr", (luma, *chroma)).convert("RGB")
+
+    ffmpeg = shutil.which("ffmpeg")
+    if ffmpeg is None:
+        return None
+    for seconds in (DERIVATIVE_POSTER_SECONDS, 0):
+        # Si el video dura menos que DERIVATIVE_POSTER_SECONDS,
+        # se usa el primer fotograma
+        frame = subprocess.run(
+            [
+                ffmpeg,
+                "-v",
+                "error",
+                "-ss",
+                str(seconds),
+                "-i",
+                source,
+                "-frames:v",
+                "1",
+                "-f",
+                "image2pipe",
+                "-c:v",
+                "png",
+                "-",
+            ],
+            capture_output=True,
+            timeout=60,
+        ).stdout
+        if frame:
+            return Image.open(io.BytesIO(frame))
+    return None
+
+
+def _render_derivative(
+    source: str, media_type: str, variant_name: str, output: str
+) -> bool:
+    """
+    Genera el derivado en `output` (escritura atómica); False si el origen no
+    admite derivados (tipo no soportado o video sin ffmpeg)
+    """
+    from PIL import Image, ImageOps
+
+    variant = DERIVATIVE_VARIANTS[variant_name]
+    if media_type.startswith("video/"):
+        image = _poster_frame(source, media_type)
+        if image is None:
+            return False
+    elif media_type.startswith("image/"):
+        image = Image.open(source)
+        # JPEG: decodifica ya reducido (DCT a 1/2, 1/4 o 1/8) si sobra resolución
+        image.draft("RGB", (variant.width * 2, variant.height * 2))
+        image = ImageOps.exif_transpose(image)
+    else:
+        return False
+
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+
+    if variant.crop:
+        image = ImageOps.fit(image, (variant.width, variant.height), Image.LANCZOS)
+    else:
+        image.thumbnail((variant.width, variant.height), Image.LANCZOS)
+
+    partial = f"{output}.{uuid.uuid4().hex}.part"
+    try:
+        image.save(
+            partial,
+            "JPEG",
+            quality=DERIVATIVE_JPEG_QUALITY,
+            optimize=True,
+            progressive=True,
+        )
+        os.replace(partial, output)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return True
+
+
+class DerivativeGenerator:
+    """
+    Genera derivados fuera del event loop
+
+    Pillow corre en un BoundedProcessPool que rechaza trabajo con
+    DerivativesBusy si hay más de `max_pending` generaciones pendientes (o en
+    el propio proceso en modo `inline`, para tests). Además agrupa las
+    peticiones simultáneas del mismo derivado en una sola generación.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DERIVATIVE_WORKERS,
+        max_pending: int = DERIVATIVE_MAX_PENDING,
+        inline: bool = DERIVATIVE_INLINE,
+    ):
+        self.pool = BoundedProcessPool(
+            max_workers, max_pending, inline, DerivativesBusy, "derivados"
+        )
+        self._in_flight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._background = set()
+        self.generated = 0
+        self.shared = 0
+        self.failed = 0
+
+    async def _generate(
+        self, source: str, media_type: str, variant: str, output: str
+    ) -> Optional[str]:
+        try:
+            created = await self.pool.submit(
+                _render_derivative, source, media_type, variant, output
+            )
+        except DerivativesBusy:
+            raise
+        except Exception:
+            # Imagen corrupta o formato que Pillow no entiende
+            self.failed += 1
+            logger.warning(
+                f"No se pudo generar el derivado {variant} de {source}", exc_info=True
+            )
+            return None
+        self.generated += 1
+        return output if created else None
+
+    async def ensure(
+        self, sha256: str, source: str, media_type: str, variant: str
+    ) -> Optional[str]:
+        """
+        Ruta del derivado, generándolo si aún no existe
+        Devuelve None si el origen no admite derivados
+        """
+        output = media_path(derivative_relative_path(sha256, variant))
+        if os.path.exists(output):
+            return output
+
+        key = (sha256, variant)
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self._generate(source, media_type, variant, output)
+            )
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.shared += 1
+        # Si el cliente que la inició se va, la generación sigue para los demás
+        return await asyncio.shield(future)
+
+    def prefetch(self, sha256: str, source: str, media_type: str):
+        """
+        Genera en segundo plano los derivados habituales de un fichero recién subido
+        """
+        if not DERIVATIVE_PREFETCH:
+            return
+        for prefix, variants in PREFETCH_VARIANTS.items():
+            if media_type.startswith(prefix):
+                for variant in variants:
+                    task = asyncio.ensure_future(
+                        self._prefetch(sha256, source, media_type, variant)
+                    )
+                    self._background.add(task)
+                    task.add_done_callback(self._background.discard)
+
+    async def _prefetch(self, sha256: str, source: str, media_type: str, variant: str):
+        try:
+            await self.ensure(sha256, source, media_type, variant)
+        except DerivativesBusy:
+            # Se generará cuando se pida
+            pass
+
+    def stats(self) -> dict:
+        """Contadores para monitorización"""
+        return {
+            "pending": self.pool.pending,
+            "in_flight": len(self._in_flight),
+            "generated": self.generated,
+            "shared": self.shared,
+            "failed": self.failed,
+        }
+
+    def shutdown(self, wait: bool = True):
+        """
+        Detiene los procesos del pool
+        """
+        self.pool.shutdown(wait=wait)
+
+
+def render_derivatives_now(sha256: str, source: str, media_type: str):
+    """
+    Genera en el proceso actual los derivados habituales (para workers de la
+    cola de trabajos, que ya corren fuera del proceso web)
+    """
+    for prefix, variants in PREFETCH_VARIANTS.items():
+        if media_type.startswith(prefix):
+            for variant in variants:
+                output = media_path(derivative_relative_path(sha256, variant))
+                if os.path.exists(output):
+                    continue
+                try:
+                    _render_derivative(source, media_type, variant, output)
+                except Exception:
+                    # No es motivo para fallar el trabajo: se reintentará bajo demanda
+                    logger.warning(
+                        f"No se pudo generar el derivado {variant} de {source}",
+                        exc_info=True,
+                    )
+
+
+# Instancia compartida por las rutas de assets y subidas
+derivative_generator = DerivativeGenerator()
@@ -0,0 +1,369 @@
+"""
+Cola de envío de correo para Visart Backend
+
+`enqueue` solo añade el mensaje a una cola en memoria y vuelve al momento. Un
+pequeño grupo de workers asyncio (EMAIL_POOL_SIZE) mantiene cada uno una
+conexión SMTP persistente ya autenticada y envía los mensajes por lotes
+(EMAIL_BATCH_SIZE por turno) en un hilo, sin bloquear el bucle de eventos.
+
+Los fallos temporales (4xx, conexión caída) se reintentan con backoff
+exponencial; los permanentes (5xx) o los que agotan EMAIL_MAX_RETRIES pasan a
+la lista de mensajes muertos (`dead_letters`). La cola no es persistente: lo
+pendiente se pierde si el proceso muere.
+"""
+
+import asyncio
+import logging
+import os
+import random
+import smtplib
+import threading
+import time
+from collections import deque
+from email.message import EmailMessage
+from typing import Callable, List, NamedTuple, Optional
+
+logger = logging.getLogger("visart-backend")
+
+# Configuración
+EMAIL_POOL_SIZE = int(os.getenv("EMAIL_POOL_SIZE", 4))
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", 50))
+EMAIL_MAX_RETRIES = int(os.getenv("EMAIL_MAX_RETRIES", 5))
+EMAIL_RETRY_BASE_SECONDS = float(os.getenv("EMAIL_RETRY_BASE_SECONDS", 2))
+EMAIL_QUEUE_MAX_SIZE = int(os.getenv("EMAIL_QUEUE_MAX_SIZE", 10000))
+EMAIL_DEAD_LETTER_MAX_SIZE = int(os.getenv("EMAIL_DEAD_LETTER_MAX_SIZE", 1000))
+EMAIL_STARTTLS = os.getenv("EMAIL_STARTTLS", "true").lower() in ("1", "true", "yes")
+EMAIL_SMTP_TIMEOUT_SECONDS = float(os.getenv("EMAIL_SMTP_TIMEOUT_SECONDS", 30))
+
+
+class QueuedEmail(NamedTuple):
+    message: EmailMessage
+    attempts: int = 0
+
+
+class DeadLetter(NamedTuple):
+    message: EmailMessage
+    attempts: int
+    error: str
+    failed_at: float
+
+
+def build_message(
+    to_address: str, subject: str, body: str, sender: str
+) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = sender
+    message["To"] = to_address
+    message["Subject"] = subject
+    message.set_content(body)
+    return message
+
+
+def smtp_connector(
+    host: str,
+    port: int,
+    user: Optional[str] = None,
+    password: Optional[str] = None,
+    starttls: bool = EMAIL_STARTTLS,
+    timeout: float = EMAIL_SMTP_TIMEOUT_SECONDS,
+) -> Callable[[], smtplib.SMTP]:
+    """
+    Devuelve una función que abre una conexión SMTP (STARTTLS y login incluidos)
+    """
+
+    def connect() -> smtplib.SMTP:
+        server = smtplib.SMTP(host, port, timeout=timeout)
+        try:
+            if starttls:
+                server.starttls()
+            if user:
+                server.login(user, password or "")
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    return connect
+
+
+def _is_permanent(error: Exception) -> bool:
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code >= 500
+    # ValueError: mensaje sin destinatarios o mal formado
+    return isinstance(error, ValueError)
+
+
+class _Connection:
+    """Conexión SMTP persistente de un worker (solo la usa ese worker)"""
+
+    def __init__(self, queue: "EmailQueue"):
+        self.queue = queue
+        self.server: Optional[smtplib.SMTP] = None
+
+    def send(self, message: EmailMessage):
+        if self.server is None:
+            self.server = self.queue._connect()
+            self.queue._count("connections_opened")
+        try:
+            self.server.send_message(message)
+        except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+            # Rechazo del servidor para este mensaje: la conexión sigue siendo válida
+            raise
+        except OSError:
+            # Conexión caída o error de socket (SMTPException también es OSError):
+            # se abrirá otra en el siguiente envío
+            self.close()
+            raise
+
+    def close(self):
+        if self.server is not None:
+            try:
+                self.server.quit()
+            except Exception:
+                self.server.close()
+            self.server = None
+
+
+class EmailQueue:
+    """
+    Cola asíncrona de correo con conexiones SMTP persistentes, lotes,
+    reintentos con backoff y lista de mensajes muertos
+
+    `connect` abre una conexión autenticada; por defecto usa EMAIL_HOST,
+    EMAIL_PORT, EMAIL_USER y EMAIL_PASS (app.core.settings).
+    """
+
+    def __init__(
+        self,
+        connect: Optional[Callable[[], smtplib.SMTP]] = None,
+        sender: Optional[str] = None,
+        pool_size: int = EMAIL_POOL_SIZE,
+        batch_size: int = EMAIL_BATCH_SIZE,
+        max_retries: int = EMAIL_MAX_RETRIES,
+        retry_base_seconds: float = EMAIL_RETRY_BASE_SECONDS,
+        max_size: int = EMAIL_QUEUE_MAX_SIZE,
+        dead_letter_max_size: int = EMAIL_DEAD_LETTER_MAX_SIZE,
+    ):
+        self.connect = connect
+        self.sender = sender
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.max_size = max_size
+        self._pending: deque = deque()
+        self._dead: deque = deque(maxlen=dead_letter_max_size)
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._workers: List[asyncio.Task] = []
+        self._connections: List[_Connection] = []
+        self._in_flight = 0
+        self._retries_scheduled = 0
+        self._counters = {
+            "enqueued": 0,
+            "sent": 0,
+            "retried": 0,
+            "dead": 0,
+            "rejected": 0,
+            "connections_opened": 0,
+        }
+
+    def enqueue(
+        self, to_address: str, subject: str, body: str, sender: Optional[str] = None
+    ) -> bool:
+        """Encola un correo de texto plano; False si la cola está llena"""
+        message = build_message(to_address, subject, body, sender or self._get_sender())
+        return self.enqueue_message(message)
+
+    def enqueue_message(self, message: EmailMessage) -> bool:
+        """
+        Encola un EmailMessage ya construido (se puede llamar desde cualquier hilo)
+        """
+        with self._lock:
+            if len(self._pending) >= self.max_size:
+                self._counters["rejected"] += 1
+                return False
+            self._pending.append(QueuedEmail(message))
+            self._counters["enqueued"] += 1
+        self._notify()
+        return True
+
+    def dead_letters(self) -> List[DeadLetter]:
+        with self._lock:
+            return list(self._dead)
+
+    def retry_dead_letters(self) -> int:
+        """
+        Vuelve a encolar los mensajes muertos
+        (p. ej. tras corregir la configuración SMTP)
+        """
+        with self._lock:
+            dead, self._dead = list(self._dead), deque(maxlen=self._dead.maxlen)
+            self._pending.extend(QueuedEmail(letter.message) for letter in dead)
+        self._notify()
+        return len(dead)
+
+    def start(self):
+        """Arranca los workers en el bucle de eventos actual"""
+        if self._workers:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._connections = [_Connection(self) for _ in range(self.pool_size)]
+        self._workers = [
+            self._loop.create_task(self._run(connection))
+            for connection in self._connections
+        ]
+        self._notify()
+
+    async def join(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que no quede nada pendiente, en curso ni por reintentar"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._busy():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.01)
+        return True
+
+    async def stop(self, timeout: float = 5.0):
+        """
+        Intenta vaciar la cola durante `timeout` segundos, detiene los workers
+        y cierra las conexiones
+        """
+        if not self._workers:
+            return
+        await self.join(timeout)
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        await asyncio.gather(*(asyncio.to_thread(c.close) for c in self._connections))
+        self._workers, self._connections = [], []
+        self._loop = self._wakeup = None
+
+    def stats(self) -> dict:
+        """Contadores para monitorización"""
+        with self._lock:
+            return {
+                **self._counters,
+                "queued": len(self._pending),
+                "in_flight": self._in_flight,
+                "retries_scheduled": self._retries_scheduled,
+                "dead_letters": len(self._dead),
+                "workers": len(self._workers),
+            }
+
+    async def _run(self, connection: _Connection):
+        while True:
+            batch = self._take_batch()
+            if not batch:
+                self._wakeup.clear()
+                # Otro worker o un hilo pudo encolar entre el take y el clear
+                if not self._pending:
+                    await self._wakeup.wait()
+                continue
+            try:
+                results = await asyncio.to_thread(self._send_batch, connection, batch)
+            finally:
+                with self._lock:
+                    self._in_flight -= len(batch)
+            for item, error in results:
+                if error is not None:
+                    self._handle_failure(item, error)
+
+    def _take_batch(self) -> List[QueuedEmail]:
+        with self._lock:
+            batch = [
+                self._pending.popleft()
+                for _ in range(min(self.batch_size, len(self._pending)))
+            ]
+            self._in_flight += len(batch)
+            return batch
+
+    def _send_batch(self, connection: _Connection, batch: List[QueuedEmail]):
+        # Se ejecuta en un hilo: todo el lote por la misma conexión
+        results = []
+        for item in batch:
+            try:
+                connection.send(item.message)
+            except Exception as e:
+                results.append((item, e))
+            else:
+                self._count("sent")
+        return results
+
+    def _handle_failure(self, item: QueuedEmail, error: Exception):
+        attempts = item.attempts + 1
+        if _is_permanent(error) or attempts > self.max_retries:
+            logger.error(
+                f"Correo a {item.message['To']} descartado "
+                f"tras {attempts} intentos: {error}"
+            )
+            with self._lock:
+                self._dead.append(
+                    DeadLetter(item.message, attempts, repr(error), time.time())
+                )
+                self._counters["dead"] += 1
+            return
+        # Backoff exponencial con jitter (1x, 2x, 4x... la base)
+        delay = self.retry_base_seconds * 2 ** (attempts - 1) * random.uniform(0.5, 1.5)
+        with self._lock:
+            self._retries_scheduled += 1
+            self._counters["retried"] += 1
+        self._loop.call_later(delay, self._requeue, item._replace(attempts=attempts))
+
+    def _requeue(self, item: QueuedEmail):
+        with self._lock:
+            self._retries_scheduled -= 1
+            self._pending.append(item)
+        self._notify()
+
+    def _busy(self) -> bool:
+        with self._lock:
+            return (
+                bool(self._pending)
+                or self._in_flight > 0
+                or self._retries_scheduled > 0
+            )
+
+    def _notify(self):
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            wakeup.set()
+        else:
+            loop.call_soon_threadsafe(wakeup.set)
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.connect is None:
+            from app.core.settings import settings
+
+            self.connect = smtp_connector(
+                settings.email_host,
+                settings.email_port,
+                settings.email_user,
+                settings.email_pass,
+            )
+        return self.connect()
+
+    def _get_sender(self) -> str:
+        if self.sender is None:
+            from app.core.settings import settings
+
+            self.sender = settings.email_user
+        return self.sender
+
+
+# Instancia compartida por la aplicación (arrancada en los eventos de app.main)
+email_queue = EmailQueue()
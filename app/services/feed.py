@@ -0,0 +1,272 @@
+"""
+Servicio de feed (timeline) para Visart Backend
+
+Estrategia híbrida de fan-out:
+- Autores con pocos seguidores: la publicación se copia al timeline de cada
+  seguidor en la misma transacción (fan-out on write).
+- Autores con muchos seguidores: el fan-out se hace en segundo plano, por lotes.
+- Autores "celebridad": no se hace fan-out; sus publicaciones se mezclan con el
+  timeline en el momento de leer el feed (pull on read).
+"""
+
+import os
+import threading
+import time
+from typing import List, Optional, Set
+
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, joinedload, sessionmaker
+
+from app.models.feed_models import TimelineEntry
+from app.models.posts import Post
+from app.models.user_models import User, UserFollows
+from app.utils.pagination import KeysetPage, decode_cursor, encode_cursor
+
+# Configuración
+FEED_BACKGROUND_FANOUT_THRESHOLD = int(
+    os.getenv("FEED_BACKGROUND_FANOUT_THRESHOLD", 1000)
+)
+FEED_CELEBRITY_THRESHOLD = int(os.getenv("FEED_CELEBRITY_THRESHOLD", 10000))
+FEED_FANOUT_BATCH_SIZE = int(os.getenv("FEED_FANOUT_BATCH_SIZE", 1000))
+FEED_CELEBRITY_REFRESH_SECONDS = float(os.getenv("FEED_CELEBRITY_REFRESH_SECONDS", 60))
+FEED_BACKFILL_POSTS = int(os.getenv("FEED_BACKFILL_POSTS", 50))
+
+FANOUT_INLINE = "inline"
+FANOUT_BACKGROUND = "background"
+FANOUT_PULL = "pull"
+
+# Caché de autores celebridad: (ids, expira_en)
+_celebrities = (frozenset(), 0.0)
+_celebrities_lock = threading.Lock()
+
+
+def count_followers(db: Session, user_id: int) -> int:
+    # Contador desnormalizado (app.services.user_stats)
+    return (
+        db.execute(
+            select(User.follower_count).where(User.id == user_id)
+        ).scalar_one_or_none()
+        or 0
+    )
+
+
+def fanout_strategy(follower_count: int) -> str:
+    """
+    Decide cómo repartir una publicación según el número de seguidores del autor
+    """
+    if follower_count > FEED_CELEBRITY_THRESHOLD:
+        return FANOUT_PULL
+    if follower_count > FEED_BACKGROUND_FANOUT_THRESHOLD:
+        return FANOUT_BACKGROUND
+    return FANOUT_INLINE
+
+
+def celebrity_author_ids(db: Session) -> Set[int]:
+    """
+    Autores con más de FEED_CELEBRITY_THRESHOLD seguidores (cacheado unos segundos)
+    """
+    global _celebrities
+    ids, expires_at = _celebrities
+    if expires_at > time.monotonic():
+        return ids
+
+    with _celebrities_lock:
+        ids, expires_at = _celebrities
+        if expires_at > time.monotonic():
+            return ids
+        rows = db.execute(
+            select(User.id).where(User.follower_count > FEED_CELEBRITY_THRESHOLD)
+        ).scalars()
+        ids = frozenset(rows)
+        _celebrities = (ids, time.monotonic() + FEED_CELEBRITY_REFRESH_SECONDS)
+        return ids
+
+
+def reset_celebrity_cache():
+    global _celebrities
+    with _celebrities_lock:
+        _celebrities = (frozenset(), 0.0)
+
+
+def _timeline_row(user_id: int, post: Post) -> dict:
+    return {
+        "user_id": user_id,
+        "post_id": post.id,
+        "author_id": post.owner_id,
+        "fecha_creacion": post.fecha_creacion,
+    }
+
+
+def _insert_timeline_rows(db: Session, rows: List[dict]):
+    """
+    Inserta entradas de timeline ignorando las que ya existen (user_id, post_id):
+    un follow puede copiar la publicación antes de que llegue el fan-out, y un
+    fan-out reintentado vuelve a empezar por el primer seguidor
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        statement = postgresql.insert(TimelineEntry).on_conflict_do_nothing()
+    elif dialect == "sqlite":
+        statement = sqlite.insert(TimelineEntry).on_conflict_do_nothing()
+    else:
+        statement = insert(TimelineEntry)
+    db.execute(statement, rows)
+
+
+def add_to_author_timeline(db: Session, post: Post):
+    """
+    El autor siempre ve sus propias publicaciones en su feed
+    """
+    _insert_timeline_rows(db, [_timeline_row(post.owner_id, post)])
+
+
+def fan_out_post(db: Session, post: Post, commit_batches: bool = False):
+    """
+    Copia la publicación al timeline de todos los seguidores del autor, por lotes
+    """
+    follower_ids = db.execute(
+        select(UserFollows.follower_id)
+        .where(UserFollows.followed_id == post.owner_id)
+        .execution_options(yield_per=FEED_FANOUT_BATCH_SIZE)
+    ).scalars()
+
+    for batch in follower_ids.partitions(FEED_FANOUT_BATCH_SIZE):
+        _insert_timeline_rows(
+            db, [_timeline_row(follower_id, post) for follower_id in batch]
+        )
+        if commit_batches:
+            db.commit()
+
+
+def fan_out_post_in_background(bind, post_id: int):
+    """
+    Fan-out en segundo plano (trabajo "feed.fan_out") con una sesión propia
+    """
+    SessionForFanout = sessionmaker(bind=bind, autoflush=False, expire_on_commit=False)
+    with SessionForFanout() as db:
+        post = db.get(Post, post_id)
+        if post is None or not post.is_published:
+            return
+        fan_out_post(db, post, commit_batches=True)
+        db.commit()
+
+
+def publish_post(db: Session, post: Post) -> str:
+    """
+    Reparte una publicación recién creada (o recién publicada)
+    Devuelve la estrategia usada; si es FANOUT_BACKGROUND el llamador debe
+    encolar el trabajo "feed.fan_out" en la misma transacción
+    """
+    add_to_author_timeline(db, post)
+    strategy = fanout_strategy(count_followers(db, post.owner_id))
+    if strategy == FANOUT_INLINE:
+        fan_out_post(db, post)
+    return strategy
+
+
+def remove_post_from_timelines(db: Session, post_id: int):
+    db.execute(delete(TimelineEntry).where(TimelineEntry.post_id == post_id))
+
+
+def backfill_timeline(db: Session, follower_id: int, followed_id: int):
+    """
+    Al seguir a alguien se copian sus publicaciones más recientes al timeline
+    """
+    if followed_id in celebrity_author_ids(db):
+        return
+    posts = (
+        db.execute(
+            select(Post)
+            .where(Post.owner_id == followed_id, Post.is_published.is_(True))
+            .order_by(Post.fecha_creacion.desc(), Post.id.desc())
+            .limit(FEED_BACKFILL_POSTS)
+        )
+        .scalars()
+        .all()
+    )
+    if posts:
+        _insert_timeline_rows(db, [_timeline_row(follower_id, post) for post in posts])
+
+
+def remove_author_from_timeline(db: Session, follower_id: int, followed_id: int):
+    db.execute(
+        delete(TimelineEntry).where(
+            TimelineEntry.user_id == follower_id, TimelineEntry.author_id == followed_id
+        )
+    )
+
+
+def read_feed(
+    db: Session, user_id: int, cursor: Optional[str] = None, limit: int = 20
+) -> KeysetPage:
+    """
+    Devuelve una página del feed (más recientes primero)
+    con cursor sobre (fecha, post_id)
+
+    Mezcla el timeline materializado con las publicaciones de los autores
+    celebridad a los que sigue el usuario. Lanza ValueError si el cursor no es válido.
+    """
+    after = tuple(decode_cursor(cursor)) if cursor else None
+    if after is not None and len(after) != 2:
+        raise ValueError("Cursor inválido")
+
+    timeline = select(TimelineEntry.fecha_creacion, TimelineEntry.post_id).where(
+        TimelineEntry.user_id == user_id
+    )
+    if after is not None:
+        timeline = timeline.where(
+            tuple_(TimelineEntry.fecha_creacion, TimelineEntry.post_id) < tuple_(*after)
+        )
+    refs = db.execute(
+        timeline.order_by(
+            TimelineEntry.fecha_creacion.desc(), TimelineEntry.post_id.desc()
+        ).limit(limit + 1)
+    ).all()
+
+    celebrities = celebrity_author_ids(db)
+    if celebrities:
+        followed = (
+            db.execute(
+                select(UserFollows.followed_id).where(
+                    UserFollows.follower_id == user_id,
+                    UserFollows.followed_id.in_(celebrities),
+                )
+            )
+            .scalars()
+            .all()
+        )
+        if followed:
+            pulled = select(Post.fecha_creacion, Post.id).where(
+                Post.owner_id.in_(followed), Post.is_published.is_(True)
+            )
+            if after is not None:
+                pulled = pulled.where(
+                    tuple_(Post.fecha_creacion, Post.id) < tuple_(*after)
+                )
+            refs += db.execute(
+                pulled.order_by(Post.fecha_creacion.desc(), Post.id.desc()).limit(
+                    limit + 1
+                )
+            ).all()
+            refs = sorted({tuple(ref) for ref in refs}, reverse=True)
+
+    refs = [tuple(ref) for ref in refs[: limit + 1]]
+    next_cursor = encode_cursor(refs[limit - 1]) if len(refs) > limit else None
+    refs = refs[:limit]
+
+    post_ids = [post_id for _, post_id in refs]
+    posts_by_id = (
+        {
+            post.id: post
+            for post in db.query(Post)
+            .options(joinedload(Post.owner))
+            .filter(Post.id.in_(post_ids))
+        }
+        if post_ids
+        else {}
+    )
+    items: List[Post] = [
+        posts_by_id[post_id] for post_id in post_ids if post_id in posts_by_id
+    ]
+    return KeysetPage(items=items, next_cursor=next_cursor)
@@ -0,0 +1,163 @@
+"""
+Caché de identidades autenticadas para Visart Backend
+Evita consultar la tabla users en cada petición autenticada
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from sqlalchemy import select
+
+from app.models.user_models import User
+
+# Configuración
+IDENTITY_CACHE_TTL_SECONDS = float(os.getenv("IDENTITY_CACHE_TTL_SECONDS", 60))
+IDENTITY_CACHE_MAX_SIZE = int(os.getenv("IDENTITY_CACHE_MAX_SIZE", 10000))
+
+
+class AuthIdentity(NamedTuple):
+    """
+    Instantánea inmutable con los campos que necesita la autorización
+    """
+
+    id: int
+    username: str
+    is_active: bool
+    is_admin: bool
+
+
+class IdentityCache:
+    """
+    Caché LRU con expiración (TTL) de identidades, indexada por username y por id
+
+    Es local a cada proceso; las rutas que modifican usuarios deben llamar a
+    `invalidate` después del commit.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = IDENTITY_CACHE_TTL_SECONDS,
+        max_size: int = IDENTITY_CACHE_MAX_SIZE,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = (
+            OrderedDict()
+        )  # username -> (identity, expira_en)
+        self._usernames_by_id = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, username: str) -> Optional[AuthIdentity]:
+        with self._lock:
+            entry = self._entries.get(username)
+            if entry is None:
+                self.misses += 1
+                return None
+            identity, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._remove(username)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(username)
+            self.hits += 1
+            return identity
+
+    def put(self, identity: AuthIdentity):
+        with self._lock:
+            # Si el usuario cambió de username se elimina la entrada anterior
+            previous = self._usernames_by_id.get(identity.id)
+            if previous is not None and previous != identity.username:
+                self._remove(previous)
+            self._entries[identity.username] = (
+                identity,
+                time.monotonic() + self.ttl_seconds,
+            )
+            self._entries.move_to_end(identity.username)
+            self._usernames_by_id[identity.id] = identity.username
+            while len(self._entries) > self.max_size:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._forget_id(evicted)
+                self.evictions += 1
+
+    def invalidate(self, user_id: Optional[int] = None, username: Optional[str] = None):
+        with self._lock:
+            if user_id is not None:
+                cached_username = self._usernames_by_id.get(user_id)
+                if cached_username is not None:
+                    self._remove(cached_username)
+            if username is not None:
+                self._remove(username)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._usernames_by_id.clear()
+
+    def stats(self) -> dict:
+        """Contadores para monitorización"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _remove(self, username: str):
+        entry = self._entries.pop(username, None)
+        if entry is not None:
+            self._forget_id(entry[0])
+
+    def _forget_id(self, identity: AuthIdentity):
+        if self._usernames_by_id.get(identity.id) == identity.username:
+            del self._usernames_by_id[identity.id]
+
+
+# Instancia compartida por las dependencias de autenticación
+identity_cache = IdentityCache()
+
+
+async def get_identity(db, username: str) -> Optional[AuthIdentity]:
+    """
+    Devuelve la identidad del usuario desde la caché o,
+    si no está, desde la base de datos
+    """
+    identity = identity_cache.get(username)
+    if identity is not None:
+        return identity
+
+    # Solo las columnas necesarias, sin cargar el perfil ni dejar el User en la sesión
+    columns = [User.id, User.username, User.is_active]
+    if hasattr(User, "is_admin"):
+        columns.append(User.is_admin)
+    row = (await db.execute(select(*columns).where(User.username == username))).first()
+    if row is None:
+        return None
+
+    identity = AuthIdentity(
+        id=row.id,
+        username=row.username,
+        is_active=bool(row.is_active),
+        is_admin=bool(getattr(row, "is_admin", False)),
+    )
+    identity_cache.put(identity)
+    return identity
+
+
+def invalidate_user(user: User, previous_username: Optional[str] = None):
+    """
+    Elimina al usuario de la caché
+    (llamar tras actualizar, desactivar o cambiar permisos)
+    """
+    identity_cache.invalidate(
+        user_id=user.id, username=previous_username or user.username
+    )
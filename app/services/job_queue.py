@@ -0,0 +1,342 @@
+"""
+Cola de trabajos persistente en base de datos para Visart Backend
+
+Los trabajos se guardan en la tabla `jobs` en la misma transacción que los
+crea, así que no se pierden si el proceso muere. Los workers (`python -m
+app.worker`) los reclaman con un único UPDATE sobre los candidatos:
+
+- PostgreSQL: `SELECT ... FOR UPDATE SKIP LOCKED`, cada worker se salta las
+  filas que otro está reclamando en ese momento, sin esperas ni duplicados.
+- SQLite: no existe SKIP LOCKED; el UPDATE con subconsulta es atómico porque
+  SQLite serializa las escrituras (bloqueo de la base), que hace de fallback.
+
+Cada reclamación fija un `lock_token` y un `locked_until` (visibility
+timeout). El handler renueva el plazo al informar progreso; si el worker muere,
+al vencer el plazo el trabajo vuelve a estar disponible. Los fallos se
+reintentan con backoff exponencial hasta `max_attempts`.
+"""
+
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.job_models import (
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    Job,
+)
+
+logger = logging.getLogger("visart-backend")
+
+# Configuración
+JOBS_VISIBILITY_TIMEOUT_SECONDS = float(
+    os.getenv("JOBS_VISIBILITY_TIMEOUT_SECONDS", 300)
+)
+JOBS_MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", 3))
+JOBS_RETRY_BASE_SECONDS = float(os.getenv("JOBS_RETRY_BASE_SECONDS", 10))
+
+jobs_table = Job.__table__
+
+# Handlers registrados: kind -> función(JobContext) que devuelve el resultado (JSON)
+JOB_HANDLERS: Dict[str, Callable[["JobContext"], Any]] = {}
+
+
+def job_handler(kind: str):
+    """Decorador que registra el handler de un tipo de trabajo"""
+
+    def register(handler):
+        JOB_HANDLERS[kind] = handler
+        return handler
+
+    return register
+
+
+class ClaimedJob(NamedTuple):
+    id: int
+    kind: str
+    payload: dict
+    attempts: int
+    max_attempts: int
+    lock_token: str
+
+
+class JobContext:
+    """
+    Lo que recibe un handler: el trabajo reclamado, una sesión propia,
+    `report_progress` (que además renueva el visibility timeout) y
+    `after_commit` para efectos que solo deben ocurrir si el trabajo se confirma
+    """
+
+    def __init__(
+        self,
+        job: ClaimedJob,
+        db: Session,
+        visibility_timeout: float = JOBS_VISIBILITY_TIMEOUT_SECONDS,
+    ):
+        self.job = job
+        self.db = db
+        self.visibility_timeout = visibility_timeout
+        self.callbacks: List[Callable[[], Any]] = []
+
+    @property
+    def payload(self) -> dict:
+        return self.job.payload
+
+    def report_progress(self, progress: int) -> bool:
+        """
+        Guarda el progreso (0-100) en su propia transacción
+        Devuelve False si el trabajo ya no pertenece a este worker (plazo vencido)
+        """
+        return report_progress(
+            self.db.get_bind(), self.job, progress, self.visibility_timeout
+        )
+
+    def after_commit(self, func: Callable, *args):
+        """Programa `func(*args)` para después del commit de complete_job"""
+        self.callbacks.append(lambda: func(*args))
+
+
+def enqueue_job(
+    db: Session,
+    kind: str,
+    payload: Optional[dict] = None,
+    priority: int = 0,
+    owner_id: Optional[int] = None,
+    max_attempts: int = JOBS_MAX_ATTEMPTS,
+    run_after: Optional[datetime] = None,
+) -> Job:
+    """
+    Añade un trabajo a la sesión (con flush, para tener su id); se hace visible
+    para los workers con el commit del llamador
+    """
+    job = Job(
+        kind=kind,
+        payload=payload or {},
+        priority=priority,
+        owner_id=owner_id,
+        max_attempts=max_attempts,
+        status=JOB_QUEUED,
+        run_after=run_after or datetime.utcnow(),
+    )
+    db.add(job)
+    db.flush()
+    return job
+
+
+def _claimable(now: datetime):
+    queued = and_(Job.status == JOB_QUEUED, Job.run_after <= now)
+    # Reclamado por un worker que no terminó a tiempo (murió o se colgó)
+    abandoned = and_(Job.status == JOB_RUNNING, Job.locked_until < now)
+    return and_(or_(queued, abandoned), Job.attempts < Job.max_attempts)
+
+
+def claim_jobs(
+    db: Session,
+    worker_id: str,
+    limit: int = 1,
+    kinds: Optional[List[str]] = None,
+    visibility_timeout: float = JOBS_VISIBILITY_TIMEOUT_SECONDS,
+) -> List[ClaimedJob]:
+    """
+    Reclama hasta `limit` trabajos (más prioritarios y antiguos primero) y hace commit
+    """
+    now = datetime.utcnow()
+    token = uuid.uuid4().hex
+    candidates = select(Job.id).where(_claimable(now))
+    if kinds:
+        candidates = candidates.where(Job.kind.in_(kinds))
+    candidates = candidates.order_by(Job.priority.desc(), Job.id).limit(limit)
+    if db.get_bind().dialect.name == "postgresql":
+        candidates = candidates.with_for_update(skip_locked=True)
+
+    rows = db.execute(
+        update(jobs_table)
+        .where(jobs_table.c.id.in_(candidates))
+        .values(
+            status=JOB_RUNNING,
+            attempts=jobs_table.c.attempts + 1,
+            lock_token=token,
+            locked_by=worker_id,
+            locked_until=now + timedelta(seconds=visibility_timeout),
+            started_at=now,
+            fecha_actualizacion=now,
+        )
+        .returning(
+            jobs_table.c.id,
+            jobs_table.c.kind,
+            jobs_table.c.payload,
+            jobs_table.c.attempts,
+            jobs_table.c.max_attempts,
+            jobs_table.c.priority,
+        )
+    ).all()
+    db.commit()
+    rows.sort(key=lambda row: (-row.priority, row.id))
+    return [
+        ClaimedJob(
+            row.id, row.kind, row.payload or {}, row.attempts, row.max_attempts, token
+        )
+        for row in rows
+    ]
+
+
+def _owned(job: ClaimedJob):
+    # Solo el worker que tiene el trabajo reclamado puede cerrarlo
+    return and_(jobs_table.c.id == job.id, jobs_table.c.lock_token == job.lock_token)
+
+
+def report_progress(
+    bind,
+    job: ClaimedJob,
+    progress: int,
+    visibility_timeout: float = JOBS_VISIBILITY_TIMEOUT_SECONDS,
+) -> bool:
+    now = datetime.utcnow()
+    with Session(bind=bind) as db:
+        rowcount = db.execute(
+            update(jobs_table)
+            .where(_owned(job))
+            .values(
+                progress=max(0, min(100, int(progress))),
+                locked_until=now + timedelta(seconds=visibility_timeout),
+                fecha_actualizacion=now,
+            )
+        ).rowcount
+        db.commit()
+    return rowcount == 1
+
+
+def complete_job(db: Session, job: ClaimedJob, result: Any = None) -> bool:
+    """
+    Marca el trabajo como terminado en la misma transacción que los cambios
+    que haya dejado el handler en `db`
+    """
+    now = datetime.utcnow()
+    rowcount = db.execute(
+        update(jobs_table)
+        .where(_owned(job))
+        .values(
+            status=JOB_SUCCEEDED,
+            progress=100,
+            result=result,
+            error=None,
+            lock_token=None,
+            locked_until=None,
+            finished_at=now,
+            fecha_actualizacion=now,
+        )
+    ).rowcount
+    if rowcount != 1:
+        # Otro worker retomó el trabajo: se descartan también los cambios del handler
+        db.rollback()
+        return False
+    db.commit()
+    return True
+
+
+def fail_job(
+    db: Session,
+    job: ClaimedJob,
+    error: str,
+    retry_base_seconds: float = JOBS_RETRY_BASE_SECONDS,
+) -> bool:
+    """
+    Devuelve el trabajo a la cola con backoff exponencial, o lo marca como
+    fallido si ya agotó sus intentos
+    """
+    now = datetime.utcnow()
+    if job.attempts >= job.max_attempts:
+        values = {"status": JOB_FAILED, "finished_at": now}
+    else:
+        delay = retry_base_seconds * 2 ** (job.attempts - 1)
+        values = {"status": JOB_QUEUED, "run_after": now + timedelta(seconds=delay)}
+    rowcount = db.execute(
+        update(jobs_table)
+        .where(_owned(job))
+        .values(
+            error=error[:4000],
+            lock_token=None,
+            locked_until=None,
+            fecha_actualizacion=now,
+            **values,
+        )
+    ).rowcount
+    db.commit()
+    return rowcount == 1
+
+
+def reap_expired_jobs(db: Session) -> int:
+    """
+    Marca como fallidos los trabajos cuyo plazo venció en el último intento
+    (los que aún tienen intentos se vuelven a reclamar en claim_jobs)
+    """
+    now = datetime.utcnow()
+    rowcount = db.execute(
+        update(jobs_table)
+        .where(
+            jobs_table.c.status == JOB_RUNNING,
+            jobs_table.c.locked_until < now,
+            jobs_table.c.attempts >= jobs_table.c.max_attempts,
+        )
+        .values(
+            status=JOB_FAILED,
+            error="Visibility timeout vencido",
+            lock_token=None,
+            locked_until=None,
+            finished_at=now,
+            fecha_actualizacion=now,
+        )
+    ).rowcount
+    db.commit()
+    return rowcount
+
+
+def run_job(
+    db: Session,
+    job: ClaimedJob,
+    visibility_timeout: float = JOBS_VISIBILITY_TIMEOUT_SECONDS,
+) -> bool:
+    """
+    Ejecuta el handler del trabajo y registra el resultado; True si terminó bien
+    """
+    handler = JOB_HANDLERS.get(job.kind)
+    if handler is None:
+        # Sin handler no tiene sentido reintentar
+        fail_job(
+            db,
+            job._replace(attempts=job.max_attempts),
+            f"Tipo de trabajo desconocido: {job.kind}",
+        )
+        return False
+    ctx = JobContext(job, db, visibility_timeout)
+    try:
+        result = handler(ctx)
+    except Exception as e:
+        db.rollback()
+        logger.exception(
+            f"Trabajo {job.id} ({job.kind}) falló en el intento {job.attempts}"
+        )
+        fail_job(db, job, f"{type(e).__name__}: {e}")
+        return False
+    if not complete_job(db, job, result):
+        return False
+    for callback in ctx.callbacks:
+        try:
+            callback()
+        except Exception as e:
+            # El trabajo ya está confirmado: un efecto posterior fallido no lo reintenta
+            logger.error(f"Error tras confirmar el trabajo {job.id} ({job.kind}): {e}")
+    return True
+
+
+def queue_stats(db: Session) -> dict:
+    """Trabajos por estado (para monitorización)"""
+    rows = db.execute(select(Job.status, func.count()).group_by(Job.status)).all()
+    return {status: count for status, count in rows}
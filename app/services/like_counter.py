@@ -0,0 +1,169 @@
+"""
+Contadores de "me gusta" con escritura agrupada para Visart Backend
+
+Cada like/unlike inserta o borra su fila en post_likes (filas distintas, sin
+contención) y suma su delta a un buffer en memoria. Una tarea periódica vuelca
+los deltas acumulados por publicación en un único UPDATE por lotes cada
+LIKES_FLUSH_INTERVAL_MS, así mil likes sobre una publicación viral son una sola
+escritura sobre su fila en lugar de mil transacciones serializadas.
+
+Los deltas pendientes se pierden si el proceso muere antes del volcado;
+post_likes es la fuente de verdad y `reconcile_likes_count` recalcula el contador.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Dict, Optional
+
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.like_models import PostLike
+from app.models.posts import Post
+
+logger = logging.getLogger("visart-backend")
+
+# Configuración
+LIKES_FLUSH_INTERVAL_MS = int(os.getenv("LIKES_FLUSH_INTERVAL_MS", 200))
+
+posts_table = Post.__table__
+
+# UPDATE relativo (seguro con varios procesos volcando a la vez),
+# ejecutado como executemany.
+# fecha_actualizacion se fija a sí misma: un like no es una edición de la publicación
+_apply_deltas = (
+    update(posts_table)
+    .where(posts_table.c.id == bindparam("b_post_id"))
+    .values(
+        likes_count=posts_table.c.likes_count + bindparam("b_delta"),
+        fecha_actualizacion=posts_table.c.fecha_actualizacion,
+    )
+)
+
+
+class LikeCounterBuffer:
+    """
+    Acumula deltas de likes por publicación y los vuelca en lotes
+
+    `bind` es el engine destino; por defecto el de app.db.session.
+    """
+
+    def __init__(self, bind=None, flush_interval_ms: int = LIKES_FLUSH_INTERVAL_MS):
+        self.bind = bind
+        self.flush_interval_ms = flush_interval_ms
+        self._deltas: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.flushes = 0
+        self.rows_written = 0
+        self.deltas_received = 0
+
+    def add(self, post_id: int, delta: int):
+        with self._lock:
+            self._deltas[post_id] = self._deltas.get(post_id, 0) + delta
+            self.deltas_received += 1
+
+    def pending(self, post_id: int) -> int:
+        """
+        Delta aún no volcado para una publicación (lectura de las propias escrituras)
+        """
+        with self._lock:
+            return self._deltas.get(post_id, 0)
+
+    def flush(self) -> int:
+        """
+        Vuelca los deltas acumulados en una transacción; devuelve las filas actualizadas
+        Si el volcado falla, los deltas vuelven al buffer para el siguiente intento
+        """
+        with self._lock:
+            deltas, self._deltas = self._deltas, {}
+        rows = [
+            {"b_post_id": post_id, "b_delta": delta}
+            for post_id, delta in deltas.items()
+            if delta
+        ]
+        if not rows:
+            return 0
+
+        try:
+            with Session(bind=self._get_bind()) as db:
+                db.execute(_apply_deltas, rows)
+                db.commit()
+        except Exception:
+            with self._lock:
+                for post_id, delta in deltas.items():
+                    self._deltas[post_id] = self._deltas.get(post_id, 0) + delta
+            raise
+
+        with self._lock:
+            self.flushes += 1
+            self.rows_written += len(rows)
+        return len(rows)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval_ms / 1000)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.error(f"Error al volcar los contadores de likes: {e}")
+
+    def start(self):
+        """Arranca el volcado periódico en el bucle de eventos actual"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Detiene el volcado periódico y vuelca lo pendiente"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await asyncio.to_thread(self.flush)
+
+    def stats(self) -> dict:
+        """Contadores para monitorización"""
+        with self._lock:
+            return {
+                "pending_posts": len(self._deltas),
+                "deltas_received": self.deltas_received,
+                "flushes": self.flushes,
+                "rows_written": self.rows_written,
+                "flush_interval_ms": self.flush_interval_ms,
+            }
+
+    def _get_bind(self):
+        if self.bind is None:
+            from app.db.session import engine
+
+            return engine
+        return self.bind
+
+
+# Instancia compartida por las rutas de likes
+like_counter = LikeCounterBuffer()
+
+
+def reconcile_likes_count(db: Session, post_id: int) -> int:
+    """
+    Recalcula likes_count desde post_likes (tras una caída con deltas sin volcar)
+    Tiene en cuenta el delta pendiente de este proceso para no contarlo dos veces
+    """
+    actual = db.execute(
+        select(func.count()).where(PostLike.post_id == post_id)
+    ).scalar_one()
+    db.execute(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(
+            likes_count=actual - like_counter.pending(post_id),
+            fecha_actualizacion=Post.fecha_actualizacion,
+        )
+    )
+    db.commit()
+    return actual
@@ -0,0 +1,19 @@
+"""
+Almacenamiento local de ficheros multimedia para Visart Backend
+
+Los ficheros viven bajo MEDIA_ROOT: `assets/` (por contenido, se sirven en
+/api/assets, ver app.services.assets), `derivatives/` (miniaturas, ver
+app.services.derivatives) y `uploads/` (subidas a medias).
+"""
+
+import os
+
+# Configuración
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", "./media")
+
+
+def media_path(relative_path: str) -> str:
+    """Ruta absoluta de un fichero de MEDIA_ROOT (crea su directorio)"""
+    path = os.path.join(os.path.abspath(MEDIA_ROOT), relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
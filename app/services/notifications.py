@@ -0,0 +1,393 @@
+"""
+Notificaciones en tiempo real por WebSocket (/ws/notifications)
+
+Cada usuario autenticado tiene un canal con todas sus conexiones abiertas
+(pestañas, dispositivos), que reciben los eventos que le afectan:
+
+- `follower`: alguien empieza a seguirle
+- `like`: alguien da me gusta a una de sus publicaciones
+- `post`: alguien a quien sigue publica (un elemento nuevo en su feed)
+
+Cada conexión tiene una cola de envío acotada (NOTIFY_QUEUE_SIZE). Un cliente
+que no lee al ritmo al que le llegan eventos la llena, o tarda más de
+NOTIFY_SEND_TIMEOUT_SECONDS en aceptar un mensaje, y se le desconecta con el
+código 1013 ("inténtalo más tarde") en lugar de acumular memoria en el
+servidor; al reconectar recupera lo perdido con los endpoints REST.
+
+El JWT solo se comprueba al conectar: la conexión se cierra con 1008 cuando
+caduca el token, y `disconnect_user` cierra el canal de un usuario cuya cuenta
+se desactiva o cuyo token deja de identificarle (cambio de username).
+
+Los envíos se hacen por lotes (una tarea por lote de destinatarios, no por
+conexión), así que las conexiones inactivas no cuestan más que su socket; solo
+un cliente que deja de aceptar datos pasa a tener una tarea propia.
+
+El hub vive en la memoria del proceso: cada worker de uvicorn entrega a sus
+propias conexiones los eventos que se producen en él. Los que nacen en los
+workers de la cola de trabajos (p. ej. videos publicados) no se notifican.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from starlette.websockets import WebSocket
+
+from app.models.posts import Post
+from app.models.user_models import UserFollows
+from app.services.feed import count_followers
+
+logger = logging.getLogger("visart-backend")
+
+# Configuración
+NOTIFY_QUEUE_SIZE = int(os.getenv("NOTIFY_QUEUE_SIZE", 100))
+NOTIFY_SEND_TIMEOUT_SECONDS = float(os.getenv("NOTIFY_SEND_TIMEOUT_SECONDS", 10))
+# Un envío que no termina en este tiempo sale del lote y sigue en su propia tarea
+NOTIFY_STALL_SECONDS = float(os.getenv("NOTIFY_STALL_SECONDS", 0.05))
+NOTIFY_FANOUT_BATCH_SIZE = int(os.getenv("NOTIFY_FANOUT_BATCH_SIZE", 1000))
+NOTIFY_MAX_CONNECTIONS = int(os.getenv("NOTIFY_MAX_CONNECTIONS", 50000))
+
+# Códigos de cierre (RFC 6455)
+CLOSE_GOING_AWAY = 1001
+CLOSE_POLICY_VIOLATION = 1008
+CLOSE_TRY_AGAIN_LATER = 1013
+
+
+class TooManyConnections(Exception):
+    """
+    Se lanza cuando el proceso ya tiene NOTIFY_MAX_CONNECTIONS conexiones abiertas
+    """
+
+
+def notification_message(kind: str, **data) -> str:
+    """Evento serializado una sola vez, para todas las conexiones que lo reciben"""
+    return json.dumps({"type": kind, **data, "ts": time.time()}, separators=(",", ":"))
+
+
+def post_notification(post: Post, username: str) -> str:
+    return notification_message(
+        "post",
+        post_id=post.id,
+        author_id=post.owner_id,
+        username=username,
+        title=post.title,
+    )
+
+
+class Subscriber:
+    """Una conexión abierta y sus mensajes pendientes de enviar"""
+
+    __slots__ = ("user_id", "websocket", "queue", "busy", "sending", "closed")
+
+    def __init__(self, user_id: int, websocket: WebSocket):
+        self.user_id = user_id
+        self.websocket = websocket
+        self.queue: deque = deque()
+        self.busy = False  # algún lote está vaciando su cola
+        self.sending: Optional[asyncio.Task] = None  # tarea propia, solo si es lento
+        self.closed = False
+
+
+class NotificationHub:
+    """
+    Canales por usuario con colas de envío acotadas
+
+    `publish`, `publish_many` y `notify_followers` se pueden llamar desde
+    cualquier hilo (las rutas síncronas corren en el threadpool): la entrega
+    se pasa al event loop con una llamada por lote de destinatarios.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = NOTIFY_QUEUE_SIZE,
+        send_timeout: float = NOTIFY_SEND_TIMEOUT_SECONDS,
+        stall_seconds: float = NOTIFY_STALL_SECONDS,
+        batch_size: int = NOTIFY_FANOUT_BATCH_SIZE,
+        max_connections: int = NOTIFY_MAX_CONNECTIONS,
+    ):
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.stall_seconds = stall_seconds
+        self.batch_size = batch_size
+        self.max_connections = max_connections
+        self._channels: Dict[int, Set[Subscriber]] = {}
+        self._connections = 0
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._counters = {
+            "accepted": 0,
+            "rejected": 0,
+            "published": 0,
+            "delivered": 0,
+            "evicted": 0,
+            "disconnected": 0,
+            "fanouts": 0,
+        }
+
+    def start(self):
+        """Fija el event loop en el que se hacen los envíos"""
+        self._loop = asyncio.get_running_loop()
+
+    async def stop(self):
+        """Cierra todas las conexiones (1001, el servidor se apaga)"""
+        with self._lock:
+            subscribers = [
+                subscriber
+                for channel in self._channels.values()
+                for subscriber in channel
+            ]
+        for subscriber in subscribers:
+            self._discard(subscriber)
+            if subscriber.sending is not None:
+                subscriber.sending.cancel()
+        await asyncio.gather(
+            *(self._close(subscriber, CLOSE_GOING_AWAY) for subscriber in subscribers)
+        )
+        self._loop = None
+
+    def subscribe(self, user_id: int, websocket: WebSocket) -> Subscriber:
+        """Registra una conexión ya aceptada en el canal del usuario"""
+        subscriber = Subscriber(user_id, websocket)
+        with self._lock:
+            if self._connections >= self.max_connections:
+                self._counters["rejected"] += 1
+                raise TooManyConnections()
+            self._channels.setdefault(user_id, set()).add(subscriber)
+            self._connections += 1
+            self._counters["accepted"] += 1
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        """Da de baja la conexión (el cliente se fue); lo pendiente se descarta"""
+        self._discard(subscriber)
+
+    async def close(self, subscriber: Subscriber, code: int):
+        """Da de baja la conexión y la cierra con `code` (p. ej. token caducado)"""
+        self._drop(subscriber)
+        await self._close(subscriber, code)
+
+    def disconnect_user(self, user_id: int, code: int = CLOSE_POLICY_VIOLATION) -> int:
+        """
+        Cierra todas las conexiones del usuario (cuenta desactivada); se puede
+        llamar desde cualquier hilo. Devuelve cuántas eran.
+        """
+        with self._lock:
+            subscribers = list(self._channels.get(user_id, ()))
+            self._counters["disconnected"] += len(subscribers)
+        if subscribers:
+            self._call_in_loop(self._close_all, subscribers, code)
+        return len(subscribers)
+
+    def connected_user_ids(self) -> Set[int]:
+        with self._lock:
+            return set(self._channels)
+
+    def publish(self, user_id: int, message: str) -> int:
+        """Envía un evento a todas las conexiones del usuario; devuelve cuántas son"""
+        return self.publish_many((user_id,), message)
+
+    def publish_many(self, user_ids: Iterable[int], message: str) -> int:
+        with self._lock:
+            subscribers = [
+                subscriber
+                for user_id in user_ids
+                for subscriber in self._channels.get(user_id, ())
+            ]
+            self._counters["published"] += len(subscribers)
+        if subscribers:
+            self._call_in_loop(self._push_all, subscribers, message)
+        return len(subscribers)
+
+    def notify_followers(self, bind, author_id: int, message: str) -> int:
+        """
+        Envía un evento a los seguidores conectados del autor, por lotes de
+        `batch_size` (una consulta y una sola llamada al event loop por lote)
+
+        Consulta la base, así que es bloqueante: las rutas lo programan en
+        BackgroundTasks, después del fan-out del timeline.
+        """
+        delivered = 0
+        for batch in self._connected_followers(bind, author_id):
+            delivered += self.publish_many(batch, message)
+        self._count("fanouts")
+        return delivered
+
+    def _connected_followers(self, bind, author_id: int) -> Iterator[List[int]]:
+        connected = self.connected_user_ids()
+        connected.discard(author_id)
+        if not connected:
+            return
+        with Session(bind=bind) as db:
+            if count_followers(db, author_id) <= len(connected):
+                # Menos seguidores que usuarios conectados: se recorren sus seguidores
+                follower_ids = db.execute(
+                    select(UserFollows.follower_id)
+                    .where(UserFollows.followed_id == author_id)
+                    .execution_options(yield_per=self.batch_size)
+                ).scalars()
+                for batch in follower_ids.partitions(self.batch_size):
+                    yield [
+                        follower_id for follower_id in batch if follower_id in connected
+                    ]
+                return
+            # Autor con muchos seguidores: solo se comprueban los que están conectados
+            user_ids = sorted(connected)
+            for start in range(0, len(user_ids), self.batch_size):
+                end = start + self.batch_size
+                batch = user_ids[start:end]
+                yield db.execute(
+                    select(UserFollows.follower_id).where(
+                        UserFollows.followed_id == author_id,
+                        UserFollows.follower_id.in_(batch),
+                    )
+                ).scalars().all()
+
+    def stats(self) -> dict:
+        """Contadores para monitorización"""
+        with self._lock:
+            return {
+                **self._counters,
+                "connections": self._connections,
+                "users": len(self._channels),
+            }
+
+    def _call_in_loop(self, func, *args):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            func(*args)
+        else:
+            loop.call_soon_threadsafe(func, *args)
+
+    def _push_all(self, subscribers: List[Subscriber], message: str):
+        ready = []
+        for subscriber in subscribers:
+            if subscriber.closed:
+                continue
+            if len(subscriber.queue) >= self.queue_size:
+                self._evict(subscriber)
+                continue
+            subscriber.queue.append(message)
+            if not subscriber.busy:
+                # Si ya tiene un envío en curso, ese mismo vaciará la cola
+                subscriber.busy = True
+                ready.append(subscriber)
+        if ready:
+            self._loop.create_task(self._send_batch(ready))
+
+    async def _send_batch(self, subscribers: List[Subscriber]):
+        """
+        Una sola tarea y un solo temporizador por lote: con el socket libre
+        cada envío termina sin ceder el event loop, así que una tarea (y un
+        timeout) por conexión costaría más que el propio envío
+        """
+        pending = deque(subscribers)
+        while pending:
+            try:
+                async with asyncio.timeout(self.stall_seconds):
+                    while pending:
+                        await self._flush(pending[0])
+                        pending.popleft()
+            except TimeoutError:
+                # Este cliente no acepta datos: sigue en su propia tarea
+                # sin retrasar al resto del lote
+                subscriber = pending.popleft()
+                subscriber.sending = self._loop.create_task(
+                    self._flush_slow(subscriber)
+                )
+
+    async def _flush_slow(self, subscriber: Subscriber):
+        try:
+            async with asyncio.timeout(self.send_timeout):
+                await self._flush(subscriber)
+        except TimeoutError:
+            self._evict(subscriber)
+        finally:
+            subscriber.sending = None
+
+    async def _flush(self, subscriber: Subscriber):
+        # El mensaje sale de la cola solo cuando se ha enviado: si se cancela
+        # el envío (timeout), la tarea que lo retome empieza por él
+        delivered = 0
+        try:
+            while subscriber.queue and not subscriber.closed:
+                await subscriber.websocket.send_text(subscriber.queue[0])
+                subscriber.queue.popleft()
+                delivered += 1
+        except Exception:
+            # El cliente cerró la conexión:
+            # el endpoint lo dará de baja al recibir el cierre
+            self._discard(subscriber)
+        finally:
+            self._count("delivered", delivered)
+        subscriber.busy = False
+
+    def _evict(self, subscriber: Subscriber):
+        if subscriber.closed:
+            return
+        logger.info(
+            f"Conexión de notificaciones del usuario {subscriber.user_id} "
+            "cerrada por lenta"
+        )
+        self._count("evicted")
+        self._drop(subscriber)
+        self._loop.create_task(self._close(subscriber, CLOSE_TRY_AGAIN_LATER))
+
+    def _close_all(self, subscribers: List[Subscriber], code: int):
+        for subscriber in subscribers:
+            if not subscriber.closed:
+                self._drop(subscriber)
+                self._loop.create_task(self._close(subscriber, code))
+
+    def _drop(self, subscriber: Subscriber):
+        # Baja y cancelación del envío en curso, antes de cerrar el socket
+        self._discard(subscriber)
+        if (
+            subscriber.sending is not None
+            and subscriber.sending is not asyncio.current_task()
+        ):
+            subscriber.sending.cancel()
+
+    async def _close(self, subscriber: Subscriber, code: int):
+        try:
+            await asyncio.wait_for(
+                subscriber.websocket.close(code=code), self.send_timeout
+            )
+        except Exception:
+            # Ya cerrada, o el cliente tampoco lee el cierre:
+            # el servidor cortará el socket
+            pass
+
+    def _discard(self, subscriber: Subscriber):
+        subscriber.closed = True
+        subscriber.queue.clear()
+        with self._lock:
+            channel = self._channels.get(subscriber.user_id)
+            if channel is None or subscriber not in channel:
+                return
+            channel.discard(subscriber)
+            if not channel:
+                del self._channels[subscriber.user_id]
+            self._connections -= 1
+
+    def _count(self, counter: str, amount: int = 1):
+        with self._lock:
+            self._counters[counter] += amount
+
+
+# Instancia compartida por la aplicación (arrancada en los eventos de app.main)
+notification_hub = NotificationHub()
@@ -0,0 +1,81 @@
+"""
+Servicio asíncrono de hashing de contraseñas para Visart Backend
+Ejecuta bcrypt en un pool de procesos dedicado para no bloquear el event loop
+"""
+
+import os
+
+from app import security
+from app.utils.process_pool import BoundedProcessPool
+
+# Configuración
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64))
+PASSWORD_HASH_INLINE = os.getenv("PASSWORD_HASH_INLINE", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+
+class PasswordHasherBusy(Exception):
+    """
+    Se lanza cuando hay demasiadas operaciones de hashing en cola
+    """
+
+
+# Funciones ejecutadas dentro de los procesos del pool (deben ser picklables)
+def _hash_password(password: str) -> str:
+    return security.get_password_hash(password)
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    return security.verify_password(plain_password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Hashea y verifica contraseñas fuera del event loop
+
+    Las operaciones se envían a un BoundedProcessPool; si el número de
+    operaciones pendientes supera `max_pending` se rechazan con PasswordHasherBusy
+    en lugar de acumular una cola ilimitada. En modo `inline` (tests) se ejecuta
+    bcrypt directamente en el proceso actual.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = PASSWORD_HASH_WORKERS,
+        max_pending: int = PASSWORD_HASH_MAX_PENDING,
+        inline: bool = PASSWORD_HASH_INLINE,
+    ):
+        self.pool = BoundedProcessPool(
+            max_workers, max_pending, inline, PasswordHasherBusy, "hashing"
+        )
+
+    @property
+    def pending(self) -> int:
+        """Número de operaciones enviadas al pool que aún no han terminado"""
+        return self.pool.pending
+
+    async def hash(self, password: str) -> str:
+        """
+        Genera un hash seguro para la contraseña
+        """
+        return await self.pool.submit(_hash_password, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verifica si la contraseña en texto plano coincide con el hash almacenado
+        """
+        return await self.pool.submit(_verify_password, plain_password, hashed_password)
+
+    def shutdown(self, wait: bool = True):
+        """
+        Detiene los procesos del pool
+        """
+        self.pool.shutdown(wait=wait)
+
+
+# Instancia compartida por las rutas de autenticación
+password_hasher = PasswordHasher()
@@ -0,0 +1,137 @@
+"""
+Búsqueda de texto completo de publicaciones para Visart Backend
+
+Usa el índice de texto completo de cada motor (ver app.models.posts):
+ts_rank_cd sobre el índice GIN en PostgreSQL y bm25 sobre posts_fts en SQLite.
+Los resultados se ordenan por relevancia y se paginan con cursor sobre
+(relevancia, id), sin OFFSET.
+"""
+
+import re
+from typing import List, Optional
+
+from sqlalchemy import column, func, literal_column, select, table, tuple_
+from sqlalchemy.orm import Session, joinedload
+
+from app.models.posts import POSTS_SEARCH_CONFIG, Post, post_search_vector
+from app.models.user_models import User
+from app.schemas.post import PostSearchFilters
+from app.utils.pagination import KeysetPage, decode_cursor, encode_cursor
+
+# Peso del título frente al contenido en bm25 (SQLite)
+TITLE_WEIGHT = 10.0
+CONTENT_WEIGHT = 1.0
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+posts_fts = table("posts_fts", column("rowid"))
+
+
+def search_terms(text: Optional[str]) -> List[str]:
+    """Palabras del texto de búsqueda; descarta la sintaxis propia de cada motor"""
+    return _WORD.findall(text or "")[:16]
+
+
+def fts5_query(q: Optional[str], title: Optional[str], content: Optional[str]) -> str:
+    """
+    Consulta MATCH de FTS5: todos los términos deben aparecer (AND implícito)
+    """
+    parts = [f'"{term}"' for term in search_terms(q)]
+    parts += [f'title : "{term}"' for term in search_terms(title)]
+    parts += [f'content : "{term}"' for term in search_terms(content)]
+    return " AND ".join(parts)
+
+
+def tsquery(q: Optional[str], title: Optional[str], content: Optional[str]) -> str:
+    """
+    Texto para to_tsquery: el título se restringe al peso A y el contenido al B
+    """
+    parts = list(search_terms(q))
+    parts += [f"{term}:A" for term in search_terms(title)]
+    parts += [f"{term}:B" for term in search_terms(content)]
+    return " & ".join(parts)
+
+
+def _ranked_ids(db: Session, filters: PostSearchFilters, q: Optional[str]):
+    """
+    Subconsulta (post_id, score) con las publicaciones que encajan;
+    mayor score = más relevante
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        query = func.to_tsquery(
+            literal_column(f"'{POSTS_SEARCH_CONFIG}'::regconfig"),
+            tsquery(q, filters.title, filters.content),
+        )
+        vector = post_search_vector(Post.title, Post.content)
+        return (
+            select(
+                Post.id.label("post_id"), func.ts_rank_cd(vector, query).label("score")
+            )
+            .where(vector.op("@@")(query))
+            .subquery("ranked")
+        )
+
+    # bm25 devuelve valores negativos (más negativo = más relevante)
+    score = -func.bm25(literal_column("posts_fts"), TITLE_WEIGHT, CONTENT_WEIGHT)
+    return (
+        select(posts_fts.c.rowid.label("post_id"), score.label("score"))
+        .select_from(posts_fts)
+        .where(
+            literal_column("posts_fts").op("MATCH")(
+                fts5_query(q, filters.title, filters.content)
+            )
+        )
+        .subquery("ranked")
+    )
+
+
+def search_posts(
+    db: Session,
+    filters: PostSearchFilters,
+    q: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+) -> KeysetPage:
+    """
+    Busca publicaciones por texto (q en título o contenido, o title/content
+    por separado) y filtra por autor, estado y fechas. Lanza ValueError si no
+    hay términos o el cursor no es válido.
+    """
+    if not (
+        search_terms(q) or search_terms(filters.title) or search_terms(filters.content)
+    ):
+        raise ValueError("Indica al menos un término de búsqueda")
+
+    ranked = _ranked_ids(db, filters, q)
+    query = (
+        select(Post, ranked.c.score)
+        .join(ranked, ranked.c.post_id == Post.id)
+        .options(joinedload(Post.owner))
+        .where(
+            Post.is_published.is_(
+                True if filters.is_published is None else filters.is_published
+            )
+        )
+    )
+    if filters.username:
+        query = query.join(User, User.id == Post.owner_id).where(
+            User.username == filters.username
+        )
+    if filters.start_date:
+        query = query.where(Post.fecha_creacion >= filters.start_date)
+    if filters.end_date:
+        query = query.where(Post.fecha_creacion <= filters.end_date)
+    if cursor:
+        after = decode_cursor(cursor)
+        if len(after) != 2:
+            raise ValueError("Cursor inválido")
+        query = query.where(tuple_(ranked.c.score, Post.id) < tuple_(*after))
+
+    rows = db.execute(
+        query.order_by(ranked.c.score.desc(), Post.id.desc()).limit(limit + 1)
+    ).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].score, rows[-1].Post.id])
+    return KeysetPage(items=[row.Post for row in rows], next_cursor=next_cursor)
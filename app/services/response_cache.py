@@ -0,0 +1,277 @@
+"""
+Caché de respuestas serializadas para Visart Backend
+
+Guarda los bytes JSON de las páginas de GET /api/posts/ por firma de consulta y
+los invalida con precisión mediante etiquetas:
+- "post:<id>": páginas que contienen la publicación (editar, borrar, volcar likes)
+- "posts:first:<publicado>": primera página de cada lista (una publicación nueva
+  solo cambia la primera página; con cursor keyset las siguientes no se mueven)
+- "posts:list:<publicado>": todas las páginas de la lista (cambios de visibilidad,
+  o de username o avatar de un autor, que las páginas incluyen)
+
+Dos backends: LRU en memoria (por proceso, acotado en bytes, con TTL como red de
+seguridad entre procesos) y Redis o compatible (compartido entre procesos,
+requiere el paquete `redis`). Se elige con RESPONSE_CACHE_BACKEND.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set
+
+logger = logging.getLogger("visart-backend")
+
+# Configuración
+RESPONSE_CACHE_BACKEND = os.getenv(
+    "RESPONSE_CACHE_BACKEND", "memory"
+)  # memory | redis | none
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 30))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+RESPONSE_CACHE_REDIS_URL = os.getenv(
+    "RESPONSE_CACHE_REDIS_URL", "redis://localhost:6379/0"
+)
+
+
+def post_tag(post_id: int) -> str:
+    return f"post:{post_id}"
+
+
+def first_page_tag(is_published: bool) -> str:
+    return f"posts:first:{bool(is_published)}"
+
+
+def list_tag(is_published: bool) -> str:
+    return f"posts:list:{bool(is_published)}"
+
+
+class MemoryResponseCache:
+    """
+    LRU en memoria acotado por bytes, con TTL y un índice etiqueta -> claves
+    """
+
+    # Solo la ve este proceso: invalidar desde un worker de trabajos no sirve de nada
+    shared = False
+
+    def __init__(
+        self,
+        ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS,
+        max_bytes: int = RESPONSE_CACHE_MAX_BYTES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, tuple]" = (
+            OrderedDict()
+        )  # clave -> (bytes, expira_en, etiquetas)
+        self._keys_by_tag: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: bytes, tags: Iterable[str] = ()):
+        if len(value) > self.max_bytes:
+            return
+        tags = frozenset(tags)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds, tags)
+            self._bytes += len(value)
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, *tags: str):
+        with self._lock:
+            for tag in tags:
+                for key in self._keys_by_tag.pop(tag, ()):
+                    if key in self._entries:
+                        self._remove(key)
+                        self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_tag.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        """Contadores para monitorización"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "memory",
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        value, _, tags = entry
+        self._bytes -= len(value)
+        for tag in tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+class RedisResponseCache:
+    """
+    Backend Redis (o compatible: Valkey, KeyDB, Dragonfly...) compartido entre procesos
+
+    Cada etiqueta es un SET con las claves que la llevan; invalidar lee y borra
+    el SET en una transacción (MULTI) y después borra esas claves, así una
+    página cacheada entretanto queda en un SET nuevo y no se pierde su rastro.
+    Los errores de conexión se tratan como fallos de caché.
+    """
+
+    shared = True
+
+    def __init__(
+        self,
+        url: str = RESPONSE_CACHE_REDIS_URL,
+        ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS,
+        prefix: str = "visart:responses:",
+    ):
+        import redis  # dependencia opcional, solo con RESPONSE_CACHE_BACKEND=redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._errors = (redis.RedisError,)
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            value = self._redis.get(self.prefix + key)
+        except self._errors as e:
+            self._count("errors")
+            logger.warning(f"Caché de respuestas no disponible: {e}")
+            return None
+        self._count("hits" if value is not None else "misses")
+        return value
+
+    def set(self, key: str, value: bytes, tags: Iterable[str] = ()):
+        ttl = max(1, int(self.ttl_seconds))
+        try:
+            # La clave y sus etiquetas a la vez:
+            # una invalidación no ve una sin las otras
+            pipe = self._redis.pipeline(transaction=True)
+            pipe.set(self.prefix + key, value, ex=ttl)
+            for tag in tags:
+                pipe.sadd(self.prefix + "tag:" + tag, key)
+                pipe.expire(self.prefix + "tag:" + tag, ttl)
+            pipe.execute()
+        except self._errors as e:
+            self._count("errors")
+            logger.warning(f"Caché de respuestas no disponible: {e}")
+
+    def invalidate(self, *tags: str):
+        if not tags:
+            return
+        try:
+            pipe = self._redis.pipeline(transaction=True)
+            for tag in tags:
+                pipe.smembers(self.prefix + "tag:" + tag)
+                pipe.delete(self.prefix + "tag:" + tag)
+            results = pipe.execute()
+            # Resultados alternos: (miembros, borrado) por etiqueta
+            keys = {
+                self.prefix + key.decode()
+                for members in results[::2]
+                for key in members
+            }
+            if keys:
+                self._redis.delete(*keys)
+        except self._errors as e:
+            self._count("errors")
+            logger.warning(f"No se pudo invalidar la caché de respuestas: {e}")
+
+    def clear(self):
+        for key in self._redis.scan_iter(match=self.prefix + "*"):
+            self._redis.delete(key)
+
+    def stats(self) -> dict:
+        """Contadores de este proceso y memoria usada por el servidor"""
+        try:
+            used_memory = self._redis.info("memory").get("used_memory")
+        except self._errors:
+            used_memory = None
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "redis",
+                "used_memory": used_memory,
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+class NullResponseCache:
+    """Caché desactivada (RESPONSE_CACHE_BACKEND=none)"""
+
+    shared = False
+
+    def get(self, key: str) -> Optional[bytes]:
+        return None
+
+    def set(self, key: str, value: bytes, tags: Iterable[str] = ()):
+        pass
+
+    def invalidate(self, *tags: str):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self) -> dict:
+        return {"backend": "none"}
+
+
+def create_response_cache(backend: str = RESPONSE_CACHE_BACKEND):
+    if backend == "redis":
+        return RedisResponseCache()
+    if backend == "none":
+        return NullResponseCache()
+    return MemoryResponseCache()
+
+
+# Instancia compartida por las rutas de publicaciones
+response_cache = create_response_cache()
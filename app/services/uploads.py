@@ -0,0 +1,324 @@
+"""
+Subidas de ficheros multimedia por fragmentos, reanudables
+
+Protocolo (parecido a tus.io):
+
+1. POST /api/uploads con nombre, tipo, tamaño y, opcionalmente, el SHA-256
+   del fichero completo. Si ya hay un asset con ese hash la subida termina al
+   momento sin enviar un solo byte.
+2. PUT /api/uploads/{id} por cada fragmento, con `Upload-Offset` (posición
+   donde empieza) y `Upload-Checksum: sha256 <base64 o hex>`. Antes de
+   escribir, el PUT reserva la subida (`writing_token`) con un UPDATE
+   condicional: un reintento del mismo fragmento mientras el anterior sigue
+   en curso recibe 409 en lugar de escribir a la vez en el mismo fichero. El
+   cuerpo se escribe tal como llega en el fichero parcial con os.pwrite, con
+   un búfer acotado, así que la memoria no depende del tamaño del fichero. Si
+   el checksum no coincide o la conexión se corta, se descarta lo escrito y
+   el offset confirmado no avanza.
+3. GET /api/uploads/{id} devuelve el offset confirmado para reanudar.
+
+Al completar, el SHA-256 se calcula leyendo el fichero del disco y el fichero
+pasa a ser un asset direccionado por contenido (app.services.assets); si ese
+contenido ya existía, se borra el parcial.
+"""
+
+import asyncio
+import base64
+import binascii
+import hashlib
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.media_models import UPLOAD_COMPLETE, UPLOAD_PENDING, Upload
+from app.services.assets import (
+    ASSET_MEDIA_TYPES,
+    get_asset,
+    normalize_media_type,
+    store_asset,
+)
+from app.services.media_storage import media_path
+
+# Configuración
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", 5 * 1024**3))
+UPLOAD_CHUNK_BYTES = int(
+    os.getenv("UPLOAD_CHUNK_BYTES", 8 * 1024**2)
+)  # tamaño recomendado al cliente
+UPLOAD_MAX_CHUNK_BYTES = int(os.getenv("UPLOAD_MAX_CHUNK_BYTES", 64 * 1024**2))
+UPLOAD_WRITE_BUFFER_BYTES = int(os.getenv("UPLOAD_WRITE_BUFFER_BYTES", 1024**2))
+UPLOAD_EXPIRE_HOURS = int(os.getenv("UPLOAD_EXPIRE_HOURS", 24))
+# Tiempo máximo para recibir un fragmento; la reserva dura un poco más, así que
+# nadie la retoma mientras el PUT que la tiene aún puede escribir
+UPLOAD_CHUNK_TIMEOUT_SECONDS = float(os.getenv("UPLOAD_CHUNK_TIMEOUT_SECONDS", 600))
+UPLOAD_CLAIM_MARGIN_SECONDS = 60
+
+
+class UploadError(Exception):
+    """Base de los errores de subida"""
+
+
+class UnsupportedMediaType(UploadError):
+    pass
+
+
+class UploadTooLarge(UploadError):
+    pass
+
+
+class InvalidChecksum(UploadError):
+    """Falta la cabecera Upload-Checksum o no es un SHA-256 válido"""
+
+
+class ChecksumMismatch(UploadError):
+    pass
+
+
+def partial_path(upload_id: str) -> str:
+    return media_path(f"uploads/{upload_id}.part")
+
+
+def parse_checksum(header: Optional[str]) -> bytes:
+    """Digest de `Upload-Checksum: sha256 <base64 o hex>`"""
+    algorithm, _, value = (header or "").strip().partition(" ")
+    if algorithm.lower() != "sha256":
+        raise InvalidChecksum()
+    value = value.strip()
+    try:
+        digest = (
+            bytes.fromhex(value)
+            if len(value) == 64
+            else base64.b64decode(value, validate=True)
+        )
+    except (ValueError, binascii.Error):
+        raise InvalidChecksum()
+    if len(digest) != 32:
+        raise InvalidChecksum()
+    return digest
+
+
+def create_upload(
+    db: Session,
+    owner_id: int,
+    filename: str,
+    media_type: str,
+    size: int,
+    sha256: Optional[str] = None,
+) -> Upload:
+    """
+    Registra una subida nueva y hace commit; si el contenido ya está
+    almacenado (mismo SHA-256 y tamaño) queda completada sin transferir nada
+    """
+    media_type = normalize_media_type(media_type)
+    if media_type not in ASSET_MEDIA_TYPES:
+        raise UnsupportedMediaType()
+    if size > UPLOAD_MAX_BYTES:
+        raise UploadTooLarge()
+
+    upload = Upload(
+        id=uuid.uuid4().hex,
+        owner_id=owner_id,
+        filename=os.path.basename(filename)[:255],
+        media_type=media_type,
+        size=size,
+        expected_sha256=sha256,
+    )
+    asset = get_asset(db, sha256)
+    if asset is not None and asset.size == size:
+        upload.status, upload.sha256, upload.bytes_received = (
+            UPLOAD_COMPLETE,
+            asset.sha256,
+            size,
+        )
+    db.add(upload)
+    db.commit()
+    return upload
+
+
+def _write_block(fd: int, block: bytearray, position: int, chunk_hash) -> int:
+    view = memoryview(block)
+    chunk_hash.update(view)
+    written = 0
+    while written < len(view):
+        written += os.pwrite(fd, view[written:], position + written)
+    return written
+
+
+def claim_chunk(db: Session, upload_id: str, offset: int) -> Optional[str]:
+    """
+    Reserva la subida para escribir el fragmento que empieza en `offset` y hace
+    commit. Devuelve el token de la reserva, o None si el offset confirmado es
+    otro o hay otro PUT escribiendo (una reserva vencida se puede retomar).
+    """
+    token = uuid.uuid4().hex
+    now = datetime.utcnow()
+    rowcount = db.execute(
+        update(Upload)
+        .where(
+            Upload.id == upload_id,
+            Upload.bytes_received == offset,
+            Upload.status == UPLOAD_PENDING,
+            or_(Upload.writing_token.is_(None), Upload.writing_until < now),
+        )
+        .values(
+            writing_token=token,
+            writing_until=now
+            + timedelta(
+                seconds=UPLOAD_CHUNK_TIMEOUT_SECONDS + UPLOAD_CLAIM_MARGIN_SECONDS
+            ),
+        )
+    ).rowcount
+    db.commit()
+    return token if rowcount == 1 else None
+
+
+def release_claim(db: Session, upload_id: str, token: str):
+    """Libera la reserva sin mover el offset (el fragmento se descartó)"""
+    db.execute(
+        update(Upload)
+        .where(Upload.id == upload_id, Upload.writing_token == token)
+        .values(writing_token=None, writing_until=None)
+    )
+    db.commit()
+
+
+async def write_chunk(
+    upload_id: str, offset: int, size: int, body: AsyncIterator[bytes], checksum: bytes
+) -> int:
+    """
+    Escribe un fragmento en el fichero parcial a partir de `offset` y devuelve
+    el offset siguiente. Las escrituras y el hash van a un hilo; en memoria
+    solo se retiene UPLOAD_WRITE_BUFFER_BYTES. Lanza TimeoutError si el
+    fragmento tarda más de UPLOAD_CHUNK_TIMEOUT_SECONDS.
+
+    Solo debe llamarlo quien tiene la reserva (claim_chunk): si falla, recorta
+    el fichero a `offset`. No toca la base de datos: el llamador confirma el
+    offset con advance_upload.
+    """
+    limit = min(UPLOAD_MAX_CHUNK_BYTES, size - offset)
+    chunk_hash = hashlib.sha256()
+    fd = os.open(partial_path(upload_id), os.O_WRONLY | os.O_CREAT, 0o644)
+    position = offset
+    block = bytearray()
+    try:
+        async with asyncio.timeout(UPLOAD_CHUNK_TIMEOUT_SECONDS):
+            async for data in body:
+                if position - offset + len(block) + len(data) > limit:
+                    raise UploadTooLarge()
+                block += data
+                if len(block) >= UPLOAD_WRITE_BUFFER_BYTES:
+                    position += await asyncio.to_thread(
+                        _write_block, fd, block, position, chunk_hash
+                    )
+                    block = bytearray()
+            if block:
+                position += await asyncio.to_thread(
+                    _write_block, fd, block, position, chunk_hash
+                )
+        if chunk_hash.digest() != checksum:
+            raise ChecksumMismatch()
+    except BaseException:
+        # Lo escrito de este fragmento no cuenta: el cliente lo reenvía desde `offset`
+        os.ftruncate(fd, offset)
+        raise
+    finally:
+        os.close(fd)
+    return position
+
+
+def advance_upload(
+    db: Session, upload_id: str, token: str, new_offset: int, keep_claim: bool = False
+) -> bool:
+    """
+    Confirma el fragmento y libera la reserva; False si la reserva ya no es de
+    este PUT (venció y otro la retomó). Con `keep_claim` (último fragmento) la
+    reserva se mantiene hasta complete_upload, para que nadie más escriba ni
+    complete mientras se calcula el hash.
+    """
+    values = {"bytes_received": new_offset, "fecha_actualizacion": datetime.utcnow()}
+    if not keep_claim:
+        values.update(writing_token=None, writing_until=None)
+    rowcount = db.execute(
+        update(Upload)
+        .where(
+            Upload.id == upload_id,
+            Upload.writing_token == token,
+            Upload.status == UPLOAD_PENDING,
+        )
+        .values(**values)
+    ).rowcount
+    db.commit()
+    return rowcount == 1
+
+
+def _hash_file(path: str) -> str:
+    with open(path, "rb") as source:
+        return hashlib.file_digest(source, "sha256").hexdigest()
+
+
+async def file_sha256(upload_id: str) -> str:
+    """
+    SHA-256 del fichero parcial leído del disco: es el que se guarda, así que
+    el asset siempre corresponde a su hash
+    """
+    return await asyncio.to_thread(_hash_file, partial_path(upload_id))
+
+
+def complete_upload(db: Session, upload_id: str, sha256: str) -> Upload:
+    """
+    Mueve el fichero a su ruta por contenido (o lo descarta si ya existía),
+    registra el asset, marca la subida como completada y libera la reserva.
+    `sha256` es el de file_sha256.
+    """
+    upload = db.get(Upload, upload_id)
+    if upload.expected_sha256 and upload.expected_sha256 != sha256:
+        # El fichero no es el anunciado: se empieza de cero
+        discard_partial(upload_id)
+        upload.bytes_received = 0
+        upload.writing_token, upload.writing_until = None, None
+        db.commit()
+        raise ChecksumMismatch()
+
+    store_asset(
+        db,
+        partial_path(upload_id),
+        sha256,
+        upload.size,
+        upload.media_type,
+        upload.owner_id,
+    )
+    # store_asset pudo hacer rollback si otro proceso guardó el mismo contenido a la vez
+    upload = db.get(Upload, upload_id)
+    upload.status, upload.sha256 = UPLOAD_COMPLETE, sha256
+    upload.writing_token, upload.writing_until = None, None
+    db.commit()
+    return upload
+
+
+def discard_partial(upload_id: str):
+    try:
+        os.remove(partial_path(upload_id))
+    except FileNotFoundError:
+        pass
+
+
+def expire_uploads(db: Session, max_age_hours: int = UPLOAD_EXPIRE_HOURS) -> int:
+    """Borra las subidas sin completar abandonadas y sus ficheros parciales"""
+    cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
+    stale = (
+        db.execute(
+            select(Upload).where(
+                Upload.status == UPLOAD_PENDING, Upload.fecha_actualizacion < cutoff
+            )
+        )
+        .scalars()
+        .all()
+    )
+    for upload in stale:
+        discard_partial(upload.id)
+        db.delete(upload)
+    db.commit()
+    return len(stale)
@@ -0,0 +1,157 @@
+"""
+Exportación de los datos de un usuario (perfil, publicaciones y seguimientos)
+
+Las filas se leen por lotes con un cursor de servidor (`AsyncSession.stream` +
+`yield_per`) y se escriben en cuanto llegan, así que la memoria no depende del
+número de publicaciones. Se seleccionan columnas, no entidades ORM: nada se
+acumula en el identity map de la sesión.
+"""
+
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from typing import AsyncIterator
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models.posts import Post
+from app.models.user_models import User, UserFollows, UserProfile
+
+try:  # Dependencia opcional: sin orjson se usa el módulo json estándar
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# Configuración
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+EXPORT_FORMATS = ("ndjson", "csv")
+
+
+def profile_query(user_id: int):
+    return (
+        select(
+            User.id,
+            User.username,
+            User.email,
+            User.fecha_creacion,
+            UserProfile.full_name,
+            UserProfile.bio,
+            UserProfile.avatar_url,
+            UserProfile.location,
+            UserProfile.website,
+        )
+        .outerjoin(UserProfile, UserProfile.user_id == User.id)
+        .where(User.id == user_id)
+    )
+
+
+def posts_query(user_id: int):
+    return (
+        select(
+            Post.id,
+            Post.title,
+            Post.content,
+            Post.image_url,
+            Post.is_published,
+            Post.likes_count,
+            Post.fecha_creacion,
+            Post.fecha_actualizacion,
+        )
+        .where(Post.owner_id == user_id)
+        .order_by(Post.id)
+    )
+
+
+def _follows_query(user_id: int, mine, other):
+    # `mine` es la columna del usuario exportado, `other` la del otro extremo
+    other_user = aliased(User)
+    return (
+        select(
+            other_user.id.label("user_id"),
+            other_user.username,
+            UserFollows.fecha_creacion,
+        )
+        .join(other_user, other_user.id == other)
+        .where(mine == user_id)
+        .order_by(UserFollows.id)
+    )
+
+
+def following_query(user_id: int):
+    return _follows_query(user_id, UserFollows.follower_id, UserFollows.followed_id)
+
+
+def followers_query(user_id: int):
+    return _follows_query(user_id, UserFollows.followed_id, UserFollows.follower_id)
+
+
+# Secciones en el orden en que aparecen en el NDJSON
+EXPORT_SECTIONS = {
+    "profile": profile_query,
+    "posts": posts_query,
+    "following": following_query,
+    "followers": followers_query,
+}
+
+
+async def _stream_partitions(db: AsyncSession, stmt):
+    result = await db.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    try:
+        async for rows in result.partitions():
+            yield result.keys(), rows
+    finally:
+        await result.close()
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Tipo no serializable: {type(value).__name__}")
+
+
+def _ndjson_line(record: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (
+        json.dumps(record, ensure_ascii=False, default=_json_default).encode() + b"\n"
+    )
+
+
+async def ndjson_export(db: AsyncSession, user_id: int) -> AsyncIterator[bytes]:
+    """
+    Una línea JSON por registro con su sección en `type`; un fragmento por lote
+    """
+    for section, query in EXPORT_SECTIONS.items():
+        async for keys, rows in _stream_partitions(db, query(user_id)):
+            keys = list(keys)
+            yield b"".join(
+                _ndjson_line({"type": section, **dict(zip(keys, row))}) for row in rows
+            )
+
+
+async def csv_export(
+    db: AsyncSession, user_id: int, section: str
+) -> AsyncIterator[bytes]:
+    """
+    CSV de una sección (cabecera con los nombres de columna); un fragmento por lote
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    header_written = False
+    async for keys, rows in _stream_partitions(db, EXPORT_SECTIONS[section](user_id)):
+        if not header_written:
+            writer.writerow(keys)
+            header_written = True
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if not header_written:
+        # Sección vacía: solo la cabecera
+        writer.writerow(EXPORT_SECTIONS[section](user_id).selected_columns.keys())
+        yield buffer.getvalue().encode()
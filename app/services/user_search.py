@@ -0,0 +1,335 @@
+"""
+Búsqueda y autocompletado de usuarios para Visart Backend
+
+El autocompletado (prefijo de username o de nombre completo) se resuelve con un
+índice en memoria: listas ordenadas de claves normalizadas sobre las que se hace
+búsqueda binaria, O(log n + k) por pulsación. Las rutas que crean, renombran o
+desactivan usuarios lo actualizan después del commit; una reconstrucción
+periódica recoge los cambios hechos por otros procesos.
+
+Mientras el índice no está cargado, o si la búsqueda usa filtros que el índice
+no cubre (email, location, usuarios inactivos), se consulta la base de datos:
+lower(username) con text_pattern_ops y full_name con un índice trigram en
+PostgreSQL. Esa consulta solo ignora mayúsculas, no acentos: "jose" encuentra
+a "José" en el índice pero no en la base de datos (unaccent impediría usar
+esos índices).
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import unicodedata
+from bisect import bisect_left, insort
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.user_models import User, UserProfile
+from app.schemas.user_schemas import UserSearchFilters
+
+logger = logging.getLogger("visart-backend")
+
+# Configuración
+USER_SEARCH_REBUILD_SECONDS = float(os.getenv("USER_SEARCH_REBUILD_SECONDS", 600))
+USER_SEARCH_BATCH_SIZE = int(os.getenv("USER_SEARCH_BATCH_SIZE", 10000))
+
+# Separa la clave del id dentro de cada entrada de las listas ordenadas
+# (menor que cualquier carácter imprimible, así "ana" ordena antes que "ana_b")
+_SEP = "\x00"
+
+
+class UserSearchResult(NamedTuple):
+    """Campos públicos que devuelve el autocompletado (UserPublicResponse)"""
+
+    id: int
+    username: str
+    full_name: Optional[str]
+    avatar_url: Optional[str]
+    fecha_creacion: object
+
+
+def normalize(text: Optional[str]) -> str:
+    """Minúsculas y sin acentos ("Ána" -> "ana")"""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return (
+        "".join(c for c in decomposed if not unicodedata.combining(c)).lower().strip()
+    )
+
+
+def name_keys(full_name: Optional[str]) -> List[str]:
+    """Claves del nombre: el nombre completo y cada palabra ("ana garcia", "garcia")"""
+    name = " ".join(normalize(full_name).split())
+    if not name:
+        return []
+    return sorted({name, *name.split()})
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class UserPrefixIndex:
+    """
+    Índice de prefijos en memoria sobre username y full_name de los usuarios activos
+
+    Cada lista contiene cadenas "clave\\x00id" ordenadas; buscar un prefijo es
+    un bisect seguido de un recorrido de como mucho `limit` entradas.
+    """
+
+    def __init__(self, bind=None):
+        self.bind = bind
+        self._usernames: List[str] = []
+        self._names: List[str] = []
+        self._keys_by_id: Dict[int, Tuple[str, Tuple[str, ...]]] = {}
+        self._lock = threading.Lock()
+        self._pending_changes: Optional[list] = None
+        self._task: Optional[asyncio.Task] = None
+        self.loaded = False
+
+    def __len__(self):
+        return len(self._keys_by_id)
+
+    def upsert(
+        self,
+        user_id: int,
+        username: str,
+        full_name: Optional[str] = None,
+        is_active: bool = True,
+    ):
+        if not is_active:
+            self.remove(user_id)
+            return
+        with self._lock:
+            if self._pending_changes is not None:
+                self._pending_changes.append(
+                    (self._upsert, (user_id, username, full_name))
+                )
+            self._upsert(user_id, username, full_name)
+
+    def remove(self, user_id: int):
+        with self._lock:
+            if self._pending_changes is not None:
+                self._pending_changes.append((self._remove, (user_id,)))
+            self._remove(user_id)
+
+    def search(self, prefix: str, limit: int = 10) -> List[int]:
+        """
+        Ids de los usuarios cuyo username (primero) o nombre empiezan por el prefijo
+        """
+        key = " ".join(normalize(prefix).split())
+        if not key:
+            return []
+        ids: List[int] = []
+        with self._lock:
+            for keys in (self._usernames, self._names):
+                i = bisect_left(keys, key)
+                while i < len(keys) and len(ids) < limit:
+                    entry_key, _, user_id = keys[i].partition(_SEP)
+                    if not entry_key.startswith(key):
+                        break
+                    if int(user_id) not in ids:
+                        ids.append(int(user_id))
+                    i += 1
+        return ids
+
+    def rebuild(self, db: Session) -> int:
+        """
+        Carga todos los usuarios activos;
+        los cambios que lleguen durante la carga se reaplican
+        """
+        with self._lock:
+            self._pending_changes = []
+        try:
+            usernames, names, keys_by_id = [], [], {}
+            rows = db.execute(
+                select(User.id, User.username, UserProfile.full_name)
+                .outerjoin(UserProfile, UserProfile.user_id == User.id)
+                .where(User.is_active.is_(True))
+                .execution_options(yield_per=USER_SEARCH_BATCH_SIZE)
+            )
+            for row in rows:
+                username_key, user_name_keys = self._entry_keys(
+                    row.id, row.username, row.full_name
+                )
+                usernames.append(username_key)
+                names.extend(user_name_keys)
+                keys_by_id[row.id] = (username_key, user_name_keys)
+            usernames.sort()
+            names.sort()
+        except Exception:
+            with self._lock:
+                self._pending_changes = None
+            raise
+
+        with self._lock:
+            changes, self._pending_changes = self._pending_changes, None
+            self._usernames, self._names, self._keys_by_id = (
+                usernames,
+                names,
+                keys_by_id,
+            )
+            for change, args in changes:
+                change(*args)
+            self.loaded = True
+            return len(self._keys_by_id)
+
+    def rebuild_from_bind(self) -> int:
+        if self.bind is None:
+            from app.db.session import engine
+
+            bind = engine
+        else:
+            bind = self.bind
+        with Session(bind=bind) as db:
+            return self.rebuild(db)
+
+    async def _run(self):
+        while True:
+            try:
+                count = await asyncio.to_thread(self.rebuild_from_bind)
+                logger.info(f"Índice de búsqueda de usuarios cargado: {count} usuarios")
+            except Exception as e:
+                logger.error(
+                    f"Error al reconstruir el índice de búsqueda de usuarios: {e}"
+                )
+            await asyncio.sleep(USER_SEARCH_REBUILD_SECONDS)
+
+    def start(self):
+        """
+        Carga el índice y lo reconstruye periódicamente en el bucle de eventos actual
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def clear(self):
+        with self._lock:
+            self._usernames, self._names, self._keys_by_id = [], [], {}
+            self.loaded = False
+
+    def stats(self) -> dict:
+        """Contadores para monitorización"""
+        with self._lock:
+            return {
+                "loaded": self.loaded,
+                "users": len(self._keys_by_id),
+                "name_keys": len(self._names),
+            }
+
+    @staticmethod
+    def _entry_keys(user_id: int, username: str, full_name: Optional[str]):
+        username_key = f"{normalize(username)}{_SEP}{user_id}"
+        return username_key, tuple(
+            f"{key}{_SEP}{user_id}" for key in name_keys(full_name)
+        )
+
+    def _upsert(self, user_id: int, username: str, full_name: Optional[str]):
+        self._remove(user_id)
+        username_key, user_name_keys = self._entry_keys(user_id, username, full_name)
+        insort(self._usernames, username_key)
+        for key in user_name_keys:
+            insort(self._names, key)
+        self._keys_by_id[user_id] = (username_key, user_name_keys)
+
+    def _remove(self, user_id: int):
+        keys = self._keys_by_id.pop(user_id, None)
+        if keys is None:
+            return
+        username_key, user_name_keys = keys
+        self._delete_key(self._usernames, username_key)
+        for key in user_name_keys:
+            self._delete_key(self._names, key)
+
+    @staticmethod
+    def _delete_key(keys: List[str], key: str):
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            del keys[i]
+
+
+# Instancia compartida por las rutas de usuarios
+user_index = UserPrefixIndex()
+
+
+def _result_query():
+    return select(
+        User.id,
+        User.username,
+        UserProfile.full_name,
+        UserProfile.avatar_url,
+        User.fecha_creacion,
+    ).outerjoin(UserProfile, UserProfile.user_id == User.id)
+
+
+def _db_search(
+    db: Session, prefix: Optional[str], filters: UserSearchFilters, limit: int
+) -> List[UserSearchResult]:
+    query = _result_query()
+    is_active = True if filters.is_active is None else filters.is_active
+    query = query.where(User.is_active.is_(is_active))
+    if prefix:
+        # lower(username) LIKE 'pre%' usa el índice text_pattern_ops;
+        # ILIKE sobre full_name, el trigram
+        pattern = escape_like(prefix.lower()) + "%"
+        query = query.where(
+            or_(
+                func.lower(User.username).like(pattern, escape="\\"),
+                UserProfile.full_name.ilike(pattern, escape="\\"),
+                UserProfile.full_name.ilike("% " + pattern, escape="\\"),
+            )
+        )
+    if filters.email:
+        query = query.where(func.lower(User.email) == filters.email.lower())
+    if filters.location:
+        query = query.where(
+            UserProfile.location.ilike(escape_like(filters.location) + "%", escape="\\")
+        )
+    rows = db.execute(
+        query.order_by(func.lower(User.username), User.id).limit(limit)
+    ).all()
+    return [UserSearchResult(*row) for row in rows]
+
+
+def search_users(
+    db: Session,
+    q: Optional[str] = None,
+    filters: Optional[UserSearchFilters] = None,
+    limit: int = 10,
+) -> List[UserSearchResult]:
+    """
+    Autocompletado por prefijo de username o nombre (q o filters.username)
+    con filtros opcionales
+    """
+    filters = filters or UserSearchFilters()
+    prefix = (q or filters.username or "").strip()
+    indexable = not (filters.email or filters.location or filters.is_active is False)
+    if not (prefix and indexable and user_index.loaded):
+        return _db_search(db, prefix, filters, limit)
+
+    ids = user_index.search(prefix, limit)
+    if not ids:
+        return []
+    rows = {
+        row.id: UserSearchResult(*row)
+        for row in db.execute(_result_query().where(User.id.in_(ids)))
+    }
+    return [rows[user_id] for user_id in ids if user_id in rows]
+
+
+def index_user(user: User):
+    """
+    Actualiza el índice tras renombrar o desactivar un usuario (después del commit)
+    El perfil debe estar cargado (User.profile usa "selectin")
+    """
+    full_name = user.profile.full_name if user.profile else None
+    user_index.upsert(user.id, user.username, full_name, is_active=bool(user.is_active))
@@ -0,0 +1,138 @@
+"""
+Contadores desnormalizados de usuario (publicaciones, seguidores, seguidos)
+
+Los contadores se actualizan con UPDATE atómicos (`col = col + delta`) dentro
+de la transacción que crea o elimina la fila correspondiente. Un proceso de
+conciliación recalcula la deriva por bloques de ids, con transacciones cortas
+y sin bloquear las tablas.
+"""
+
+import logging
+import os
+
+from sqlalchemy import func, or_, select, update
+
+from app.models.posts import Post
+from app.models.user_models import User, UserFollows
+
+logger = logging.getLogger("visart-backend")
+
+USER_STATS_RECONCILE_BATCH_SIZE = int(
+    os.getenv("USER_STATS_RECONCILE_BATCH_SIZE", 1000)
+)
+
+COUNTER_COLUMNS = ("post_count", "follower_count", "following_count")
+
+
+def counter_update(user_id: int, **deltas):
+    """
+    Sentencia UPDATE que suma `deltas` a los contadores del usuario
+    Ejemplo: counter_update(7, post_count=1). Se ejecuta con la sesión del llamador
+    (síncrona o asíncrona) para quedar en su transacción.
+    """
+    values = {}
+    for name, delta in deltas.items():
+        if name not in COUNTER_COLUMNS:
+            raise ValueError(f"Contador desconocido: {name}")
+        column = getattr(User, name)
+        values[column] = column + delta
+    # Los contadores no forman parte de UserResponse: no cambian su ETag/Last-Modified
+    values[User.fecha_actualizacion] = User.fecha_actualizacion
+    return update(User).where(User.id == user_id).values(values)
+
+
+def follow_updates(follower_id: int, followed_id: int, delta: int):
+    """
+    Sentencias para crear (delta=1) o eliminar (delta=-1) un seguimiento
+    """
+    return [
+        counter_update(follower_id, following_count=delta),
+        counter_update(followed_id, follower_count=delta),
+    ]
+
+
+def stats_query(user_id: int):
+    return select(
+        User.id, User.post_count, User.follower_count, User.following_count
+    ).where(User.id == user_id)
+
+
+def _true_counts():
+    """
+    Subconsultas correlacionadas con `users` que cuentan las filas reales
+    (mismo orden que COUNTER_COLUMNS)
+    """
+    return (
+        select(func.count())
+        .select_from(Post)
+        .where(Post.owner_id == User.id)
+        .scalar_subquery(),
+        select(func.count())
+        .select_from(UserFollows)
+        .where(UserFollows.followed_id == User.id)
+        .scalar_subquery(),
+        select(func.count())
+        .select_from(UserFollows)
+        .where(UserFollows.follower_id == User.id)
+        .scalar_subquery(),
+    )
+
+
+def reconcile_user_stats(db, batch_size: int = USER_STATS_RECONCILE_BATCH_SIZE) -> int:
+    """
+    Recalcula los contadores por bloques de ids y corrige los que tengan deriva
+    Hace commit tras cada bloque; devuelve el número de usuarios corregidos.
+
+    Cada bloque es un único UPDATE que cuenta y escribe en la misma sentencia:
+    una publicación o un follow confirmados entre una lectura y la escritura
+    no introducen deriva nueva.
+    """
+    counts = _true_counts()
+    mismatch = or_(
+        *(
+            getattr(User, name).is_distinct_from(count)
+            for name, count in zip(COUNTER_COLUMNS, counts)
+        )
+    )
+    fixed = 0
+    last_id = 0
+    while True:
+        ids = (
+            db.execute(
+                select(User.id)
+                .where(User.id > last_id)
+                .order_by(User.id)
+                .limit(batch_size)
+            )
+            .scalars()
+            .all()
+        )
+        if not ids:
+            break
+        low, high = ids[0], ids[-1]
+        last_id = high
+
+        result = db.execute(
+            update(User)
+            .where(User.id.between(low, high), mismatch)
+            .values(
+                **dict(zip(COUNTER_COLUMNS, counts)),
+                fecha_actualizacion=User.fecha_actualizacion,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        fixed += result.rowcount
+        db.commit()
+
+    if fixed:
+        logger.info(f"Conciliación de contadores: {fixed} usuarios corregidos")
+    return fixed
+
+
+if __name__ == "__main__":
+    from app.db.session import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    with SessionLocal() as session:
+        total = reconcile_user_stats(session)
+    print(f"Usuarios corregidos: {total}")
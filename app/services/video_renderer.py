@@ -0,0 +1,73 @@
+"""
+Renderizado de videos para Visart Backend
+
+El renderer se elige con VIDEO_RENDERER ("módulo:función"). El incluido,
+`render_placeholder`, es un sustituto local y determinista (mismo prompt, mismo
+fichero) que escribe un YUV4MPEG2 (.y4m) sin dependencias: sirve para
+desarrollo, tests y benchmarks mientras no se conecte un modelo de generación.
+"""
+
+import hashlib
+import importlib
+import mimetypes
+import os
+from typing import Callable, NamedTuple
+
+# Configuración
+VIDEO_RENDERER = os.getenv(
+    "VIDEO_RENDERER", "app.services.video_renderer:render_placeholder"
+)
+
+mimetypes.add_type("video/x-yuv4mpeg", ".y4m")
+
+
+class RenderRequest(NamedTuple):
+    prompt: str
+    width: int
+    height: int
+    fps: int
+    duration_seconds: int
+
+
+class RenderResult(NamedTuple):
+    frames: int
+    extension: str
+    media_type: str
+
+
+def load_renderer(path: str = VIDEO_RENDERER) -> Callable:
+    module_name, _, func_name = path.partition(":")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def render_placeholder(
+    request: RenderRequest, output, progress: Callable[[float], None]
+) -> RenderResult:
+    """
+    Escribe en `output` (fichero binario) un degradado animado cuyos colores
+    dependen del hash del prompt; llama a `progress(0..1)` tras cada fotograma
+    """
+    seed = hashlib.sha256(request.prompt.encode()).digest()
+    width, height = (
+        request.width - request.width % 2,
+        request.height - request.height % 2,
+    )
+    frames = request.fps * request.duration_seconds
+    # Planos de crominancia 4:2:0 constantes (color "del prompt")
+    chroma = bytes([seed[1]]) * (width * height // 4) + bytes([seed[2]]) * (
+        width * height // 4
+    )
+    ramp = bytes(range(256)) * (width // 256 + 2)
+
+    output.write(
+        f"YUV4MPEG2 W{width} H{height} F{request.fps}:1 Ip A1:1 C420jpeg\n".encode()
+    )
+    for frame in range(frames):
+        # La luminancia se desplaza con el fotograma: las filas son iguales entre sí
+        offset = (seed[0] + frame * 4) % 256
+        output.write(b"FRAME\n")
+        end = offset + width
+        output.write(ramp[offset:end] * height)
+        output.write(chroma)
+        progress((frame + 1) / frames)
+    return RenderResult(frames=frames, extension="y4m", media_type="video/x-yuv4mpeg")
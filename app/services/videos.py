@@ -0,0 +1,99 @@
+"""
+Generación de videos para Visart Backend
+
+Pedir un video crea un trabajo `video.render` en la cola persistente
+(app.services.job_queue); lo renderizan los workers (`python -m app.worker
+--kinds video.render`), fuera del proceso de la API, y al terminar crean la
+publicación con el video (app.jobs.videos).
+
+La concurrencia la acota el número de procesos worker. Para que la cola no
+crezca sin límite, la API rechaza pedidos nuevos cuando hay demasiados
+pendientes en total (503 con Retry-After) o del mismo usuario (429).
+"""
+
+import os
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.job_models import JOB_QUEUED, JOB_RUNNING, Job
+from app.services.job_queue import enqueue_job
+
+# Configuración
+VIDEO_JOB_KIND = "video.render"
+VIDEO_MAX_PENDING_JOBS = int(os.getenv("VIDEO_MAX_PENDING_JOBS", 100))
+VIDEO_MAX_PENDING_PER_USER = int(os.getenv("VIDEO_MAX_PENDING_PER_USER", 3))
+VIDEO_RETRY_AFTER_SECONDS = int(os.getenv("VIDEO_RETRY_AFTER_SECONDS", 30))
+VIDEO_WIDTH = int(os.getenv("VIDEO_WIDTH", 640))
+VIDEO_HEIGHT = int(os.getenv("VIDEO_HEIGHT", 360))
+VIDEO_FPS = int(os.getenv("VIDEO_FPS", 24))
+VIDEO_MAX_DURATION_SECONDS = int(os.getenv("VIDEO_MAX_DURATION_SECONDS", 10))
+
+
+class VideoQueueFull(Exception):
+    """Hay demasiados videos pendientes en total"""
+
+
+class TooManyPendingVideos(Exception):
+    """El usuario ya tiene el máximo de videos pendientes"""
+
+
+def pending_video_jobs(db: Session, owner_id: Optional[int] = None) -> int:
+    query = select(func.count()).where(
+        Job.kind == VIDEO_JOB_KIND, Job.status.in_((JOB_QUEUED, JOB_RUNNING))
+    )
+    if owner_id is not None:
+        query = query.where(Job.owner_id == owner_id)
+    return db.execute(query).scalar_one()
+
+
+def submit_video(
+    db: Session,
+    owner_id: int,
+    prompt: str,
+    title: Optional[str] = None,
+    duration_seconds: int = 4,
+    is_published: bool = True,
+) -> Job:
+    """
+    Encola el render de un video y hace commit
+    Lanza VideoQueueFull o TooManyPendingVideos si no hay capacidad
+    """
+    if pending_video_jobs(db, owner_id) >= VIDEO_MAX_PENDING_PER_USER:
+        raise TooManyPendingVideos()
+    if pending_video_jobs(db) >= VIDEO_MAX_PENDING_JOBS:
+        raise VideoQueueFull()
+
+    job = enqueue_job(
+        db,
+        VIDEO_JOB_KIND,
+        {
+            "prompt": prompt,
+            "title": title or prompt[:200],
+            "duration_seconds": min(duration_seconds, VIDEO_MAX_DURATION_SECONDS),
+            "width": VIDEO_WIDTH,
+            "height": VIDEO_HEIGHT,
+            "fps": VIDEO_FPS,
+            "is_published": is_published,
+            "owner_id": owner_id,
+        },
+        owner_id=owner_id,
+    )
+    db.commit()
+    return job
+
+
+def video_job_view(job: Job) -> dict:
+    """Datos de VideoJobResponse a partir del trabajo"""
+    result = job.result or {}
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "progress": job.progress,
+        "post_id": result.get("post_id"),
+        "video_url": result.get("video_url"),
+        "error": job.error,
+        "created_at": job.fecha_creacion,
+        "finished_at": job.finished_at,
+    }
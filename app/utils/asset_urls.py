@@ -0,0 +1,29 @@
+"""
+URLs de assets y de sus derivados para Visart Backend
+
+Sin dependencias de la generación (Pillow, pool de procesos): los esquemas
+solo necesitan construir las URLs.
+"""
+
+import re
+from typing import Dict, Optional
+
+# Lados de los avatares recortados (variantes avatar-<lado>)
+AVATAR_SIZES = (64, 128, 256)
+
+ASSET_URL = re.compile(r"^/api/assets/([0-9a-f]{64})(?:\.[0-9A-Za-z]+)?$")
+
+
+def derivative_url(url: Optional[str], variant: str) -> Optional[str]:
+    """URL del derivado de un asset (None si `url` no es un asset propio)"""
+    match = ASSET_URL.match(url or "")
+    if match is None:
+        return None
+    return f"/api/assets/{match.group(1)}/{variant}.jpg"
+
+
+def avatar_derivative_urls(url: Optional[str]) -> Optional[Dict[str, str]]:
+    """Avatar recortado a cada tamaño de AVATAR_SIZES (clave: lado en píxeles)"""
+    if ASSET_URL.match(url or "") is None:
+        return None
+    return {str(size): derivative_url(url, f"avatar-{size}") for size in AVATAR_SIZES}
@@ -0,0 +1,89 @@
+"""
+Peticiones condicionales HTTP (ETag / Last-Modified) para Visart Backend
+
+Las rutas calculan un ETag débil a partir de la versión del recurso (fechas de
+actualización, contadores, etc.) y responden 304 sin serializar el cuerpo cuando
+el cliente ya tiene esa versión (If-None-Match o, en su defecto, If-Modified-Since).
+"""
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+
+def has_conditional_headers(request: Request) -> bool:
+    """El cliente envía validadores (merece la pena consultar solo la versión)"""
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def make_etag(*parts) -> str:
+    """ETag débil derivado de las partes que identifican la versión del recurso"""
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()[
+        :32
+    ]
+    return f'W/"{digest}"'
+
+
+def latest(*values: Optional[datetime]) -> Optional[datetime]:
+    """La fecha más reciente ignorando los None"""
+    present = [value for value in values if value is not None]
+    return max(present) if present else None
+
+
+def http_date(dt: datetime) -> str:
+    """Fecha HTTP (RFC 7231); las fechas sin zona horaria se tratan como UTC"""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return format_datetime(dt.astimezone(timezone.utc), usegmt=True)
+
+
+def validator_headers(
+    etag: str, last_modified: Optional[datetime] = None, private: bool = False
+) -> dict:
+    """
+    Cabeceras ETag/Last-Modified; `no-cache` obliga a revalidar en cada uso
+    """
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "private, no-cache" if private else "no-cache",
+        "Vary": "Authorization",
+    }
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime] = None
+) -> bool:
+    """
+    Evalúa If-None-Match (comparación débil) y, si no viene, If-Modified-Since
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        # Las fechas HTTP tienen resolución de segundos
+        return last_modified.replace(microsecond=0) <= since
+    return False
+
+
+def not_modified_response(headers: dict) -> Response:
+    """Respuesta 304 sin cuerpo con los mismos validadores"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
@@ -1,30 +1,10 @@
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
-
 from app.core.settings import settings
+from app.services.email_queue import email_queue
 
 
 def send_email(to_address: str, subject: str, body: str):
     """
-    Envía un correo usando la configuración de variables de entorno.
+    Encola un correo para su envío en segundo plano (app.services.email_queue).
+    Devuelve False si la cola está llena.
     """
-    # Crear el mensaje
-    msg = MIMEMultipart()
-    msg['From'] = settings.email_user
-    msg['To'] = to_address
-    msg['Subject'] = subject
-
-    msg.attach(MIMEText(body, 'plain'))
-
-    # Conexión al servidor SMTP
-    try:
-        server = smtplib.SMTP(settings.email_host, settings.email_port)
-        server.starttls()
-        server.login(settings.email_user, settings.email_pass)
-        server.send_message(msg)
-        server.quit()
-        return True
-    except Exception as e:
-        print(f"Error enviando correo: {e}")
-        return False
\ No newline at end of file
+    return email_queue.enqueue(to_address, subject, body, sender=settings.email_user)
@@ -1,5 +1,87 @@
-def paginate(queryset, skip: int = 0, limit: int = 10):
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, NamedTuple, Optional
+
+from sqlalchemy import tuple_
+
+
+class KeysetPage(NamedTuple):
+    """Resultado de una paginación por cursor"""
+    items: List[Any]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(values) -> str:
+    """
+    Codifica los valores de las claves de ordenación en un cursor opaco (base64url)
+    """
+    payload = [{"dt": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> list:
+    """
+    Decodifica un cursor generado por encode_cursor
+    Lanza ValueError si el cursor no es válido
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Cursor inválido") from e
+    if not isinstance(payload, list):
+        raise ValueError("Cursor inválido")
+    return [_decode_cursor_value(v) for v in payload]
+
+
+def _decode_cursor_value(value):
+    # Solo escalares o {"dt": "<ISO 8601>"}: lo demás acabaría en la comparación SQL
+    if isinstance(value, dict):
+        if set(value) != {"dt"} or not isinstance(value["dt"], str):
+            raise ValueError("Cursor inválido")
+        return datetime.fromisoformat(value["dt"])
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    raise ValueError("Cursor inválido")
+
+
+def paginate(
+    queryset,
+    skip: int = 0,
+    limit: int = 10,
+    cursor: Optional[str] = None,
+    keys=None,
+    descending: bool = True,
+):
     """
     Helper para paginar una consulta SQLAlchemy.
+
+    Sin `keys` usa OFFSET/LIMIT y devuelve la lista de resultados.
+    Con `keys` (columnas únicas en conjunto, p. ej. (Post.fecha_creacion, Post.id))
+    usa paginación por cursor (keyset): filtra por `(keys) < (valores del cursor)`,
+    ordena por esas columnas y devuelve un KeysetPage con `next_cursor`. El coste
+    es el mismo en la página 1 que en la 10.000 si existe un índice sobre `keys`.
     """
-    return queryset.offset(skip).limit(limit).all()
\ No newline at end of file
+    if keys is None:
+        return queryset.offset(skip).limit(limit).all()
+
+    keys = tuple(keys)
+    if cursor:
+        values = decode_cursor(cursor)
+        if len(values) != len(keys):
+            raise ValueError("Cursor inválido")
+        row_key = tuple_(*keys)
+        after = row_key < tuple_(*values) if descending else row_key > tuple_(*values)
+        queryset = queryset.filter(after)
+
+    ordering = [key.desc() if descending else key.asc() for key in keys]
+    rows = queryset.order_by(None).order_by(*ordering).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, key.key) for key in keys])
+    return KeysetPage(items=rows, next_cursor=next_cursor)
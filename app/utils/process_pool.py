@@ -0,0 +1,80 @@
+"""
+Pool de procesos acotado para Visart Backend
+Ejecuta trabajo de CPU (bcrypt, Pillow) fuera del event loop
+sin acumular una cola ilimitada
+"""
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Type
+
+
+class BoundedProcessPool:
+    """
+    ProcessPoolExecutor que rechaza trabajo con `busy_error` cuando hay más de
+    `max_pending` tareas enviadas sin terminar
+
+    En modo `inline` (tests) las funciones se ejecutan en el proceso actual.
+    `name` describe la cola en el mensaje de la excepción.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_pending: int,
+        inline: bool,
+        busy_error: Type[Exception],
+        name: str,
+    ):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.inline = inline
+        self.busy_error = busy_error
+        self.name = name
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Número de tareas enviadas al pool que aún no han terminado"""
+        return self._pending
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # "spawn" evita heredar hilos y conexiones abiertas del proceso web
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def submit(self, func, *args):
+        """Ejecuta `func(*args)` en el pool (las funciones deben ser picklables)"""
+        if self.inline:
+            return func(*args)
+
+        if self._pending >= self.max_pending:
+            raise self.busy_error(
+                f"Cola de {self.name} llena ({self._pending}/{self.max_pending})"
+            )
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.get_executor(), func, *args)
+        except BrokenProcessPool:
+            # Un proceso murió: se descarta el pool para recrearlo en la próxima llamada
+            self._executor = None
+            raise
+        finally:
+            self._pending -= 1
+
+    def shutdown(self, wait: bool = True):
+        """
+        Detiene los procesos del pool
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
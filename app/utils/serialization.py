@@ -0,0 +1,51 @@
+"""
+Serialización directa a bytes para los listados más usados
+
+Las rutas que devuelven objetos ORM pasan por response_model: FastAPI valida
+el resultado, lo convierte con jsonable_encoder y después lo serializa. Con un
+TypeAdapter creado una sola vez al importar, pydantic-core valida y escribe el
+JSON en una pasada, y la ruta devuelve los bytes en un Response.
+"""
+
+from typing import Optional, Sequence
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.schemas.post import PostListResponse
+from app.schemas.user_schemas import UserListResponse
+
+post_list_adapter = TypeAdapter(PostListResponse)
+user_list_adapter = TypeAdapter(UserListResponse)
+
+
+def dump_post_list(
+    posts: Sequence, page_size: int, next_cursor: Optional[str] = None
+) -> bytes:
+    """JSON de PostListResponse a partir de objetos Post (con su owner cargado)"""
+    page = post_list_adapter.validate_python(
+        {"posts": posts, "page_size": page_size, "next_cursor": next_cursor},
+        from_attributes=True,
+    )
+    return post_list_adapter.dump_json(page)
+
+
+def dump_user_list(users: Sequence, page_size: int) -> bytes:
+    """
+    JSON de UserListResponse a partir de objetos con atributos de UserPublicResponse
+    """
+    page = user_list_adapter.validate_python(
+        {"users": users, "page_size": page_size}, from_attributes=True
+    )
+    return user_list_adapter.dump_json(page)
+
+
+def json_bytes_response(
+    body: bytes, status_code: int = 200, headers: Optional[dict] = None
+) -> Response:
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
@@ -0,0 +1,194 @@
+"""
+Workers de la cola de trabajos de Visart Backend
+
+Uso:
+    python -m app.worker [--processes 4] [--kinds video.render,user_stats.reconcile]
+
+Arranca N procesos; cada uno abre su propio engine, reclama trabajos de la
+tabla `jobs` (app.services.job_queue) y los ejecuta uno a uno. Con SIGTERM o
+Ctrl+C terminan el trabajo en curso y salen.
+"""
+
+import argparse
+import importlib
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+from typing import List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.services.job_queue import (
+    JOBS_VISIBILITY_TIMEOUT_SECONDS,
+    claim_jobs,
+    reap_expired_jobs,
+    run_job,
+)
+
+logger = logging.getLogger("visart-backend")
+
+# Configuración
+JOBS_WORKER_PROCESSES = int(os.getenv("JOBS_WORKER_PROCESSES", os.cpu_count() or 1))
+JOBS_POLL_INTERVAL_SECONDS = float(os.getenv("JOBS_POLL_INTERVAL_SECONDS", 1.0))
+JOBS_REAP_INTERVAL_SECONDS = float(os.getenv("JOBS_REAP_INTERVAL_SECONDS", 30))
+JOBS_HANDLER_MODULES = os.getenv("JOBS_HANDLER_MODULES", "app.jobs")
+
+
+def load_handlers(modules: str = JOBS_HANDLER_MODULES):
+    """Importa los módulos que registran handlers (separados por comas)"""
+    for module in filter(None, (m.strip() for m in modules.split(","))):
+        importlib.import_module(module)
+
+
+def work(
+    database_url: str,
+    worker_id: str,
+    stop_event=None,
+    kinds: Optional[List[str]] = None,
+    poll_interval: float = JOBS_POLL_INTERVAL_SECONDS,
+    exit_when_idle: bool = False,
+    visibility_timeout: float = JOBS_VISIBILITY_TIMEOUT_SECONDS,
+    handler_modules: str = JOBS_HANDLER_MODULES,
+) -> int:
+    """
+    Bucle de un worker; devuelve el número de trabajos ejecutados
+
+    Con `exit_when_idle` sale en cuanto no encuentra trabajo (benchmarks y tests).
+    """
+    load_handlers(handler_modules)
+    engine = (
+        create_engine(database_url, pool_size=2, max_overflow=0)
+        if not database_url.startswith("sqlite")
+        else create_engine(database_url, connect_args={"timeout": 30})
+    )
+    SessionForWorker = sessionmaker(
+        bind=engine, autoflush=False, expire_on_commit=False
+    )
+    processed = 0
+    next_reap = 0.0
+    try:
+        while stop_event is None or not stop_event.is_set():
+            with SessionForWorker() as db:
+                if time.monotonic() >= next_reap:
+                    reap_expired_jobs(db)
+                    next_reap = time.monotonic() + JOBS_REAP_INTERVAL_SECONDS
+                jobs = claim_jobs(
+                    db, worker_id, kinds=kinds, visibility_timeout=visibility_timeout
+                )
+                for job in jobs:
+                    run_job(db, job, visibility_timeout)
+                    processed += 1
+            if not jobs:
+                if exit_when_idle:
+                    break
+                if stop_event is not None:
+                    stop_event.wait(poll_interval)
+                else:
+                    time.sleep(poll_interval)
+    finally:
+        engine.dispose()
+    return processed
+
+
+def _process_main(
+    database_url,
+    worker_id,
+    stop_event,
+    kinds,
+    poll_interval,
+    exit_when_idle,
+    handler_modules,
+):
+    from app.logging_config import setup_logging
+
+    setup_logging(os.getenv("LOG_LEVEL", "INFO"))
+    # El proceso padre reparte la señal a través de stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    work(
+        database_url,
+        worker_id,
+        stop_event,
+        kinds,
+        poll_interval,
+        exit_when_idle,
+        handler_modules=handler_modules,
+    )
+
+
+def run_workers(
+    database_url: str,
+    processes: int = JOBS_WORKER_PROCESSES,
+    kinds: Optional[List[str]] = None,
+    poll_interval: float = JOBS_POLL_INTERVAL_SECONDS,
+    exit_when_idle: bool = False,
+    handler_modules: str = JOBS_HANDLER_MODULES,
+):
+    """
+    Arranca `processes` workers (spawn: sin heredar conexiones abiertas)
+    y espera a que terminen
+    """
+    context = multiprocessing.get_context("spawn")
+    stop_event = context.Event()
+    host = socket.gethostname()
+    workers = [
+        context.Process(
+            target=_process_main,
+            args=(
+                database_url,
+                f"{host}:{os.getpid()}:{i}",
+                stop_event,
+                kinds,
+                poll_interval,
+                exit_when_idle,
+                handler_modules,
+            ),
+            name=f"job-worker-{i}",
+        )
+        for i in range(processes)
+    ]
+    for process in workers:
+        process.start()
+
+    def stop(*_):
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        for process in workers:
+            process.join()
+    except KeyboardInterrupt:
+        stop_event.set()
+        for process in workers:
+            process.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Workers de la cola de trabajos")
+    parser.add_argument("--processes", type=int, default=JOBS_WORKER_PROCESSES)
+    parser.add_argument(
+        "--kinds",
+        default="",
+        help="Tipos de trabajo separados por comas (todos por defecto)",
+    )
+    parser.add_argument(
+        "--poll-interval", type=float, default=JOBS_POLL_INTERVAL_SECONDS
+    )
+    args = parser.parse_args()
+
+    from app.config import load_settings
+    from app.logging_config import setup_logging
+
+    settings = load_settings()
+    setup_logging(settings.LOG_LEVEL)
+    kinds = [kind.strip() for kind in args.kinds.split(",") if kind.strip()] or None
+    logger.info(f"Arrancando {args.processes} workers de trabajos")
+    run_workers(str(settings.DATABASE_URL), args.processes, kinds, args.poll_interval)
+
+
+if __name__ == "__main__":
+    main()
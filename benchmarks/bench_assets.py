@@ -0,0 +1,130 @@
+"""
+Benchmark: reproducción concurrente de video con muchos saltos (Range)
+
+Guarda un video de `--size-mb` MB como asset y simula `--players`
+reproductores concurrentes; cada uno hace `--seeks` saltos a posiciones
+aleatorias y pide `--range-kb` KB desde ahí (`Range: bytes=a-b` → 206), como
+un reproductor que rellena su búfer tras cada salto. Llama a la app ASGI
+directamente con httpx y compara el tamaño de bloque de lectura por defecto de
+FileResponse (64 KB) con ASSET_CHUNK_BYTES. Mide latencia y MB/s; cada
+respuesta se contrasta con el tramo correspondiente del fichero.
+
+Uso:
+    python benchmarks/bench_assets.py [--size-mb 512] [--players 64] [--seeks 40] [--range-kb 1024]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+import common  # noqa: F401  (configura entorno y sys.path)
+from common import async_db_override, summarize
+
+import httpx
+
+BLOCK_BYTES = 1024 ** 2
+
+
+def seed(tmp: str, size_mb: int) -> tuple:
+    from sqlalchemy import create_engine
+
+    import app.models  # noqa: F401  (registra los modelos en Base)
+    import app.models.posts  # noqa: F401
+    from app.db.base import Base
+    from app.services import media_storage
+    from app.services.assets import asset_relative_path
+
+    db_path = os.path.join(tmp, "assets.db")
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    media_storage.MEDIA_ROOT = os.path.join(tmp, "media")
+    source = media_storage.media_path("uploads/bench.part")
+    digest = hashlib.sha256()
+    with open(source, "wb") as output:
+        for _ in range(size_mb):
+            block = os.urandom(BLOCK_BYTES)
+            digest.update(block)
+            output.write(block)
+    sha256 = digest.hexdigest()
+    relative = asset_relative_path(sha256, "video/mp4")
+    os.replace(source, media_storage.media_path(relative))
+
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO media_assets (sha256, size, media_type, path) VALUES (?, ?, 'video/mp4', ?)",
+        (sha256, size_mb * BLOCK_BYTES, relative),
+    )
+    conn.commit()
+    conn.close()
+    return db_path, sha256, media_storage.media_path(relative)
+
+
+async def play(client, url: str, size: int, seeks: int, range_bytes: int, rng: random.Random, path: str, stats: dict):
+    with open(path, "rb") as original:
+        for _ in range(seeks):
+            start = rng.randrange(0, size - range_bytes)
+            began = time.perf_counter()
+            response = await client.get(url, headers={"Range": f"bytes={start}-{start + range_bytes - 1}"})
+            stats["latencies"].append((time.perf_counter() - began) * 1000)
+            assert response.status_code == 206, response.status_code
+            original.seek(start)
+            assert response.content[:64] == original.read(64)
+            stats["bytes"] += len(response.content)
+
+
+async def run(app, url: str, size: int, players: int, seeks: int, range_bytes: int, path: str) -> dict:
+    stats = {"latencies": [], "bytes": 0}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            play(client, url, size, seeks, range_bytes, random.Random(player), path, stats)
+            for player in range(players)
+        ))
+        stats["elapsed"] = time.perf_counter() - start
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--players", type=int, default=64)
+    parser.add_argument("--seeks", type=int, default=40)
+    parser.add_argument("--range-kb", type=int, default=1024)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, sha256, path = seed(tmp, args.size_mb)
+
+        from app.db.session import get_async_db
+        from app.main import app
+        from app.services.assets import ASSET_CHUNK_BYTES, AssetFileResponse
+
+        app.dependency_overrides[get_async_db] = async_db_override(f"sqlite:///{db_path}")
+        url = f"/api/assets/{sha256}.mp4"
+        size = args.size_mb * BLOCK_BYTES
+        print(
+            f"{args.players} reproductores x {args.seeks} saltos de {args.range_kb} KB "
+            f"sobre un video de {args.size_mb} MB"
+        )
+        for label, chunk_size in (("bloques de 64 KB", 64 * 1024), (f"bloques de {ASSET_CHUNK_BYTES // 1024} KB", ASSET_CHUNK_BYTES)):
+            AssetFileResponse.chunk_size = chunk_size
+            stats = asyncio.run(run(app, url, size, args.players, args.seeks, args.range_kb * 1024, path))
+            requests = len(stats["latencies"])
+            summarize(f"{label}", stats["latencies"])
+            print(
+                f"  {requests / stats['elapsed']:,.0f} peticiones/seg, "
+                f"{stats['bytes'] / 2**20 / stats['elapsed']:,.0f} MB/s"
+            )
+        AssetFileResponse.chunk_size = ASSET_CHUNK_BYTES
+
+
+if __name__ == "__main__":
+    main()
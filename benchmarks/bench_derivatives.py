@@ -0,0 +1,139 @@
+"""
+Benchmark: miniaturas pedidas por primera vez por muchos clientes a la vez
+
+Guarda `--images` fotos (JPEG de `--width`x`--height`) como assets y lanza
+`--clients` peticiones simultáneas de su miniatura (`thumb`) cuando aún no
+existe ninguna, como un feed recién publicado. Mientras tanto un latido mide
+cuánto tarda el event loop en atender una tarea de 1 ms. Compara Pillow en el
+propio proceso (DERIVATIVE_INLINE) con el pool de procesos, y cuenta cuántas
+miniaturas se generan (con single-flight, una por imagen).
+
+Uso:
+    python benchmarks/bench_derivatives.py [--images 16] [--clients 400] [--width 4000] [--height 3000]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import io
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+import common  # noqa: F401  (configura entorno y sys.path)
+os.environ.setdefault("LOG_SLOW_REQUEST_MS", "600000")  # aquí las peticiones lentas son lo esperado
+from common import async_db_override, summarize
+
+import httpx
+
+
+def seed(tmp: str, images: int, width: int, height: int) -> tuple:
+    from PIL import Image
+    from sqlalchemy import create_engine
+
+    import app.models  # noqa: F401  (registra los modelos en Base)
+    import app.models.posts  # noqa: F401
+    from app.db.base import Base
+    from app.services import media_storage
+    from app.services.assets import asset_relative_path
+
+    db_path = os.path.join(tmp, "derivatives.db")
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    media_storage.MEDIA_ROOT = os.path.join(tmp, "media")
+    conn = sqlite3.connect(db_path)
+    sha256s = []
+    for index in range(images):
+        output = io.BytesIO()
+        noise = Image.effect_noise((width, height), 40 + index).convert("RGB")
+        noise.save(output, "JPEG", quality=90)
+        data = output.getvalue()
+        sha256 = hashlib.sha256(data).hexdigest()
+        relative = asset_relative_path(sha256, "image/jpeg")
+        with open(media_storage.media_path(relative), "wb") as asset:
+            asset.write(data)
+        conn.execute(
+            "INSERT INTO media_assets (sha256, size, media_type, path) VALUES (?, ?, 'image/jpeg', ?)",
+            (sha256, len(data), relative),
+        )
+        sha256s.append(sha256)
+    conn.commit()
+    conn.close()
+    return db_path, sha256s
+
+
+async def heartbeat(stop: asyncio.Event, delays: list):
+    while not stop.is_set():
+        began = time.perf_counter()
+        await asyncio.sleep(0.001)
+        delays.append((time.perf_counter() - began) * 1000)
+
+
+async def run(app, urls: list, clients: int) -> dict:
+    latencies, delays = [], []
+    stop = asyncio.Event()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def fetch(url):
+            began = time.perf_counter()
+            response = await client.get(url)
+            latencies.append((time.perf_counter() - began) * 1000)
+            assert response.status_code == 200, response.status_code
+
+        beat = asyncio.create_task(heartbeat(stop, delays))
+        start = time.perf_counter()
+        await asyncio.gather(*(fetch(urls[index % len(urls)]) for index in range(clients)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await beat
+    return {"latencies": latencies, "delays": delays, "elapsed": elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--images", type=int, default=16)
+    parser.add_argument("--clients", type=int, default=400)
+    parser.add_argument("--width", type=int, default=4000)
+    parser.add_argument("--height", type=int, default=3000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path, sha256s = seed(tmp, args.images, args.width, args.height)
+
+        from app.db.session import get_async_db
+        from app.main import app
+        from app.services import media_storage
+        from app.services.assets import asset_locations
+        from app.services.derivatives import DerivativeGenerator
+        from app.routes import assets
+
+        app.dependency_overrides[get_async_db] = async_db_override(f"sqlite:///{db_path}")
+        urls = [f"/api/assets/{sha256}/thumb.jpg" for sha256 in sha256s]
+        print(
+            f"{args.clients} peticiones simultáneas de la miniatura de {args.images} fotos "
+            f"de {args.width}x{args.height} sin generar"
+        )
+        for label, inline in (("Pillow en el event loop", True), ("pool de procesos", False)):
+            generator = DerivativeGenerator(inline=inline, max_pending=args.clients)
+            assets.derivative_generator = generator
+            asset_locations.clear()
+            shutil.rmtree(media_storage.media_path("derivatives"), ignore_errors=True)
+            if not inline:
+                # Arranque de los procesos fuera de la medición
+                generator.pool.get_executor().submit(int).result()
+            stats = asyncio.run(run(app, urls, args.clients))
+            generator.shutdown()
+            summarize(label, stats["latencies"])
+            print(
+                f"  {stats['elapsed']:.2f} s en total, {generator.generated} miniaturas generadas "
+                f"({generator.shared} peticiones esperaron a otra); "
+                f"latido del event loop: máx {max(stats['delays'], default=0):.0f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
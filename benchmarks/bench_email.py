@@ -0,0 +1,94 @@
+"""
+Benchmark: envío de 10k correos contra un servidor SMTP local (aiosmtpd)
+
+Compara una conexión SMTP nueva por mensaje (lo que hacía send_email) con
+EmailQueue: EMAIL_POOL_SIZE conexiones persistentes y envío por lotes.
+
+Requiere `pip install aiosmtpd`.
+
+Uso:
+    python benchmarks/bench_email.py [--messages 10000] [--pool-size 4] [--baseline-messages 1000]
+"""
+
+import argparse
+import asyncio
+import smtplib
+import time
+
+import common  # noqa: F401  (configura entorno y sys.path)
+
+from aiosmtpd.controller import Controller
+
+from app.services.email_queue import EmailQueue, build_message, smtp_connector
+
+
+class CountingHandler:
+    def __init__(self):
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += len(envelope.rcpt_tos)
+        return "250 OK"
+
+
+def per_message_connection(port: int, messages: int) -> float:
+    start = time.perf_counter()
+    for i in range(messages):
+        server = smtplib.SMTP("127.0.0.1", port)
+        server.send_message(build_message(f"u{i}@example.com", "Hola", "cuerpo", "noreply@visart.test"))
+        server.quit()
+    return time.perf_counter() - start
+
+
+async def pooled_queue(port: int, messages: int, pool_size: int, batch_size: int):
+    queue = EmailQueue(
+        connect=smtp_connector("127.0.0.1", port, starttls=False),
+        sender="noreply@visart.test", pool_size=pool_size, batch_size=batch_size, max_size=messages,
+    )
+    queue.start()
+    start = time.perf_counter()
+    for i in range(messages):
+        queue.enqueue(f"u{i}@example.com", "Hola", "cuerpo")
+    enqueue_elapsed = time.perf_counter() - start
+    await queue.join()
+    elapsed = time.perf_counter() - start
+    await queue.stop()
+    return elapsed, enqueue_elapsed, queue.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=10000)
+    parser.add_argument("--baseline-messages", type=int, default=1000)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=50)
+    args = parser.parse_args()
+
+    handler = CountingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=0)
+    controller.start()
+    try:
+        port = controller.server.sockets[0].getsockname()[1]
+
+        elapsed = per_message_connection(port, args.baseline_messages)
+        print(
+            f"conexión por mensaje: {args.baseline_messages / elapsed:,.0f} correos/seg "
+            f"({elapsed / args.baseline_messages * 1000:.2f} ms/correo bloqueando al llamador)"
+        )
+
+        elapsed, enqueue_elapsed, stats = asyncio.run(
+            pooled_queue(port, args.messages, args.pool_size, args.batch_size)
+        )
+        print(
+            f"cola con {args.pool_size} conexiones: {args.messages / elapsed:,.0f} correos/seg "
+            f"({args.messages:,} en {elapsed:.2f}s; encolar {enqueue_elapsed / args.messages * 1e6:.1f} µs/correo, "
+            f"conexiones abiertas={stats['connections_opened']}, muertos={stats['dead']})"
+        )
+    finally:
+        controller.stop()
+
+    print(f"recibidos por el servidor: {handler.received:,}")
+
+
+if __name__ == "__main__":
+    main()
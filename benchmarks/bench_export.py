@@ -0,0 +1,121 @@
+"""
+Benchmark: exportación en streaming de 1M de publicaciones con memoria acotada
+
+Crea un usuario con `--posts` publicaciones en un SQLite temporal y descarga
+GET /api/users/me/export llamando a la app ASGI directamente (el cuerpo se
+descarta al recibirlo, como haría un cliente que escribe a disco). Mide el RSS
+del proceso tras cada fragmento y falla si supera `--max-rss-mb`.
+
+Uso:
+    python benchmarks/bench_export.py [--posts 1000000] [--format ndjson] [--max-rss-mb 150]
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import common  # noqa: F401  (configura entorno y sys.path)
+from common import async_db_override
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def seed(path: str, posts: int):
+    from sqlalchemy import create_engine
+
+    import app.models  # noqa: F401  (registra los modelos en Base)
+    import app.models.posts  # noqa: F401
+    from app.db.base import Base
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    now = datetime(2025, 9, 1).isoformat(" ")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "INSERT INTO users (id, username, email, hashed_password, fecha_creacion, is_active) VALUES (1, 'autora', 'a@example.com', 'x', ?, 1)",
+        (now,),
+    )
+    batch = 50000
+    for start in range(0, posts, batch):
+        conn.executemany(
+            "INSERT INTO posts (title, content, owner_id, fecha_creacion, fecha_actualizacion, is_published, likes_count) VALUES (?, ?, 1, ?, ?, 1, 0)",
+            [(f"Publicación {i}", "Contenido de la publicación " * 4, now, now) for i in range(start, min(posts, start + batch))],
+        )
+    conn.commit()
+    conn.close()
+
+
+async def download(app, export_format: str):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": "/api/users/me/export", "raw_path": b"/api/users/me/export", "root_path": "",
+        "query_string": f"format={export_format}".encode(), "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    stats = {"status": None, "bytes": 0, "chunks": 0, "peak_rss": rss_mb()}
+
+    async def receive():
+        await asyncio.sleep(3600)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            stats["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            stats["bytes"] += len(message.get("body", b""))
+            stats["chunks"] += 1
+            if stats["chunks"] % 50 == 0:
+                stats["peak_rss"] = max(stats["peak_rss"], rss_mb())
+
+    await app(scope, receive, send)
+    stats["peak_rss"] = max(stats["peak_rss"], rss_mb())
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    parser.add_argument("--max-rss-mb", type=float, default=150)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "export.db")
+        start = time.perf_counter()
+        seed(path, args.posts)
+        print(f"{args.posts:,} publicaciones insertadas en {time.perf_counter() - start:.1f}s")
+
+        from app.db.session import get_async_db
+        from app.dependencies import get_current_active_identity
+        from app.main import app
+        from app.services.identity_cache import AuthIdentity
+
+        app.dependency_overrides[get_async_db] = async_db_override(f"sqlite:///{path}")
+        app.dependency_overrides[get_current_active_identity] = lambda: AuthIdentity(1, "autora", True, False)
+
+        baseline = rss_mb()
+        start = time.perf_counter()
+        stats = asyncio.run(download(app, args.format))
+        elapsed = time.perf_counter() - start
+
+    print(
+        f"{args.format}: estado={stats['status']} {stats['bytes'] / 2**20:,.0f} MB en {stats['chunks']:,} fragmentos, "
+        f"{elapsed:.1f}s ({args.posts / elapsed:,.0f} filas/seg)"
+    )
+    print(f"RSS: inicial={baseline:.0f} MB pico={stats['peak_rss']:.0f} MB límite={args.max_rss_mb:.0f} MB")
+    if stats["status"] != 200 or stats["peak_rss"] > args.max_rss_mb:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
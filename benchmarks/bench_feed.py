@@ -0,0 +1,134 @@
+"""
+Benchmark: feed materializado frente a JOIN en tiempo de lectura
+
+Siembra autores, publicaciones y relaciones de seguimiento, materializa los
+timelines con el mismo formato que app.services.feed y compara la latencia de
+la primera página y de una página profunda del feed con ambas estrategias.
+
+Uso:
+    python benchmarks/bench_feed.py [--authors 5000] [--posts-per-author 20] [--readers 50] [--follows 60]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import common
+
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.orm import joinedload
+
+from app.models.feed_models import TimelineEntry
+from app.models.posts import Post
+from app.models.user_models import User, UserFollows
+from app.services import feed
+from app.utils.pagination import encode_cursor
+
+PAGE_SIZE = 20
+
+
+def seed(session_factory, authors, posts_per_author, readers, follows):
+    random.seed(7)
+    base = datetime(2024, 1, 1)
+    with session_factory() as db:
+        total_users = authors + readers
+        db.execute(insert(User), [
+            {"username": f"u{i}", "email": f"u{i}@example.com", "hashed_password": "x"}
+            for i in range(1, total_users + 1)
+        ])
+        posts = []
+        for author in range(1, authors + 1):
+            for p in range(posts_per_author):
+                posts.append({
+                    "title": f"{author}-{p}", "content": "c", "owner_id": author, "is_published": True,
+                    "fecha_creacion": base + timedelta(seconds=random.randint(0, 10_000_000)),
+                })
+        db.execute(insert(Post), posts)
+
+        reader_ids = list(range(authors + 1, total_users + 1))
+        follow_rows = []
+        for reader in reader_ids:
+            for author in random.sample(range(1, authors + 1), follows):
+                follow_rows.append({"follower_id": reader, "followed_id": author})
+        db.execute(insert(UserFollows), follow_rows)
+        db.commit()
+
+        # Materializar timelines (equivalente a fan_out_post para cada publicación)
+        followers = {}
+        for row in follow_rows:
+            followers.setdefault(row["followed_id"], []).append(row["follower_id"])
+        for post in db.execute(select(Post.id, Post.owner_id, Post.fecha_creacion)).all():
+            rows = [
+                {"user_id": reader, "post_id": post.id, "author_id": post.owner_id, "fecha_creacion": post.fecha_creacion}
+                for reader in followers.get(post.owner_id, [])
+            ]
+            if rows:
+                db.execute(insert(TimelineEntry), rows)
+        db.commit()
+    return reader_ids
+
+
+def naive_feed(db, user_id, after=None):
+    # Misma forma de resultado que read_feed: Post con su propietario cargado
+    query = (
+        select(Post)
+        .options(joinedload(Post.owner))
+        .join(UserFollows, UserFollows.followed_id == Post.owner_id)
+        .where(UserFollows.follower_id == user_id, Post.is_published.is_(True))
+    )
+    if after is not None:
+        query = query.where(tuple_(Post.fecha_creacion, Post.id) < tuple_(*after))
+    return db.execute(query.order_by(Post.fecha_creacion.desc(), Post.id.desc()).limit(PAGE_SIZE)).scalars().all()
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--authors", type=int, default=5000)
+    parser.add_argument("--posts-per-author", type=int, default=20)
+    parser.add_argument("--readers", type=int, default=50)
+    parser.add_argument("--follows", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_feed.db")
+    _, session_factory = common.make_sqlite_sessionmaker(f"sqlite:///{path}")
+    readers = seed(session_factory, args.authors, args.posts_per_author, args.readers, args.follows)
+
+    with session_factory() as db:
+        deep = naive_feed(db, readers[0])
+        for _ in range(50):
+            deep = naive_feed(db, readers[0], after=(deep[-1].fecha_creacion, deep[-1].id))
+        deep_after = (deep[-1].fecha_creacion, deep[-1].id)
+        deep_cursor = encode_cursor(deep_after)
+
+        samples = {
+            "JOIN en lectura, página 1": timed(lambda: naive_feed(db, random.choice(readers)), args.repeat),
+            "JOIN en lectura, página 51": timed(lambda: naive_feed(db, readers[0], after=deep_after), args.repeat),
+            "timeline materializado, página 1": timed(
+                lambda: feed.read_feed(db, random.choice(readers), limit=PAGE_SIZE), args.repeat
+            ),
+            "timeline materializado, página 51": timed(
+                lambda: feed.read_feed(db, readers[0], cursor=deep_cursor, limit=PAGE_SIZE), args.repeat
+            ),
+        }
+
+    print(f"{args.readers} lectores siguiendo a {args.follows} de {args.authors} autores "
+          f"({args.authors * args.posts_per_author} publicaciones)")
+    for label, values in samples.items():
+        common.summarize(label, values)
+
+
+if __name__ == "__main__":
+    main()
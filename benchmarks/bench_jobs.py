@@ -0,0 +1,78 @@
+"""
+Benchmark: trabajos/seg de la cola persistente con varios procesos worker
+
+Encola `--jobs` trabajos triviales (opcionalmente con `--work-ms` de trabajo
+simulado) y mide cuánto tardan 1, 2, 4... workers en vaciar la cola. Por
+defecto usa un SQLite temporal (reclamación serializada por el bloqueo de la
+base); con `--database-url postgresql://...` se mide FOR UPDATE SKIP LOCKED.
+
+Uso:
+    python benchmarks/bench_jobs.py [--jobs 2000] [--workers 1,2,4] [--work-ms 0] [--database-url URL]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import common  # noqa: F401  (configura entorno y sys.path)
+
+from sqlalchemy import create_engine, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+import app.models  # noqa: F401  (registra los modelos en Base)
+import app.models.posts  # noqa: F401
+from app.db.base import Base
+from app.models.job_models import JOB_SUCCEEDED, Job
+from app.services.job_queue import job_handler
+from app.worker import run_workers
+
+BENCH_WORK_MS = float(os.getenv("BENCH_JOB_WORK_MS", 0))
+
+
+# Se registra también en los workers: con "spawn" importan este módulo
+@job_handler("bench.noop")
+def noop(ctx):
+    if BENCH_WORK_MS:
+        time.sleep(BENCH_WORK_MS / 1000)
+    return None
+
+
+def reset_jobs(engine, jobs: int):
+    with Session(engine) as db:
+        db.execute(delete(Job))
+        db.execute(insert(Job), [{"kind": "bench.noop", "payload": {}, "status": "queued"} for _ in range(jobs)])
+        db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--work-ms", type=float, default=0)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    os.environ["BENCH_JOB_WORK_MS"] = str(args.work_ms)
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.database_url or f"sqlite:///{os.path.join(tmp, 'jobs.db')}"
+        engine = create_engine(url)
+        Base.metadata.create_all(engine)
+
+        for workers in (int(w) for w in args.workers.split(",")):
+            reset_jobs(engine, args.jobs)
+            start = time.perf_counter()
+            run_workers(url, processes=workers, poll_interval=0.01, exit_when_idle=True)
+            elapsed = time.perf_counter() - start
+            with Session(engine) as db:
+                done = db.execute(select(func.count()).where(Job.status == JOB_SUCCEEDED)).scalar_one()
+                duplicated = db.execute(select(func.count()).where(Job.attempts > 1)).scalar_one()
+            print(
+                f"{workers} workers: {done:,}/{args.jobs:,} trabajos en {elapsed:.2f}s "
+                f"({done / elapsed:,.0f} trabajos/seg, reintentos/duplicados={duplicated})"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
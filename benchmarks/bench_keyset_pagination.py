@@ -0,0 +1,95 @@
+"""
+Benchmark: paginación OFFSET frente a paginación por cursor (keyset)
+
+Siembra publicaciones en una base SQLite temporal y mide la latencia de la
+consulta de /api/posts/ en la página 1 y en la página N con ambos métodos.
+
+Uso:
+    python benchmarks/bench_keyset_pagination.py [--posts 150000] [--page 10000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import common
+
+from sqlalchemy import insert
+
+from app.models.posts import Post
+from app.models.user_models import User
+from app.utils.pagination import encode_cursor, paginate
+
+PAGE_SIZE = 10
+
+
+def seed(session_factory, total):
+    base = datetime(2024, 1, 1)
+    with session_factory() as db:
+        db.execute(insert(User), [{"username": "autor", "email": "autor@example.com", "hashed_password": "x"}])
+        batch = []
+        for i in range(total):
+            batch.append({
+                "title": f"Post {i}",
+                "content": "contenido de prueba",
+                "owner_id": 1,
+                "is_published": True,
+                "fecha_creacion": base + timedelta(seconds=i),
+                "fecha_actualizacion": base + timedelta(seconds=i),
+            })
+            if len(batch) == 10000:
+                db.execute(insert(Post), batch)
+                batch = []
+        if batch:
+            db.execute(insert(Post), batch)
+        db.commit()
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=150000)
+    parser.add_argument("--page", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_pagination.db")
+    _, session_factory = common.make_sqlite_sessionmaker(f"sqlite:///{path}")
+    seed(session_factory, args.posts)
+    keys = (Post.fecha_creacion, Post.id)
+
+    with session_factory() as db:
+        query = db.query(Post).filter(Post.is_published.is_(True))
+        ordered = query.order_by(Post.fecha_creacion.desc(), Post.id.desc())
+        skip = (args.page - 1) * PAGE_SIZE
+
+        # Cursor equivalente a llegar a la página N siguiendo next_cursor
+        anchor = ordered.offset(skip - 1).limit(1).one()
+        deep_cursor = encode_cursor([anchor.fecha_creacion, anchor.id])
+
+        results = {
+            "offset página 1": timed(lambda: paginate(ordered, skip=0, limit=PAGE_SIZE), args.repeat),
+            f"offset página {args.page}": timed(lambda: paginate(ordered, skip=skip, limit=PAGE_SIZE), args.repeat),
+            "cursor página 1": timed(lambda: paginate(query, limit=PAGE_SIZE, keys=keys), args.repeat),
+            f"cursor página {args.page}": timed(
+                lambda: paginate(query, limit=PAGE_SIZE, cursor=deep_cursor, keys=keys), args.repeat
+            ),
+        }
+
+    print(f"{args.posts} publicaciones, {PAGE_SIZE} por página")
+    for label, samples in results.items():
+        common.summarize(label, samples)
+
+
+if __name__ == "__main__":
+    main()
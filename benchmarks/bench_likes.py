@@ -0,0 +1,117 @@
+"""
+Benchmark: likes por segundo sobre una única publicación "caliente"
+
+Varios hilos dan me gusta a la misma publicación durante unos segundos con dos
+estrategias: UPDATE del contador en cada transacción (todas las escrituras se
+serializan sobre la misma fila) y buffer en memoria volcado por lotes
+(app.services.like_counter). Con --url se puede lanzar contra PostgreSQL, donde
+la contención por el bloqueo de fila es la que se quiere medir.
+
+Uso:
+    python benchmarks/bench_likes.py [--users 20000] [--threads 16] [--seconds 5] [--url sqlite:///...]
+"""
+
+import argparse
+import itertools
+import os
+import tempfile
+import threading
+import time
+
+import common
+
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models.like_models import PostLike
+from app.models.posts import Post
+from app.models.user_models import User
+from app.services.like_counter import LikeCounterBuffer
+
+
+def setup(url, users):
+    engine = create_engine(url, pool_size=32, max_overflow=0)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"username": f"u{i}", "email": f"u{i}@example.com", "hashed_password": "x"}
+            for i in range(1, users + 1)
+        ])
+        conn.execute(insert(Post), [{"id": 1, "title": "viral", "content": "c", "owner_id": 1}])
+    return engine
+
+
+def run(engine, users, threads, seconds, buffer=None):
+    session_factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    user_ids = itertools.count(1)
+    ids_lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    done = []
+
+    def worker():
+        count = 0
+        with session_factory() as db:
+            while time.perf_counter() < deadline:
+                with ids_lock:
+                    user_id = next(user_ids)
+                if user_id > users:
+                    break
+                db.add(PostLike(user_id=user_id, post_id=1))
+                if buffer is None:
+                    db.execute(update(Post).where(Post.id == 1).values(likes_count=Post.likes_count + 1))
+                db.commit()
+                if buffer is not None:
+                    buffer.add(1, 1)
+                count += 1
+        done.append(count)
+
+    stop = threading.Event()
+
+    def flusher():
+        while not stop.wait(buffer.flush_interval_ms / 1000):
+            buffer.flush()
+
+    start = time.perf_counter()
+    flush_thread = threading.Thread(target=flusher) if buffer is not None else None
+    if flush_thread:
+        flush_thread.start()
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    if flush_thread:
+        stop.set()
+        flush_thread.join()
+        buffer.flush()
+
+    with session_factory() as db:
+        stored = db.get(Post, 1).likes_count
+    return sum(done), elapsed, stored
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--flush-interval-ms", type=int, default=200)
+    parser.add_argument("--url", default=None)
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_likes.db')}"
+    print(f"{args.threads} hilos, {args.seconds:.0f}s, publicación única ({url.split(':', 1)[0]})")
+    for label, buffered in (("UPDATE por like", False), ("buffer por lotes", True)):
+        engine = setup(url, args.users)
+        buffer = LikeCounterBuffer(bind=engine, flush_interval_ms=args.flush_interval_ms) if buffered else None
+        likes, elapsed, stored = run(engine, args.users, args.threads, args.seconds, buffer)
+        extra = f", {buffer.flushes} volcados" if buffer else ""
+        print(f"{label}: {likes / elapsed:.0f} likes/s ({likes} likes, likes_count={stored}{extra})")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: avalancha de logins concurrentes
+
+Mide logins/seg y la latencia p99 de un endpoint ajeno (/ping) mientras se
+ejecuta una avalancha de logins, comparando bcrypt inline (en el event loop)
+frente al pool de procesos de app.services.password_hashing.
+
+Uso:
+    python benchmarks/bench_login_flood.py [--logins 40] [--concurrency 20]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import common
+
+import httpx
+from fastapi import FastAPI
+
+from app.db.session import get_async_db
+from app.models.user_models import User
+from app.routes import auth
+from app.security import get_password_hash
+from app.services.password_hashing import PasswordHasher
+
+PASSWORD = "Benchmark123!"
+
+
+def build_app(url):
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api/auth")
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.dependency_overrides[get_async_db] = common.async_db_override(url)
+    return app
+
+
+async def run_flood(app, users, concurrency):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        semaphore = asyncio.Semaphore(concurrency)
+        done = asyncio.Event()
+        ping_latencies = []
+
+        async def login(username):
+            async with semaphore:
+                response = await client.post(
+                    "/api/auth/login",
+                    json={"username": username, "email": f"{username}@example.com", "password": PASSWORD},
+                )
+                assert response.status_code == 200, response.text
+
+        async def probe():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/ping")
+                ping_latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(login(u) for u in users))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe_task
+        return len(users) / elapsed, ping_latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_login.db')}"
+    _, session_factory = common.make_sqlite_sessionmaker(url)
+    hashed = get_password_hash(PASSWORD)
+    users = [f"bench{i}" for i in range(args.logins)]
+    with session_factory() as db:
+        db.add_all(User(username=u, email=f"{u}@example.com", hashed_password=hashed) for u in users)
+        db.commit()
+
+    app = build_app(url)
+    for label, hasher in (
+        ("inline", PasswordHasher(inline=True)),
+        ("process-pool", PasswordHasher(max_workers=args.workers or common.os.cpu_count() or 1, inline=False)),
+    ):
+        auth.password_hasher = hasher
+        try:
+            logins_per_sec, ping = asyncio.run(run_flood(app, users, args.concurrency))
+        finally:
+            hasher.shutdown()
+        print(f"[{label}] logins/seg={logins_per_sec:.1f}")
+        common.summarize(f"[{label}] /ping durante la avalancha", ping)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark: pila de middlewares BaseHTTPMiddleware frente a ASGI puro
+
+Compara peticiones/seg sobre un endpoint trivial con la pila anterior (log y
+tiempo con BaseHTTPMiddleware más el @app.middleware("http") de app.main) y con
+RequestContextMiddleware. Las peticiones se envían directamente a la app ASGI,
+sin cliente HTTP, para medir solo el coste de los middlewares. El log se
+silencia en ambos casos.
+
+Uso:
+    python benchmarks/bench_middleware.py [--requests 20000]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import common  # noqa: F401  (configura entorno y sys.path)
+
+from fastapi import FastAPI, Request
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middlewares.request_context import RequestContextMiddleware
+
+logger = logging.getLogger("visart-backend")
+
+
+# Pila anterior (copia de app/middlewares/logging.py, timing.py y app.main)
+class OldLoggingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        logger.info(f"Petición: {request.method} {request.url}")
+        response = await call_next(request)
+        logger.info(f"Respuesta: {response.status_code} para {request.method} {request.url}")
+        return response
+
+
+class OldTimingMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        response = await call_next(request)
+        response.headers["X-Response-Time"] = f"{time.time() - start_time:.4f}s"
+        return response
+
+
+def build_app(stack):
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    if stack == "antes":
+        app.add_middleware(OldLoggingMiddleware)
+        app.add_middleware(OldTimingMiddleware)
+
+        @app.middleware("http")
+        async def log_requests(request, call_next):
+            logger.info(f"Peticion: {request.method} {request.url}")
+            response = await call_next(request)
+            logger.info(f"Respuesta: {response.status_code} para {request.method} {request.url}")
+            return response
+    elif stack == "después":
+        app.add_middleware(RequestContextMiddleware)
+    return app
+
+
+SCOPE = {
+    "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+    "path": "/ping", "raw_path": b"/ping", "query_string": b"", "root_path": "",
+    "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1234), "server": ("bench", 80),
+}
+
+
+async def run(app, requests):
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(200):  # calentamiento
+        await app(dict(SCOPE), receive, send)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(SCOPE), receive, send)
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    logger.setLevel(logging.WARNING)
+    for stack in ("sin middlewares", "antes", "después"):
+        rate = asyncio.run(run(build_app(stack), args.requests))
+        print(f"{stack}: {rate:,.0f} peticiones/seg")
+
+
+if __name__ == "__main__":
+    main()
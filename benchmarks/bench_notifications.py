@@ -0,0 +1,192 @@
+"""
+Benchmark: 10k conexiones WebSocket inactivas en /ws/notifications
+
+Arranca la app con uvicorn (un solo worker) sobre SQLite, abre
+`--connections` conexiones autenticadas, cada una de un usuario distinto que
+sigue a la misma autora, y las deja inactivas `--idle-seconds` segundos
+midiendo la memoria (RSS) del servidor. Después mide la latencia de entrega
+de extremo a extremo (de la petición HTTP al mensaje en el cliente):
+
+- eventos individuales: `--follows` peticiones de follow, cada una notifica a
+  un usuario conectado distinto;
+- fan-out: la autora publica y el aviso llega a todas las conexiones.
+
+Los clientes corren en este mismo proceso (y, en máquinas pequeñas, en los
+mismos núcleos que el servidor): las latencias incluyen su coste.
+
+Uso:
+    python benchmarks/bench_notifications.py [--connections 10000] [--idle-seconds 10] [--follows 200]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+import common  # noqa: F401  (configura entorno y sys.path)
+from common import summarize
+
+import httpx
+from websockets.asyncio.client import connect
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def seed(db_path: str, connections: int):
+    from sqlalchemy import create_engine
+
+    import app.models  # noqa: F401  (registra los modelos en Base)
+    import app.models.posts  # noqa: F401
+    from app.db.base import Base
+
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+
+    # 1: autora, 2: usuario que hace los follows, 3..: conexiones (seguidores de la autora)
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO users (id, username, email, hashed_password, is_active, fecha_creacion, fecha_actualizacion)"
+        " VALUES (?, ?, ?, 'x', 1, datetime('now'), datetime('now'))",
+        [(user_id, f"u{user_id}", f"u{user_id}@example.com") for user_id in range(1, connections + 3)],
+    )
+    conn.executemany(
+        "INSERT INTO user_follows (follower_id, followed_id, fecha_creacion) VALUES (?, 1, datetime('now'))",
+        [(user_id,) for user_id in range(3, connections + 3)],
+    )
+    conn.execute("UPDATE users SET follower_count = ? WHERE id = 1", (connections,))
+    conn.commit()
+    conn.close()
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def rss_mb(pid: int) -> float:
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def token_for(user_id: int) -> str:
+    from app.security import create_access_token
+    return create_access_token({"sub": f"u{user_id}"})
+
+
+async def listen(user_id: int, url: str, received: dict, ready: asyncio.Semaphore, sockets: list):
+    async with ready:
+        websocket = await connect(f"{url}?token={token_for(user_id)}", ping_interval=None, max_queue=None, open_timeout=120)
+    sockets.append(websocket)
+    async for message in websocket:
+        received.setdefault(json.loads(message)["type"], {})[user_id] = time.perf_counter()
+
+
+async def wait_for(condition, timeout: float):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+
+
+async def run(base_url: str, pid: int, args) -> None:
+    ws_url = base_url.replace("http", "ws", 1) + "/ws/notifications"
+    received, sockets = {}, []
+    user_ids = list(range(3, args.connections + 3))
+    baseline = rss_mb(pid)
+
+    start = time.perf_counter()
+    ready = asyncio.Semaphore(200)
+    listeners = [asyncio.create_task(listen(user_id, ws_url, received, ready, sockets)) for user_id in user_ids]
+    await wait_for(lambda: len(sockets) == len(user_ids) or any(task.done() for task in listeners), 600)
+    failed = [task for task in listeners if task.done() and task.exception()]
+    if failed:
+        raise failed[0].exception()
+    print(f"{len(sockets)} conexiones abiertas en {time.perf_counter() - start:.1f} s")
+
+    await asyncio.sleep(args.idle_seconds)
+    idle = rss_mb(pid)
+    print(
+        f"RSS del servidor: {baseline:.0f} MB sin conexiones, {idle:.0f} MB con {len(sockets)} inactivas "
+        f"({(idle - baseline) * 1024 / len(sockets):.1f} KB por conexión)"
+    )
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        actor = {"Authorization": f"Bearer {token_for(2)}"}
+        sent = {}
+        targets = random.Random(0).sample(user_ids, min(args.follows, len(user_ids)))
+        # De una en una: en SQLite las escrituras concurrentes esperarían al bloqueo de la base
+        for user_id in targets:
+            sent[user_id] = time.perf_counter()
+            response = await client.post(f"/api/users/{user_id}/follow", headers=actor)
+            assert response.status_code == 201, response.text
+        followers = received.setdefault("follower", {})
+        await wait_for(lambda: len(followers) == len(targets), 30)
+        summarize(
+            f"eventos individuales ({len(followers)}/{len(targets)} entregados)",
+            [(followers[user_id] - sent[user_id]) * 1000 for user_id in targets if user_id in followers],
+        )
+
+        author = {"Authorization": f"Bearer {token_for(1)}"}
+        posted = time.perf_counter()
+        response = await client.post("/api/posts/", json={"title": "hola", "content": "c"}, headers=author)
+        assert response.status_code == 201, response.text
+        posts = received.setdefault("post", {})
+        await wait_for(lambda: len(posts) == len(user_ids), 60)
+        latencies = [(at - posted) * 1000 for at in posts.values()]
+        summarize(f"fan-out de una publicación ({len(posts)}/{len(user_ids)} entregados)", latencies)
+        print(f"  el último aviso llegó a los {max(latencies, default=0):.0f} ms")
+
+        stats = (await client.get("/api/health")).json()["notifications"]
+        print(f"  servidor: {stats}")
+
+    for task in listeners:
+        task.cancel()
+    await asyncio.gather(*listeners, return_exceptions=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--connections", type=int, default=10000)
+    parser.add_argument("--idle-seconds", type=float, default=10)
+    parser.add_argument("--follows", type=int, default=200)
+    parser.add_argument("--ws", default="auto", help="implementación WebSocket de uvicorn")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "notifications.db")
+        seed(db_path, args.connections)
+        port = free_port()
+        env = {**os.environ, "DATABASE_URL": f"sqlite:///{db_path}", "LOG_LEVEL": "WARNING",
+               "NOTIFY_MAX_CONNECTIONS": str(args.connections + 100)}
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+             "--workers", "1", "--backlog", "4096", "--ws", args.ws, "--log-level", "warning"],
+            cwd=ROOT, env=env,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            for _ in range(300):
+                try:
+                    if httpx.get(f"{base_url}/api/health").status_code == 200:
+                        break
+                except httpx.TransportError:
+                    time.sleep(0.1)
+            asyncio.run(run(base_url, server.pid, args))
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Benchmark: búsqueda de texto completo frente a LIKE '%término%'
+
+Siembra publicaciones con texto aleatorio (por defecto un millón) en una base
+SQLite temporal; los triggers mantienen posts_fts igual que en la app. Mide la
+primera página de /api/posts/search (app.services.post_search) y la consulta
+LIKE equivalente, que recorre toda la tabla.
+
+Uso:
+    python benchmarks/bench_search.py [--posts 1000000] [--repeat 20]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import common
+
+from sqlalchemy import insert, or_, select
+
+from app.models.posts import Post
+from app.models.user_models import User
+from app.schemas.post import PostSearchFilters
+from app.services.post_search import search_posts
+
+PAGE_SIZE = 20
+VOCABULARY = [f"palabra{i}" for i in range(20000)]
+# Términos con distinta frecuencia: frecuente, media y rara
+TERMS = ["palabra3", "palabra300", "palabra19999"]
+
+
+def zipf_word():
+    # Distribución sesgada como en texto real: pocas palabras muy frecuentes
+    return VOCABULARY[min(int(random.paretovariate(1.1)) - 1, len(VOCABULARY) - 1)]
+
+
+def seed(session_factory, total):
+    random.seed(11)
+    base = datetime(2024, 1, 1)
+    with session_factory() as db:
+        db.execute(insert(User), [{"username": "autor", "email": "autor@example.com", "hashed_password": "x"}])
+        batch = []
+        for i in range(total):
+            batch.append({
+                "title": " ".join(zipf_word() for _ in range(4)),
+                "content": " ".join(zipf_word() for _ in range(30)),
+                "owner_id": 1,
+                "is_published": True,
+                "fecha_creacion": base + timedelta(seconds=i),
+            })
+            if len(batch) == 10000:
+                db.execute(insert(Post), batch)
+                batch = []
+        if batch:
+            db.execute(insert(Post), batch)
+        db.commit()
+
+
+def like_search(db, term):
+    pattern = f"%{term}%"
+    return db.execute(
+        select(Post)
+        .where(Post.is_published.is_(True), or_(Post.title.like(pattern), Post.content.like(pattern)))
+        .order_by(Post.id.desc())
+        .limit(PAGE_SIZE)
+    ).scalars().all()
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_search.db")
+    _, session_factory = common.make_sqlite_sessionmaker(f"sqlite:///{path}")
+    start = time.perf_counter()
+    seed(session_factory, args.posts)
+    print(f"{args.posts} publicaciones sembradas e indexadas en {time.perf_counter() - start:.1f}s")
+
+    with session_factory() as db:
+        for term in TERMS:
+            common.summarize(f"LIKE '%{term}%'", timed(lambda: like_search(db, term), args.repeat))
+            common.summarize(
+                f"texto completo '{term}'",
+                timed(lambda: search_posts(db, PostSearchFilters(), q=term, limit=PAGE_SIZE), args.repeat),
+            )
+
+
+if __name__ == "__main__":
+    main()
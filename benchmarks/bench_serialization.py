@@ -0,0 +1,80 @@
+"""
+Benchmark: serialización de una página de 100 publicaciones
+
+Compara, sobre los mismos objetos ORM (Post con su owner y perfil):
+- el camino de response_model: validar PostListResponse, convertir a tipos JSON
+  y serializar con json.dumps (JSONResponse);
+- lo mismo con FastJSONResponse (orjson);
+- dump_post_list: TypeAdapter precompilado que escribe los bytes directamente.
+
+Uso:
+    python benchmarks/bench_serialization.py [--posts 100] [--iterations 2000]
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta
+
+import common  # noqa: F401  (configura entorno y sys.path)
+
+from fastapi.responses import JSONResponse
+
+from app.models.posts import Post
+from app.models.user_models import User, UserProfile
+from app.schemas.post import PostListResponse
+from app.utils.responses import FastJSONResponse
+from app.utils.serialization import dump_post_list
+
+
+def build_page(size: int):
+    now = datetime(2025, 9, 1)
+    owner = User(id=1, username="autora", email="autora@example.com", fecha_creacion=now)
+    owner.profile = UserProfile(user_id=1, full_name="Autora de prueba", avatar_url="https://cdn.example.com/a.png")
+    return [
+        Post(
+            id=i,
+            title=f"Publicación {i}",
+            content="Contenido de la publicación con algo de texto. " * 8,
+            image_url=f"https://cdn.example.com/posts/{i}.jpg",
+            is_published=True,
+            owner_id=1,
+            owner=owner,
+            likes_count=i,
+            fecha_creacion=now - timedelta(minutes=i),
+            fecha_actualizacion=now - timedelta(minutes=i),
+        )
+        for i in range(1, size + 1)
+    ]
+
+
+def response_model_path(response_class, posts, page_size):
+    # Lo que hace FastAPI con response_model: validar, volcar a tipos JSON y renderizar
+    page = PostListResponse.model_validate({"posts": posts, "page_size": page_size, "next_cursor": "abc"})
+    return response_class(content=page.model_dump(mode="json")).body
+
+
+def measure(label, iterations, func):
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"{label}: {elapsed / iterations * 1e6:,.0f} µs/página ({iterations / elapsed:,.0f} páginas/seg)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    posts = build_page(args.posts)
+    assert len(dump_post_list(posts, args.posts, "abc")) > 0
+
+    measure("response_model + JSONResponse", args.iterations, lambda: response_model_path(JSONResponse, posts, args.posts))
+    measure("response_model + FastJSONResponse", args.iterations, lambda: response_model_path(FastJSONResponse, posts, args.posts))
+    measure("TypeAdapter -> bytes", args.iterations, lambda: dump_post_list(posts, args.posts, "abc"))
+
+
+if __name__ == "__main__":
+    main()
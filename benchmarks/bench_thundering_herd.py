@@ -0,0 +1,103 @@
+"""
+Benchmark: avalancha de lecturas concurrentes de una misma publicación
+
+Lanza N peticiones GET /api/posts/{id} simultáneas, con y sin la coalescencia
+single-flight de app.routes.posts, y cuenta las consultas SQL ejecutadas y la
+latencia p99. --db-latency-ms simula la latencia de red de una base remota.
+
+Uso:
+    python benchmarks/bench_thundering_herd.py [--requests 500] [--rounds 5] [--db-latency-ms 5]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import common
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.db import session as db_session_module
+from app.models.posts import Post
+from app.models.user_models import User, UserProfile
+from app.routes import posts
+from app.utils.singleflight import SingleFlight
+
+
+def build_app(url, session_factory):
+    app = FastAPI()
+    app.include_router(posts.router, prefix="/api/posts")
+
+    def override_get_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[db_session_module.get_db] = override_get_db
+    app.dependency_overrides[db_session_module.get_async_db] = common.async_db_override(url)
+    return app
+
+
+async def herd(app, post_id, requests):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def fetch():
+            start = time.perf_counter()
+            response = await client.get(f"/api/posts/{post_id}")
+            assert response.status_code == 200, response.text
+            return (time.perf_counter() - start) * 1000
+
+        return await asyncio.gather(*(fetch() for _ in range(requests)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--db-latency-ms", type=float, default=5)
+    args = parser.parse_args()
+
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench_herd.db')}"
+    common.make_sqlite_sessionmaker(url)[0].dispose()  # crea las tablas
+    # Engine con pool normal: cada hilo del threadpool usa su propia conexión
+    engine = create_engine(url, connect_args={"check_same_thread": False}, pool_size=40, max_overflow=0)
+    session_factory = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    with session_factory() as db:
+        user = User(username="viral", email="viral@example.com", hashed_password="x")
+        user.profile = UserProfile(full_name="Autora Viral")
+        db.add(user)
+        db.flush()
+        post = Post(title="Publicación viral", content="c" * 2000, owner_id=user.id)
+        db.add(post)
+        db.commit()
+        post_id = post.id
+
+    queries = [0]
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_and_delay(*_):
+        queries[0] += 1
+        if args.db_latency_ms:
+            time.sleep(args.db_latency_ms / 1000)
+
+    app = build_app(url, session_factory)
+    for label, enabled in (("sin coalescencia", False), ("single-flight", True)):
+        posts.post_reads = SingleFlight(enabled=enabled)
+        queries[0] = 0
+        latencies = []
+        for _ in range(args.rounds):
+            latencies += asyncio.run(herd(app, post_id, args.requests))
+        print(f"[{label}] consultas SQL={queries[0]} ({queries[0] / (args.rounds * args.requests):.2f} por petición)")
+        common.summarize(f"[{label}] GET /api/posts/{{id}}", latencies)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark: verificación de JWT en frío frente a caché
+
+Compara verify_token sin caché (la caché se vacía antes de cada llamada) con
+verify_token sobre el mismo token ya verificado, que es el caso de varias
+llamadas por petición (get_current_identity, has_permission, is_admin_user...).
+
+Uso:
+    python benchmarks/bench_token_verification.py [--iterations 20000]
+"""
+
+import argparse
+import time
+
+import common  # noqa: F401  (configura entorno y sys.path)
+
+from app import security
+
+
+def measure(label, iterations, func):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    print(f"{label}: {iterations / elapsed:,.0f} verificaciones/seg ({elapsed / iterations * 1e6:.1f} µs/op)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = security.create_access_token({"sub": "benchmark", "permissions": ["posts:write"]})
+
+    def cold():
+        security.clear_token_cache()
+        security.verify_token(token)
+
+    security.clear_token_cache()
+    security.verify_token(token)
+
+    measure("en frío (firma HMAC + parseo)", args.iterations, cold)
+    measure("en caché", args.iterations, lambda: security.verify_token(token))
+
+
+if __name__ == "__main__":
+    main()
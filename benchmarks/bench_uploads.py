@@ -0,0 +1,175 @@
+"""
+Benchmark: subida por fragmentos de varios GB con memoria acotada
+
+Sube un fichero de `--size-gb` GB en fragmentos de `--chunk-mb` MB llamando
+a la app ASGI directamente; el cuerpo llega en trozos de 64 KB, como desde
+uvicorn. A mitad de la subida se corta un fragmento (desconexión) y se
+reanuda desde el offset que devuelve GET /api/uploads/{id}. Después se repite
+la subida anunciando el sha256 (deduplicación: no se envía nada).
+
+Mide el RSS del proceso durante toda la subida y falla si supera
+`--max-rss-mb`. Los ficheros se escriben en `--dir` (hace falta espacio libre
+para el fichero completo).
+
+Uso:
+    python benchmarks/bench_uploads.py [--size-gb 4] [--chunk-mb 8] [--max-rss-mb 150] [--dir /tmp]
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+import common  # noqa: F401  (configura entorno y sys.path)
+from common import async_db_override
+
+PIECE_BYTES = 64 * 1024
+BLOCK_BYTES = 1024 ** 2
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def create_schema(path: str):
+    import sqlite3
+
+    from sqlalchemy import create_engine
+
+    import app.models  # noqa: F401  (registra los modelos en Base)
+    import app.models.posts  # noqa: F401
+    from app.db.base import Base
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "INSERT INTO users (id, username, email, hashed_password, is_active) VALUES (1, 'autora', 'a@example.com', 'x', 1)"
+    )
+    conn.commit()
+    conn.close()
+
+
+async def call(app, method: str, path: str, headers=(), body_pieces=(), stats=None, disconnect_after=None):
+    """Petición ASGI; el cuerpo se entrega pieza a pieza sin juntarlo"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method, "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": [(b"host", b"bench"), *headers], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+    pieces = iter(body_pieces)
+    sent = 0
+    response = {"status": None, "body": b""}
+
+    async def receive():
+        nonlocal sent
+        piece = next(pieces, None)
+        if piece is None or (disconnect_after is not None and sent >= disconnect_after):
+            if disconnect_after is not None:
+                return {"type": "http.disconnect"}
+            return {"type": "http.request", "body": b"", "more_body": False}
+        sent += 1
+        if stats is not None and sent % 16 == 0:
+            stats["peak_rss"] = max(stats["peak_rss"], rss_mb())
+        return {"type": "http.request", "body": piece, "more_body": True}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["body"] += message.get("body", b"")
+
+    await app(scope, receive, send)
+    return response["status"], (json.loads(response["body"]) if response["body"] else None)
+
+
+async def upload_file(app, size: int, chunk: int, block: bytes, stats: dict):
+    pieces_per_block = BLOCK_BYTES // PIECE_BYTES
+
+    def chunk_pieces(n_bytes: int):
+        for i in range(n_bytes // PIECE_BYTES):
+            start = (i % pieces_per_block) * PIECE_BYTES
+            yield block[start:start + PIECE_BYTES]
+
+    # El contenido es `block` repetido y `chunk` es múltiplo de su tamaño: todos los fragmentos tienen el mismo hash
+    chunk_checksum = ("sha256 " + base64.b64encode(hashlib.sha256(block * (chunk // BLOCK_BYTES)).digest()).decode()).encode()
+    json_headers = [(b"content-type", b"application/json")]
+    body = json.dumps({"filename": "bench.mp4", "media_type": "video/mp4", "size": size}).encode()
+    status, upload = await call(app, "POST", "/api/uploads", json_headers, [body])
+    assert status == 201, upload
+
+    offset, interrupted = 0, False
+    while offset < size:
+        headers = [(b"upload-offset", str(offset).encode()), (b"upload-checksum", chunk_checksum)]
+        if not interrupted and offset >= size // 2:
+            # Corte a mitad de fragmento: lo recibido se descarta
+            interrupted = True
+            await call(app, "PUT", upload["upload_url"], headers, chunk_pieces(chunk), stats, disconnect_after=10)
+            status, state = await call(app, "GET", upload["upload_url"])
+            assert state["offset"] == offset, state
+            print(f"  desconexión en {offset / 2**30:.2f} GB; se reanuda desde offset={state['offset']:,}")
+            continue
+        status, state = await call(app, "PUT", upload["upload_url"], headers, chunk_pieces(chunk), stats)
+        assert status == 200, state
+        offset = state["offset"]
+    stats["peak_rss"] = max(stats["peak_rss"], rss_mb())
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size-gb", type=float, default=4)
+    parser.add_argument("--chunk-mb", type=int, default=8)
+    parser.add_argument("--max-rss-mb", type=float, default=150)
+    parser.add_argument("--dir", default=None)
+    args = parser.parse_args()
+
+    chunk = args.chunk_mb * BLOCK_BYTES
+    size = int(args.size_gb * 2**30) // chunk * chunk
+    block = os.urandom(BLOCK_BYTES)
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        path = os.path.join(tmp, "uploads.db")
+        create_schema(path)
+
+        from app.db.session import get_async_db
+        from app.dependencies import get_current_active_identity
+        from app.main import app
+        from app.services import media_storage, uploads
+        from app.services.identity_cache import AuthIdentity
+
+        media_storage.MEDIA_ROOT = os.path.join(tmp, "media")
+        uploads.UPLOAD_MAX_BYTES = max(uploads.UPLOAD_MAX_BYTES, size)
+        app.dependency_overrides[get_async_db] = async_db_override(f"sqlite:///{path}")
+        app.dependency_overrides[get_current_active_identity] = lambda: AuthIdentity(1, "autora", True, False)
+
+        baseline = rss_mb()
+        stats = {"peak_rss": baseline}
+        print(f"Subiendo {size / 2**30:.2f} GB en fragmentos de {args.chunk_mb} MB...")
+        start = time.perf_counter()
+        state = asyncio.run(upload_file(app, size, chunk, block, stats))
+        elapsed = time.perf_counter() - start
+        print(
+            f"  estado={state['status']} sha256={state['sha256'][:16]}... "
+            f"{elapsed:.1f}s ({size / 2**20 / elapsed:,.0f} MB/s)"
+        )
+
+        body = json.dumps({"filename": "copia.mp4", "media_type": "video/mp4", "size": size, "sha256": state["sha256"]})
+        start = time.perf_counter()
+        _, again = asyncio.run(call(app, "POST", "/api/uploads", [(b"content-type", b"application/json")], [body.encode()]))
+        print(f"Re-subida con sha256: estado={again['status']} en {(time.perf_counter() - start) * 1000:.1f}ms, misma url={again['url'] == state['url']}")
+
+    print(f"RSS: inicial={baseline:.0f} MB pico={stats['peak_rss']:.0f} MB límite={args.max_rss_mb:.0f} MB")
+    if state["status"] != "complete" or again["status"] != "complete" or stats["peak_rss"] > args.max_rss_mb:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: autocompletado de usuarios por pulsación de tecla
+
+Siembra usuarios con perfil (por defecto un millón), carga el índice en memoria
+de app.services.user_search y mide prefijos de 1 a 5 caracteres como los que
+enviaría un cliente mientras se escribe: búsqueda solo en el índice, búsqueda
+completa (índice + lectura de los resultados por id) y consulta LIKE en la base.
+
+Uso:
+    python benchmarks/bench_user_search.py [--users 1000000] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import string
+import tempfile
+import time
+
+import common
+
+from sqlalchemy import insert
+
+from app.models.user_models import User, UserProfile
+from app.schemas.user_schemas import UserSearchFilters
+from app.services.user_search import search_users, user_index
+
+FIRST_NAMES = ["ana", "bruno", "carla", "diego", "elena", "fernando", "gloria", "hugo", "irene", "javier",
+               "lucía", "marcos", "nuria", "óscar", "paula", "raúl", "sara", "tomás", "valeria", "zoe"]
+LAST_NAMES = ["garcía", "martínez", "lópez", "sánchez", "pérez", "gómez", "martín", "jiménez", "ruiz", "díaz"]
+
+
+def random_username():
+    return "".join(random.choices(string.ascii_lowercase, k=random.randint(3, 8))) + str(random.randint(0, 9999))
+
+
+def seed(session_factory, total):
+    random.seed(5)
+    usernames = set()
+    while len(usernames) < total:
+        usernames.add(random_username()[:20])
+    with session_factory() as db:
+        batch = []
+        for user_id, username in enumerate(usernames, start=1):
+            batch.append({"id": user_id, "username": username, "email": f"{username}@example.com", "hashed_password": "x"})
+            if len(batch) == 10000:
+                db.execute(insert(User), batch)
+                batch = []
+        if batch:
+            db.execute(insert(User), batch)
+        db.execute(insert(UserProfile), [
+            {"user_id": user_id, "full_name": f"{random.choice(FIRST_NAMES).title()} {random.choice(LAST_NAMES).title()}"}
+            for user_id in range(1, total + 1)
+        ])
+        db.commit()
+    return sorted(usernames)
+
+
+def keystrokes(usernames, count):
+    # Prefijos crecientes de nombres existentes: "m", "ma", "mar", ...
+    prefixes = []
+    while len(prefixes) < count:
+        word = random.choice(usernames) if random.random() < 0.7 else random.choice(FIRST_NAMES + LAST_NAMES)
+        prefixes.extend(word[:n] for n in range(1, min(len(word), 5) + 1))
+    return prefixes[:count]
+
+
+def timed(func, prefixes):
+    samples = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        func(prefix)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench_user_search.db")
+    engine, session_factory = common.make_sqlite_sessionmaker(f"sqlite:///{path}")
+    usernames = seed(session_factory, args.users)
+    prefixes = keystrokes(usernames, args.queries)
+    filters = UserSearchFilters()
+
+    with session_factory() as db:
+        user_index.clear()
+        db_samples = timed(lambda p: search_users(db, p, filters, args.limit), prefixes[: max(1, args.queries // 10)])
+
+        start = time.perf_counter()
+        user_index.rebuild(db)
+        print(f"{len(user_index)} usuarios indexados en {time.perf_counter() - start:.1f}s")
+
+        common.summarize("índice en memoria", timed(lambda p: user_index.search(p, args.limit), prefixes))
+        common.summarize("índice + lectura por id", timed(lambda p: search_users(db, p, filters, args.limit), prefixes))
+        common.summarize("LIKE en la base de datos (sin índice cargado)", db_samples)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Utilidades compartidas por los benchmarks de Visart Backend
+"""
+
+import logging
+import os
+import sys
+import statistics
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Valores mínimos para que app.config.load_settings() funcione sin .env
+BENCH_ENV = {
+    "ENV": "development",
+    "DEBUG": "false",
+    "DATABASE_URL": "sqlite:///./bench.db",
+    "SECRET_KEY": "benchmark-secret-key-0123456789abcdef",
+    "ADMIN_EMAIL": "admin@example.com",
+    "LOG_LEVEL": "WARNING",
+    "TOKEN_EXPIRE_MINUTES": "30",
+    "SMTP_SERVER": "localhost",
+    "SMTP_PORT": "25",
+    "EMAIL_HOST": "localhost",
+    "EMAIL_PORT": "25",
+    "EMAIL_USER": "bench",
+    "EMAIL_PASS": "bench",
+    "ALLOWED_ORIGINS": "http://localhost",
+}
+for key, value in BENCH_ENV.items():
+    os.environ.setdefault(key, value)
+
+# Evitar que el log por petición de httpx distorsione las mediciones
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def make_sqlite_sessionmaker(url: str = "sqlite:///:memory:"):
+    """
+    Crea un engine SQLite con todas las tablas de app.db.base.Base
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    import app.models  # noqa: F401  (registra los modelos en Base)
+    import app.models.posts  # noqa: F401
+    from app.db.base import Base
+
+    engine = create_engine(
+        url,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    return engine, sessionmaker(autocommit=False, autoflush=False, bind=engine, expire_on_commit=False)
+
+
+def async_db_override(url: str):
+    """
+    Dependencia equivalente a app.db.session.get_async_db sobre la base `url` (SQLite en archivo)
+    """
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from app.db.session import to_async_url
+
+    factory = async_sessionmaker(create_async_engine(to_async_url(url), poolclass=NullPool), expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with factory() as db:
+            yield db
+
+    return override_get_async_db
+
+
+def percentile(values, pct: float) -> float:
+    """Percentil por rango más cercano (pct entre 0 y 100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(label: str, values_ms):
+    """Imprime media, p50 y p99 de una lista de latencias en milisegundos"""
+    if not values_ms:
+        print(f"{label}: sin muestras")
+        return
+    print(
+        f"{label}: n={len(values_ms)} "
+        f"media={statistics.mean(values_ms):.2f}ms "
+        f"p50={percentile(values_ms, 50):.2f}ms "
+        f"p99={percentile(values_ms, 99):.2f}ms"
+    )
@@ -1,27 +1,52 @@
 # tests/conftest.py
+import base64
+import hashlib
+import os
 import pytest
+import tempfile
 import uuid
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
+
+# bcrypt en el mismo proceso durante los tests (sin pool de procesos)
+os.environ.setdefault("PASSWORD_HASH_INLINE", "true")
+# Miniaturas generadas en el mismo proceso (sin pool de procesos)
+os.environ.setdefault("DERIVATIVE_INLINE", "true")
+# Cabecera X-SQL-Query-Count para comprobar el número de consultas por petición
+os.environ.setdefault("SQL_QUERY_COUNT_HEADER", "true")
 
 from app.main import app
 from app.database import Base, get_db
 from app.config import load_settings
+from app.db.base import Base as ModelsBase
+from app.db import session as db_session_module
+from app.services import assets, media_storage
+from app.services.identity_cache import identity_cache
+from app.services.like_counter import like_counter
+from app.services.user_search import user_index
+from app.services.response_cache import response_cache
+from app.models import User, UserProfile, UserFollows  # noqa: F401  (registra los modelos en Base)
+from app.models.posts import Post  # noqa: F401
 
-# Configuración de base de datos de prueba
-TEST_DATABASE_URL = "sqlite:///:memory:"
+# Configuración de base de datos de prueba: un archivo temporal, para que las
+# sesiones síncronas y las async (aiosqlite) vean los mismos datos
+TEST_DATABASE_DIR = tempfile.TemporaryDirectory()
+TEST_DATABASE_URL = f"sqlite:///{os.path.join(TEST_DATABASE_DIR.name, 'visart_legacy.db')}"
 
 engine = create_engine(
     TEST_DATABASE_URL,
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async_engine = create_async_engine(db_session_module.to_async_url(TEST_DATABASE_URL), poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 # Crear tablas de prueba
 Base.metadata.create_all(bind=engine)
+ModelsBase.metadata.create_all(bind=engine)
 
 def override_get_db():
     try:
@@ -30,12 +55,24 @@ def override_get_db():
     finally:
         db.close()
 
+async def override_get_async_db():
+    async with TestingAsyncSessionLocal() as db:
+        yield db
+
 app.dependency_overrides[get_db] = override_get_db
 
 @pytest.fixture(scope="function")
 def client():
-    with TestClient(app) as c:
-        yield c
+    # Las rutas usan get_db y get_async_db de app.db.session, no app.database.get_db
+    app.dependency_overrides[db_session_module.get_db] = override_get_db
+    app.dependency_overrides[db_session_module.get_async_db] = override_get_async_db
+    identity_cache.clear()
+    try:
+        with TestClient(app) as c:
+            yield c
+    finally:
+        app.dependency_overrides.pop(db_session_module.get_db, None)
+        app.dependency_overrides.pop(db_session_module.get_async_db, None)
 
 @pytest.fixture(scope="function")
 def test_user(client):
@@ -59,4 +96,105 @@ def auth_token(client, test_user):
     }
     response = client.post("/api/auth/token", data=login_data)
     assert response.status_code == 200
-    return response.json()["access_token"]
\ No newline at end of file
+    return response.json()["access_token"]
+
+@pytest.fixture(scope="function")
+def db_engine(tmp_path):
+    # Base SQLite en archivo temporal con las tablas de app.db.base.Base
+    url = f"sqlite:///{tmp_path / 'visart_test.db'}"
+    engine = create_engine(url, connect_args={"check_same_thread": False})
+    ModelsBase.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+@pytest.fixture(scope="function")
+def db_session(db_engine):
+    SessionForTests = sessionmaker(autocommit=False, autoflush=False, bind=db_engine, expire_on_commit=False)
+    db = SessionForTests()
+    try:
+        yield db
+    finally:
+        db.close()
+
+@pytest.fixture(scope="function")
+def api_client(db_engine):
+    # Cliente con get_db y get_async_db (app.db.session) apuntando a la misma base temporal
+    SessionForTests = sessionmaker(autocommit=False, autoflush=False, bind=db_engine, expire_on_commit=False)
+    async_engine = create_async_engine(
+        db_session_module.to_async_url(str(db_engine.url)), poolclass=NullPool
+    )
+    AsyncSessionForTests = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    def override_sync_db():
+        db = SessionForTests()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_async_db():
+        async with AsyncSessionForTests() as db:
+            yield db
+
+    app.dependency_overrides[db_session_module.get_db] = override_sync_db
+    app.dependency_overrides[db_session_module.get_async_db] = override_async_db
+    identity_cache.clear()
+    like_counter.bind = db_engine
+    user_index.bind = db_engine
+    user_index.clear()
+    response_cache.clear()
+    try:
+        with TestClient(app) as c:
+            yield c
+    finally:
+        app.dependency_overrides.pop(db_session_module.get_db, None)
+        app.dependency_overrides.pop(db_session_module.get_async_db, None)
+        like_counter.bind = None
+        user_index.bind = None
+        user_index.clear()
+
+def register_and_login(client, username=None, password="Testpassword123!"):
+    """Registra un usuario y devuelve (usuario, cabeceras Authorization)"""
+    username = username or f"user_{uuid.uuid4().hex[:8]}"
+    response = client.post(
+        "/api/auth/register",
+        json={"username": username, "email": f"{username}@example.com", "password": password},
+    )
+    assert response.status_code == 201, response.text
+    token = client.post("/api/auth/token", data={"username": username, "password": password})
+    assert token.status_code == 200, token.text
+    return response.json(), {"Authorization": f"Bearer {token.json()['access_token']}"}
+
+@pytest.fixture
+def media_root(tmp_path, monkeypatch):
+    """MEDIA_ROOT en un directorio temporal, sin ubicaciones de assets de otros tests"""
+    monkeypatch.setattr(media_storage, "MEDIA_ROOT", str(tmp_path / "media"))
+    assets.asset_locations.clear()
+    yield tmp_path / "media"
+    assets.asset_locations.clear()
+
+def upload_checksum(data: bytes) -> str:
+    """Cabecera Upload-Checksum de `data`"""
+    return "sha256 " + base64.b64encode(hashlib.sha256(data).digest()).decode()
+
+def start_upload(client, headers, data, filename="clip.mp4", media_type="video/mp4", **extra):
+    """Crea una subida del tamaño de `data` y devuelve su estado"""
+    body = {"filename": filename, "media_type": media_type, "size": len(data), **extra}
+    response = client.post("/api/uploads", json=body, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+def put_chunk(client, upload, offset, data, headers, checksum=None):
+    """Envía un fragmento de la subida (con su checksum, salvo que se indique otro)"""
+    return client.put(
+        upload["upload_url"],
+        content=data,
+        headers={**headers, "Upload-Offset": str(offset), "Upload-Checksum": checksum or upload_checksum(data)},
+    )
+
+def upload_file(client, headers, data, media_type="video/mp4"):
+    """Sube `data` en un único fragmento y devuelve la subida completada"""
+    upload = start_upload(client, headers, data, media_type=media_type)
+    done = put_chunk(client, upload, 0, data, headers)
+    assert done.status_code == 200, done.text
+    return done.json()
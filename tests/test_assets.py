@@ -0,0 +1,85 @@
+import hashlib
+import os
+
+import pytest
+
+from app.models.media_models import MediaAsset
+from app.services import assets, media_storage
+from tests.conftest import register_and_login, upload_file
+
+
+pytestmark = pytest.mark.usefixtures("media_root")
+
+
+@pytest.fixture
+def stored(api_client):
+    _, headers = register_and_login(api_client)
+    data = os.urandom(200_000)
+    url = upload_file(api_client, headers, data)["url"]
+    return data, url, f'"{hashlib.sha256(data).hexdigest()}"'
+
+
+def test_full_file_with_strong_etag_and_immutable_cache(api_client, stored):
+    data, url, etag = stored
+    response = api_client.get(url)
+    assert response.status_code == 200 and response.content == data
+    assert response.headers["etag"] == etag
+    assert response.headers["content-type"] == "video/mp4"
+    assert response.headers["accept-ranges"] == "bytes"
+    assert "immutable" in response.headers["cache-control"]
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.headers["content-security-policy"] == "default-src 'none'; sandbox"
+    assert "content-disposition" not in response.headers
+
+    revalidated = api_client.get(url, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304 and revalidated.content == b""
+    head = api_client.head(url)
+    assert head.status_code == 200 and head.headers["content-length"] == str(len(data))
+
+
+def test_range_requests(api_client, stored):
+    data, url, etag = stored
+    middle = api_client.get(url, headers={"Range": "bytes=1000-1999"})
+    assert middle.status_code == 206 and middle.content == data[1000:2000]
+    assert middle.headers["content-range"] == f"bytes 1000-1999/{len(data)}"
+
+    tail = api_client.get(url, headers={"Range": "bytes=-500"})
+    assert tail.status_code == 206 and tail.content == data[-500:]
+    assert api_client.get(url, headers={"Range": f"bytes={len(data)}-"}).status_code == 416
+
+    # If-Range con otro ETag: el fichero cambió para el cliente, se envía entero
+    stale = api_client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"otro"'})
+    assert stale.status_code == 200 and stale.content == data
+    fresh = api_client.get(url, headers={"Range": "bytes=0-9", "If-Range": etag})
+    assert fresh.status_code == 206 and fresh.content == data[:10]
+
+
+def test_unknown_assets_are_not_found(api_client, stored):
+    assert api_client.get("/api/assets/" + "0" * 64 + ".mp4").status_code == 404
+    assert api_client.get("/api/assets/no-es-un-hash").status_code == 404
+
+
+def test_accel_redirect_hands_the_file_to_the_proxy(api_client, stored, monkeypatch):
+    _, url, _ = stored
+    monkeypatch.setattr("app.routes.assets.ASSET_ACCEL_REDIRECT_PREFIX", "/internal-media/")
+    accel = api_client.get(url)
+    sha256 = url.rsplit("/", 1)[1].split(".")[0]
+    assert accel.content == b""
+    assert accel.headers["x-accel-redirect"] == f"/internal-media/{sha256[:2]}/{sha256[2:4]}/{sha256}.mp4"
+
+
+def test_types_outside_the_whitelist_are_served_as_downloads(api_client, db_session, media_root):
+    # Asset guardado antes de que las subidas solo admitieran imágenes rasterizadas y video
+    data = b'<svg xmlns="http://www.w3.org/2000/svg"><script>alert(1)</script></svg>'
+    sha256 = hashlib.sha256(data).hexdigest()
+    relative = assets.asset_relative_path(sha256, "image/svg+xml")
+    with open(media_storage.media_path(relative), "wb") as svg:
+        svg.write(data)
+    db_session.add(MediaAsset(sha256=sha256, size=len(data), media_type="image/svg+xml", path=relative))
+    db_session.commit()
+
+    response = api_client.get(f"/api/assets/{os.path.basename(relative)}")
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == "attachment"
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.headers["content-security-policy"].startswith("default-src 'none'")
@@ -0,0 +1,40 @@
+from app.db.session import to_async_url
+from tests.conftest import register_and_login
+
+
+def test_to_async_url_drivers():
+    assert to_async_url("postgresql://u:p@db:5432/visart") == "postgresql+asyncpg://u:p@db:5432/visart"
+    assert to_async_url("postgres://u:p@db/visart") == "postgresql+asyncpg://u:p@db/visart"
+    assert to_async_url("sqlite:///./visart.db") == "sqlite+aiosqlite:///./visart.db"
+
+
+def test_register_login_and_me_use_async_session(api_client):
+    user, headers = register_and_login(api_client)
+
+    response = api_client.get("/api/auth/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["username"] == user["username"]
+
+    response = api_client.get("/api/users/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["id"] == user["id"]
+
+
+def test_update_read_and_delete_user_me(api_client):
+    user, headers = register_and_login(api_client)
+
+    response = api_client.put("/api/users/me", json={"email": "nuevo@example.com"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["email"] == "nuevo@example.com"
+
+    response = api_client.get(f"/api/users/{user['id']}", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["email"] == "nuevo@example.com"
+
+    assert api_client.delete("/api/users/me", headers=headers).status_code == 204
+    assert api_client.get("/api/users/me", headers=headers).status_code == 401
+
+
+def test_health_checks_use_async_session(api_client):
+    path = api_client.app.url_path_for("health_check_db")
+    assert api_client.get(path).json()["database"] == "connected"
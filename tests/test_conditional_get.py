@@ -0,0 +1,98 @@
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+from app.models.posts import Post
+from app.services.like_counter import like_counter
+from tests.conftest import register_and_login
+
+
+def test_post_etag_returns_304_until_the_post_changes(api_client):
+    _, headers = register_and_login(api_client)
+    _, fan_headers = register_and_login(api_client)
+    post_id = api_client.post("/api/posts/", json={"title": "T", "content": "c"}, headers=headers).json()["id"]
+
+    first = api_client.get(f"/api/posts/{post_id}")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and "Last-Modified" not in first.headers
+
+    cached = api_client.get(f"/api/posts/{post_id}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and cached.content == b""
+    assert cached.headers["ETag"] == etag
+    # Solo la consulta de versión
+    assert int(cached.headers["X-SQL-Query-Count"]) == 1
+
+    # Un like (aún sin volcar) cambia la versión
+    api_client.post(f"/api/posts/{post_id}/like", headers=fan_headers)
+    changed = api_client.get(f"/api/posts/{post_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.json()["likes_count"] == 1
+    # El volcado del contador no cambia la versión: ni likes_count ni fecha_actualizacion
+    like_counter.flush()
+    flushed = api_client.get(f"/api/posts/{post_id}", headers={"If-None-Match": changed.headers["ETag"]})
+    assert flushed.status_code == 304
+    assert api_client.get(f"/api/posts/{post_id}").json()["updated_at"] == first.json()["updated_at"]
+
+    # El mismo recurso visto por otro usuario (is_liked) tiene otra versión
+    as_fan = api_client.get(f"/api/posts/{post_id}", headers={**fan_headers, "If-None-Match": changed.headers["ETag"]})
+    assert as_fan.status_code == 200 and as_fan.json()["is_liked"] is True
+
+    api_client.put(f"/api/posts/{post_id}", json={"title": "Nuevo"}, headers=headers)
+    assert api_client.get(f"/api/posts/{post_id}", headers={"If-None-Match": changed.headers["ETag"]}).status_code == 200
+    assert api_client.get("/api/posts/999999", headers={"If-None-Match": etag}).status_code == 404
+
+
+def since(dt):
+    return {"If-Modified-Since": format_datetime(dt.replace(tzinfo=timezone.utc), usegmt=True)}
+
+
+def test_posts_ignore_if_modified_since(api_client, db_session):
+    _, headers = register_and_login(api_client)
+    _, fan_headers = register_and_login(api_client)
+    post_id = api_client.post("/api/posts/", json={"title": "T", "content": "c"}, headers=headers).json()["id"]
+    post = db_session.get(Post, post_id)
+    post.fecha_actualizacion = datetime(2024, 1, 1, 12, 0, 0)
+    db_session.commit()
+
+    # Un like no cambia ninguna fecha: con solo If-Modified-Since se sirve la versión actual
+    api_client.post(f"/api/posts/{post_id}/like", headers=fan_headers)
+    like_counter.flush()
+    tomorrow = since(datetime.utcnow() + timedelta(days=1))
+    anonymous = api_client.get(f"/api/posts/{post_id}", headers=tomorrow)
+    assert anonymous.status_code == 200 and anonymous.json()["likes_count"] == 1
+    as_fan = api_client.get(f"/api/posts/{post_id}", headers={**fan_headers, **tomorrow})
+    assert as_fan.status_code == 200 and as_fan.json()["is_liked"] is True
+
+
+def test_if_modified_since_for_profiles(api_client, db_session):
+    _, headers = register_and_login(api_client)
+    me = api_client.get("/api/users/me", headers=headers)
+    assert me.status_code == 200 and me.headers["Cache-Control"] == "private, no-cache"
+    assert api_client.get("/api/users/me", headers={**headers, **since(datetime.utcnow() + timedelta(days=1))}).status_code == 304
+    assert api_client.get("/api/users/me", headers={**headers, **since(datetime(2023, 1, 1))}).status_code == 200
+    assert api_client.get("/api/users/me", headers={**headers, "If-None-Match": me.headers["ETag"]}).status_code == 304
+    assert api_client.get(
+        f"/api/users/{me.json()['id']}", headers={**headers, "If-None-Match": me.headers["ETag"]}
+    ).status_code == 304
+
+    api_client.put("/api/users/me", json={"email": "nuevo@example.com"}, headers=headers)
+    refreshed = api_client.get("/api/users/me", headers={**headers, "If-None-Match": me.headers["ETag"]})
+    assert refreshed.status_code == 200 and refreshed.json()["email"] == "nuevo@example.com"
+
+    # Sin permiso no se revela la versión de otro usuario
+    _, other_headers = register_and_login(api_client)
+    assert api_client.get(
+        f"/api/users/{me.json()['id']}", headers={**other_headers, "If-None-Match": "*"}
+    ).status_code == 403
+
+
+def test_counter_updates_keep_user_and_post_versions(api_client):
+    author, headers = register_and_login(api_client)
+    _, fan_headers = register_and_login(api_client)
+    post_id = api_client.post("/api/posts/", json={"title": "T", "content": "c"}, headers=headers).json()["id"]
+    me = api_client.get("/api/users/me", headers=headers)
+    post = api_client.get(f"/api/posts/{post_id}")
+
+    # Seguidores y publicaciones nuevas solo tocan los contadores del autor
+    api_client.post(f"/api/users/{author['id']}/follow", headers=fan_headers)
+    api_client.post("/api/posts/", json={"title": "Otra", "content": "c"}, headers=headers)
+    assert api_client.get("/api/users/me", headers={**headers, "If-None-Match": me.headers["ETag"]}).status_code == 304
+    assert api_client.get(f"/api/posts/{post_id}", headers={"If-None-Match": post.headers["ETag"]}).status_code == 304
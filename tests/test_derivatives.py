@@ -0,0 +1,124 @@
+import asyncio
+import io
+import os
+import shutil
+
+import pytest
+
+import app.jobs  # noqa: F401  (registra los handlers, como hace el worker)
+from app.schemas.post import PostResponse
+from app.schemas.user_schemas import UserProfileResponse
+from app.services import videos
+from app.services.derivatives import DerivativeGenerator, derivative_generator
+from app.services.job_queue import claim_jobs, run_job
+from tests.conftest import register_and_login, upload_file
+
+Image = pytest.importorskip("PIL.Image")
+
+
+pytestmark = pytest.mark.usefixtures("media_root")
+
+
+def upload(api_client, headers, data: bytes, media_type: str) -> str:
+    return upload_file(api_client, headers, data, media_type)["url"]
+
+
+def png(width: int, height: int) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGBA", (width, height), (200, 30, 30, 128)).save(output, "PNG")
+    return output.getvalue()
+
+
+def test_thumbnail_is_generated_once_and_cached(api_client, media_root):
+    _, headers = register_and_login(api_client)
+    url = upload(api_client, headers, png(1600, 900), "image/png")
+    sha256 = url.rsplit("/", 1)[1].split(".")[0]
+    thumb_url = f"/api/assets/{sha256}/thumb.jpg"
+
+    response = api_client.get(thumb_url)
+    assert response.status_code == 200 and response.headers["content-type"] == "image/jpeg"
+    assert "immutable" in response.headers["cache-control"]
+    assert Image.open(io.BytesIO(response.content)).size == (320, 180)
+    cached = media_root / "derivatives" / "v1" / sha256[:2] / f"{sha256}-thumb.jpg"
+    assert cached.read_bytes() == response.content
+
+    generated = derivative_generator.generated
+    assert api_client.get(thumb_url).content == response.content
+    assert derivative_generator.generated == generated
+    revalidated = api_client.get(thumb_url, headers={"If-None-Match": response.headers["etag"]})
+    assert revalidated.status_code == 304
+
+
+def test_avatar_sizes_are_cropped_square(api_client):
+    _, headers = register_and_login(api_client)
+    url = upload(api_client, headers, png(300, 200), "image/png")
+    profile = UserProfileResponse.model_validate({
+        "id": 1, "user_id": 1, "avatar_url": url, "email_notifications": True,
+        "fecha_creacion": "2024-01-01T00:00:00", "fecha_actualizacion": "2024-01-01T00:00:00",
+    }).model_dump()
+    assert sorted(profile["avatar_urls"]) == ["128", "256", "64"]
+    for size, avatar_url in profile["avatar_urls"].items():
+        response = api_client.get(avatar_url)
+        assert Image.open(io.BytesIO(response.content)).size == (int(size), int(size))
+
+
+def test_video_poster_is_rendered_with_the_job(api_client, db_session):
+    _, headers = register_and_login(api_client)
+    job = api_client.post("/api/videos", json={"prompt": "faro", "duration_seconds": 1}, headers=headers).json()
+    for claimed in claim_jobs(db_session, "test-worker", kinds=[videos.VIDEO_JOB_KIND]):
+        assert run_job(db_session, claimed)
+    post_id = api_client.get(job["status_url"], headers=headers).json()["post_id"]
+
+    post = api_client.get(f"/api/posts/{post_id}", headers=headers).json()
+    sha256 = post["video_url"].rsplit("/", 1)[1].split(".")[0]
+    assert post["poster_url"] == f"/api/assets/{sha256}/poster.jpg"
+    assert post["thumbnail_url"] == f"/api/assets/{sha256}/thumb.jpg"
+    generated = derivative_generator.generated
+    poster = api_client.get(post["poster_url"])
+    assert poster.status_code == 200
+    assert Image.open(io.BytesIO(poster.content)).size == (videos.VIDEO_WIDTH, videos.VIDEO_HEIGHT)
+    assert derivative_generator.generated == generated
+
+
+def test_urls_only_for_own_assets():
+    fields = {"id": 1, "title": "t", "content": "c", "owner_id": 1, "created_at": "2024-01-01T00:00:00",
+              "updated_at": "2024-01-01T00:00:00", "owner": {"id": 1, "username": "autora"}}
+    external = PostResponse.model_validate({**fields, "image_url": "https://example.com/a.png"}).model_dump()
+    assert external["thumbnail_url"] is None and external["poster_url"] is None
+    image = PostResponse.model_validate({**fields, "image_url": "/api/assets/" + "a" * 64 + ".png"}).model_dump()
+    assert image["thumbnail_url"] == "/api/assets/" + "a" * 64 + "/thumb.jpg"
+    assert image["poster_url"] is None and image["owner"]["avatar_urls"] is None
+
+
+def test_unsupported_sources_and_variants_are_not_found(api_client):
+    _, headers = register_and_login(api_client)
+    url = upload(api_client, headers, os.urandom(1000), "video/mp4")
+    sha256 = url.rsplit("/", 1)[1].split(".")[0]
+    assert api_client.get(f"/api/assets/{sha256}/gigante.jpg").status_code == 404
+    assert api_client.get("/api/assets/" + "0" * 64 + "/thumb.jpg").status_code == 404
+    # Video que no es Y4M y sin ffmpeg en el entorno de tests: no hay portada
+    if shutil.which("ffmpeg") is None:
+        assert api_client.get(f"/api/assets/{sha256}/poster.jpg").status_code == 404
+
+
+def test_concurrent_requests_share_one_generation(tmp_path, media_root):
+    source = tmp_path / "origen.png"
+    source.write_bytes(png(64, 64))
+    generator = DerivativeGenerator(inline=True)
+    calls = []
+
+    async def slow_submit(func, *args):
+        calls.append(args)
+        await asyncio.sleep(0.05)
+        return func(*args)
+
+    generator.pool.submit = slow_submit
+
+    async def request_many():
+        return await asyncio.gather(*(
+            generator.ensure("b" * 64, str(source), "image/png", "thumb") for _ in range(10)
+        ))
+
+    paths = asyncio.run(request_many())
+    assert len(set(paths)) == 1 and os.path.exists(paths[0])
+    assert len(calls) == 1 and generator.stats()["shared"] == 9
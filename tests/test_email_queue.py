@@ -0,0 +1,127 @@
+import asyncio
+import smtplib
+
+import pytest
+
+from app.services.email_queue import EmailQueue, smtp_connector
+
+
+class FakeSMTP:
+    """Conexión SMTP en memoria; `failures` decide el error de cada destinatario"""
+
+    def __init__(self, server):
+        self.server = server
+        self.closed = False
+
+    def send_message(self, message):
+        error = self.server.failures.get(message["To"])
+        if error is not None:
+            if isinstance(error, list):
+                error = error.pop(0) if error else None
+            if error is not None:
+                raise error
+        self.server.delivered.append(message["To"])
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+class FakeServer:
+    def __init__(self, failures=None):
+        self.failures = failures or {}
+        self.delivered = []
+        self.connections = []
+
+    def connect(self):
+        connection = FakeSMTP(self)
+        self.connections.append(connection)
+        return connection
+
+
+def run_queue(queue, send):
+    async def run():
+        queue.start()
+        send()
+        assert await queue.join(timeout=5)
+        await queue.stop()
+    asyncio.run(run())
+
+
+def test_messages_share_persistent_connections():
+    server = FakeServer()
+    queue = EmailQueue(connect=server.connect, sender="noreply@visart.test", pool_size=2, batch_size=10)
+
+    run_queue(queue, lambda: [queue.enqueue(f"u{i}@example.com", "Hola", "cuerpo") for i in range(50)])
+
+    assert sorted(server.delivered) == sorted(f"u{i}@example.com" for i in range(50))
+    assert 1 <= len(server.connections) <= 2
+    assert all(connection.closed for connection in server.connections)
+    stats = queue.stats()
+    assert stats["sent"] == 50 and stats["connections_opened"] == len(server.connections)
+    assert stats["queued"] == 0 and stats["workers"] == 0
+
+
+def test_temporary_failures_retry_and_permanent_go_to_dead_letters():
+    server = FakeServer({
+        "flaky@example.com": [smtplib.SMTPServerDisconnected("caída"), smtplib.SMTPDataError(451, b"luego")],
+        "bad@example.com": smtplib.SMTPRecipientsRefused({"bad@example.com": (550, b"no existe")}),
+        "down@example.com": [smtplib.SMTPDataError(421, b"ocupado")] * 10,
+    })
+    queue = EmailQueue(connect=server.connect, sender="noreply@visart.test", pool_size=1,
+                       max_retries=2, retry_base_seconds=0.01)
+
+    def send():
+        for to in ("flaky@example.com", "bad@example.com", "down@example.com", "ok@example.com"):
+            queue.enqueue(to, "Asunto", "cuerpo")
+
+    run_queue(queue, send)
+
+    assert sorted(server.delivered) == ["flaky@example.com", "ok@example.com"]
+    dead = {letter.message["To"]: letter for letter in queue.dead_letters()}
+    assert dead["bad@example.com"].attempts == 1
+    assert dead["down@example.com"].attempts == 3
+    # La conexión que se cayó se sustituyó por otra
+    assert len(server.connections) == 2
+
+    server.failures.clear()
+    assert queue.retry_dead_letters() == 2
+    run_queue(queue, lambda: None)
+    assert sorted(server.delivered) == ["bad@example.com", "down@example.com", "flaky@example.com", "ok@example.com"]
+
+
+def test_full_queue_rejects_without_blocking():
+    queue = EmailQueue(connect=FakeServer().connect, sender="noreply@visart.test", max_size=2)
+    assert queue.enqueue("a@example.com", "s", "b") and queue.enqueue("b@example.com", "s", "b")
+    assert queue.enqueue("c@example.com", "s", "b") is False
+    assert queue.stats()["rejected"] == 1
+
+
+def test_delivery_through_local_smtp_server():
+    pytest.importorskip("aiosmtpd")
+    from aiosmtpd.controller import Controller
+
+    class Handler:
+        def __init__(self):
+            self.recipients = []
+
+        async def handle_DATA(self, server, session, envelope):
+            self.recipients.extend(envelope.rcpt_tos)
+            return "250 OK"
+
+    handler = Handler()
+    controller = Controller(handler, hostname="127.0.0.1", port=0)
+    controller.start()
+    try:
+        port = controller.server.sockets[0].getsockname()[1]
+        queue = EmailQueue(
+            connect=smtp_connector("127.0.0.1", port, starttls=False), sender="noreply@visart.test", pool_size=2
+        )
+        run_queue(queue, lambda: [queue.enqueue(f"u{i}@example.com", "Hola", "cuerpo") for i in range(20)])
+    finally:
+        controller.stop()
+
+    assert sorted(handler.recipients) == sorted(f"u{i}@example.com" for i in range(20))
+    assert queue.stats()["connections_opened"] <= 2
@@ -0,0 +1,108 @@
+import pytest
+
+import app.jobs  # noqa: F401  (registra los handlers, como hace el worker)
+from app.models.feed_models import TimelineEntry
+from app.services import feed
+from app.services.job_queue import claim_jobs, run_job
+from tests.conftest import register_and_login
+
+
+@pytest.fixture(autouse=True)
+def reset_celebrity_cache():
+    feed.reset_celebrity_cache()
+    yield
+    feed.reset_celebrity_cache()
+
+
+def create_post(client, headers, title):
+    response = client.post("/api/posts/", json={"title": title, "content": "c"}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def feed_titles(client, headers, **params):
+    response = client.get("/api/feed", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return [p["title"] for p in response.json()["posts"]], response.json()["next_cursor"]
+
+
+def test_fanout_on_write_and_delete(api_client, db_session):
+    author, author_headers = register_and_login(api_client)
+    _, reader_headers = register_and_login(api_client)
+
+    create_post(api_client, author_headers, "antes de seguir")
+    assert api_client.post(f"/api/users/{author['id']}/follow", headers=reader_headers).status_code == 201
+    post = create_post(api_client, author_headers, "después de seguir")
+
+    assert feed_titles(api_client, reader_headers)[0] == ["después de seguir", "antes de seguir"]
+
+    assert api_client.delete(f"/api/posts/{post['id']}", headers=author_headers).status_code == 204
+    assert feed_titles(api_client, reader_headers)[0] == ["antes de seguir"]
+    assert db_session.query(TimelineEntry).filter_by(post_id=post["id"]).count() == 0
+
+    assert api_client.delete(f"/api/users/{author['id']}/follow", headers=reader_headers).status_code == 204
+    assert feed_titles(api_client, reader_headers)[0] == []
+
+
+def test_celebrity_posts_are_merged_at_read_time(api_client, db_session, monkeypatch):
+    monkeypatch.setattr(feed, "FEED_CELEBRITY_THRESHOLD", 0)
+    celebrity, celebrity_headers = register_and_login(api_client)
+    regular, regular_headers = register_and_login(api_client)
+    _, reader_headers = register_and_login(api_client)
+    api_client.post(f"/api/users/{celebrity['id']}/follow", headers=reader_headers)
+    api_client.post(f"/api/users/{regular['id']}/follow", headers=reader_headers)
+    feed.reset_celebrity_cache()
+
+    create_post(api_client, celebrity_headers, "c1")
+    create_post(api_client, regular_headers, "r1")
+    create_post(api_client, celebrity_headers, "c2")
+
+    # Nadie recibe copias de las publicaciones de autores celebridad
+    assert db_session.query(TimelineEntry).filter_by(author_id=celebrity["id"]).count() == 2
+
+    titles, cursor = feed_titles(api_client, reader_headers, limit=2)
+    assert titles == ["c2", "r1"]
+    assert feed_titles(api_client, reader_headers, limit=2, cursor=cursor) == (["c1"], None)
+
+
+def test_fanout_strategy_thresholds(monkeypatch):
+    monkeypatch.setattr(feed, "FEED_BACKGROUND_FANOUT_THRESHOLD", 10)
+    monkeypatch.setattr(feed, "FEED_CELEBRITY_THRESHOLD", 100)
+    assert feed.fanout_strategy(10) == feed.FANOUT_INLINE
+    assert feed.fanout_strategy(11) == feed.FANOUT_BACKGROUND
+    assert feed.fanout_strategy(101) == feed.FANOUT_PULL
+
+
+def test_background_fanout_reaches_followers(api_client, db_session, monkeypatch):
+    monkeypatch.setattr(feed, "FEED_BACKGROUND_FANOUT_THRESHOLD", 0)
+    author, author_headers = register_and_login(api_client)
+    _, reader_headers = register_and_login(api_client)
+    api_client.post(f"/api/users/{author['id']}/follow", headers=reader_headers)
+
+    create_post(api_client, author_headers, "en segundo plano")
+    draft = api_client.post("/api/posts/", json={"title": "borrador", "content": "c", "is_published": False},
+                            headers=author_headers).json()
+    api_client.put(f"/api/posts/{draft['id']}", json={"is_published": True}, headers=author_headers)
+    # Hasta que un worker procese los trabajos "feed.fan_out" no llegan al seguidor
+    assert feed_titles(api_client, reader_headers)[0] == []
+
+    jobs = claim_jobs(db_session, "test-worker", limit=10, kinds=["feed.fan_out"])
+    assert len(jobs) == 2 and draft["id"] in {job.payload["post_id"] for job in jobs}
+    for job in jobs:
+        assert run_job(db_session, job)
+    assert feed_titles(api_client, reader_headers)[0] == ["borrador", "en segundo plano"]
+
+
+def test_fanout_skips_entries_already_in_the_timeline(api_client, db_engine, db_session, monkeypatch):
+    monkeypatch.setattr(feed, "FEED_FANOUT_BATCH_SIZE", 1)
+    author, author_headers = register_and_login(api_client)
+    post = create_post(api_client, author_headers, "repetida")
+    readers = [register_and_login(api_client) for _ in range(3)]
+    # El follow copia la publicación antes de que llegue el fan-out
+    for _, reader_headers in readers:
+        api_client.post(f"/api/users/{author['id']}/follow", headers=reader_headers)
+
+    feed.fan_out_post_in_background(db_engine, post["id"])
+    feed.fan_out_post_in_background(db_engine, post["id"])
+    for reader, _ in readers:
+        assert db_session.query(TimelineEntry).filter_by(user_id=reader["id"], post_id=post["id"]).count() == 1
@@ -0,0 +1,53 @@
+import time
+
+from app.services.identity_cache import AuthIdentity, IdentityCache, identity_cache
+from tests.conftest import register_and_login
+
+
+def make_identity(user_id=1, username="ana", is_active=True):
+    return AuthIdentity(id=user_id, username=username, is_active=is_active, is_admin=False)
+
+
+def test_hits_misses_and_ttl_expiry():
+    cache = IdentityCache(ttl_seconds=0.05, max_size=10)
+    assert cache.get("ana") is None
+    cache.put(make_identity())
+    assert cache.get("ana").id == 1
+    time.sleep(0.06)
+    assert cache.get("ana") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_lru_eviction_and_invalidation_by_id():
+    cache = IdentityCache(ttl_seconds=60, max_size=2)
+    cache.put(make_identity(1, "ana"))
+    cache.put(make_identity(2, "beto"))
+    cache.get("ana")
+    cache.put(make_identity(3, "carla"))
+    assert cache.get("beto") is None
+    assert cache.stats()["evictions"] == 1
+
+    cache.invalidate(user_id=1)
+    assert cache.get("ana") is None
+    assert cache.get("carla") is not None
+
+
+def test_authenticated_requests_reuse_cached_identity(api_client):
+    user, headers = register_and_login(api_client)
+    api_client.get(f"/api/users/{user['id']}", headers=headers)
+    misses = identity_cache.stats()["misses"]
+
+    for _ in range(3):
+        assert api_client.get(f"/api/users/{user['id']}", headers=headers).status_code == 200
+    assert identity_cache.stats()["misses"] == misses
+
+
+def test_delete_user_me_invalidates_cache(api_client):
+    user, headers = register_and_login(api_client)
+    assert api_client.get(f"/api/users/{user['id']}", headers=headers).status_code == 200
+    assert identity_cache.get(user["username"]) is not None
+
+    assert api_client.delete("/api/users/me", headers=headers).status_code == 204
+    assert identity_cache.get(user["username"]) is None
+    assert api_client.get(f"/api/users/{user['id']}", headers=headers).status_code == 401
@@ -41,7 +41,7 @@ def test_create_post():
 def test_get_posts():
     response = client.get("/api/posts/")  # ✅ Cambiado a /api/posts/
     assert response.status_code == 200
-    assert isinstance(response.json(), list)
+    assert isinstance(response.json()["posts"], list)
 
 def test_get_single_post():
     # Primero crear un post
@@ -0,0 +1,132 @@
+from datetime import datetime
+
+from app.models.job_models import Job
+from app.services.job_queue import (
+    JOB_HANDLERS, claim_jobs, enqueue_job, fail_job, job_handler, reap_expired_jobs, run_job
+)
+from app.worker import run_workers
+from tests.conftest import register_and_login
+
+
+@job_handler("test.echo")
+def echo(ctx):
+    assert ctx.report_progress(50)
+    if ctx.payload.get("fail"):
+        raise RuntimeError("fallo a propósito")
+    return {"echo": ctx.payload["value"]}
+
+
+@job_handler("test.after_commit")
+def after_commit(ctx):
+    ctx.after_commit(committed.append, ctx.job.id)
+    if ctx.payload.get("fail"):
+        raise RuntimeError("fallo a propósito")
+
+
+committed = []
+
+
+def test_claims_by_priority_and_records_result(db_session):
+    low = enqueue_job(db_session, "test.echo", {"value": "baja"})
+    high = enqueue_job(db_session, "test.echo", {"value": "alta"}, priority=10)
+    db_session.commit()
+
+    [job] = claim_jobs(db_session, "w1")
+    assert job.id == high.id and job.attempts == 1
+    # Reclamado: otro worker recibe el siguiente
+    [other] = claim_jobs(db_session, "w2")
+    assert other.id == low.id
+    assert claim_jobs(db_session, "w3") == []
+
+    assert run_job(db_session, job)
+    db_session.expire_all()
+    stored = db_session.get(Job, high.id)
+    assert (stored.status, stored.progress, stored.result) == ("succeeded", 100, {"echo": "alta"})
+    assert stored.lock_token is None and stored.finished_at is not None
+
+
+def test_failures_are_retried_with_backoff_until_max_attempts(db_session):
+    job_id = enqueue_job(db_session, "test.echo", {"fail": True}, max_attempts=2).id
+    db_session.commit()
+
+    [job] = claim_jobs(db_session, "w1")
+    assert not run_job(db_session, job)
+    db_session.expire_all()
+    stored = db_session.get(Job, job_id)
+    assert stored.status == "queued" and stored.run_after > datetime.utcnow()
+    assert "fallo a propósito" in stored.error
+    # Todavía en backoff
+    assert claim_jobs(db_session, "w1") == []
+
+    stored.run_after = datetime.utcnow()
+    db_session.commit()
+    [job] = claim_jobs(db_session, "w1")
+    assert job.attempts == 2
+    assert not run_job(db_session, job)
+    db_session.expire_all()
+    assert db_session.get(Job, job_id).status == "failed"
+
+
+def test_expired_visibility_timeout_lets_another_worker_take_over(db_session):
+    job_id = enqueue_job(db_session, "test.echo", {"value": 1}, max_attempts=2).id
+    db_session.commit()
+
+    # El primer worker "muere": su plazo ya venció
+    [stale] = claim_jobs(db_session, "w1", visibility_timeout=-1)
+    [job] = claim_jobs(db_session, "w2", visibility_timeout=-1)
+    assert job.id == stale.id and job.attempts == 2
+    # El primer worker ya no puede cerrar el trabajo
+    assert not fail_job(db_session, stale, "tarde")
+    # Sin intentos restantes y con el plazo vencido: fallido
+    assert reap_expired_jobs(db_session) == 1
+    db_session.expire_all()
+    assert db_session.get(Job, job_id).status == "failed"
+
+
+def test_unknown_kind_fails_without_retry(db_session):
+    job_id = enqueue_job(db_session, "test.desconocido").id
+    db_session.commit()
+    assert "test.desconocido" not in JOB_HANDLERS
+    [job] = claim_jobs(db_session, "w1")
+    assert not run_job(db_session, job)
+    db_session.expire_all()
+    assert db_session.get(Job, job_id).status == "failed"
+
+
+def test_after_commit_callbacks_run_only_for_committed_jobs(db_session):
+    committed.clear()
+    ok = enqueue_job(db_session, "test.after_commit").id
+    failing = enqueue_job(db_session, "test.after_commit", {"fail": True}).id
+    db_session.commit()
+
+    for job in claim_jobs(db_session, "w1", limit=2):
+        run_job(db_session, job)
+    assert committed == [ok] and failing not in committed
+
+
+def test_worker_processes_run_each_job_once(db_engine, db_session):
+    ids = [enqueue_job(db_session, "user_stats.reconcile").id for _ in range(12)]
+    db_session.commit()
+
+    run_workers(str(db_engine.url), processes=2, poll_interval=0.05, exit_when_idle=True)
+
+    db_session.expire_all()
+    jobs = db_session.query(Job).filter(Job.id.in_(ids)).all()
+    assert {(job.status, job.attempts) for job in jobs} == {("succeeded", 1)}
+    assert len({job.locked_by for job in jobs}) <= 2
+
+
+def test_job_status_endpoints_are_owner_only(api_client, db_session):
+    owner, owner_headers = register_and_login(api_client)
+    _, other_headers = register_and_login(api_client)
+    job_id = enqueue_job(db_session, "test.echo", {"value": 1}, owner_id=owner["id"]).id
+    db_session.commit()
+
+    response = api_client.get(f"/api/jobs/{job_id}", headers=owner_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "queued" and response.json()["progress"] == 0
+    assert api_client.get(f"/api/jobs/{job_id}", headers=other_headers).status_code == 404
+
+    listing = api_client.get("/api/jobs", params={"status": "queued"}, headers=owner_headers).json()
+    assert [job["id"] for job in listing["jobs"]] == [job_id]
+    assert api_client.get("/api/jobs", headers=other_headers).json()["jobs"] == []
@@ -0,0 +1,67 @@
+from app.models.posts import Post
+from app.services.like_counter import LikeCounterBuffer, like_counter, reconcile_likes_count
+from tests.conftest import register_and_login
+
+
+def create_post(client, headers):
+    response = client.post("/api/posts/", json={"title": "T", "content": "c"}, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def test_like_and_unlike_update_counter_after_flush(api_client, db_session):
+    author, author_headers = register_and_login(api_client)
+    post_id = create_post(api_client, author_headers)
+    fans = [register_and_login(api_client)[1] for _ in range(3)]
+
+    for headers in fans:
+        response = api_client.post(f"/api/posts/{post_id}/like", headers=headers)
+        assert response.status_code == 201, response.text
+        assert response.json()["post_id"] == post_id
+    assert api_client.post(f"/api/posts/{post_id}/like", headers=fans[0]).status_code == 400
+    assert api_client.delete(f"/api/posts/{post_id}/like", headers=fans[1]).status_code == 204
+    assert api_client.delete(f"/api/posts/{post_id}/like", headers=fans[1]).status_code == 404
+    assert api_client.post("/api/posts/999999/like", headers=fans[0]).status_code == 404
+
+    # El detalle suma los deltas pendientes de volcar
+    detail = api_client.get(f"/api/posts/{post_id}", headers=fans[0]).json()
+    assert detail["likes_count"] == 2
+    assert detail["is_liked"] is True
+    assert api_client.get(f"/api/posts/{post_id}", headers=fans[1]).json()["is_liked"] is False
+    assert api_client.get(f"/api/posts/{post_id}").json()["is_liked"] is False
+
+    like_counter.flush()
+    assert db_session.get(Post, post_id).likes_count == 2
+    assert api_client.get(f"/api/posts/{post_id}").json()["likes_count"] == 2
+
+
+def test_flush_coalesces_deltas_into_one_row_per_post(db_engine, db_session):
+    db_session.add_all([Post(id=1, title="a", content="c", owner_id=1), Post(id=2, title="b", content="c", owner_id=1)])
+    db_session.commit()
+
+    buffer = LikeCounterBuffer(bind=db_engine)
+    for _ in range(500):
+        buffer.add(1, 1)
+    buffer.add(1, -1)
+    buffer.add(2, 1)
+    buffer.add(2, -1)
+
+    assert buffer.flush() == 1
+    assert buffer.flush() == 0
+    db_session.expire_all()
+    assert db_session.get(Post, 1).likes_count == 499
+    assert db_session.get(Post, 2).likes_count == 0
+    assert buffer.stats()["rows_written"] == 1
+
+
+def test_reconcile_recounts_from_likes_table(api_client, db_session):
+    author, author_headers = register_and_login(api_client)
+    post_id = create_post(api_client, author_headers)
+    api_client.post(f"/api/posts/{post_id}/like", headers=author_headers)
+    like_counter.flush()
+
+    db_session.query(Post).update({Post.likes_count: 40})
+    db_session.commit()
+    assert reconcile_likes_count(db_session, post_id) == 1
+    db_session.expire_all()
+    assert db_session.get(Post, post_id).likes_count == 1
@@ -0,0 +1,192 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.security import create_access_token
+from app.services.notifications import CLOSE_TRY_AGAIN_LATER, NotificationHub, notification_hub
+from tests.conftest import register_and_login
+
+
+def token_of(headers: dict) -> str:
+    return headers["Authorization"].split(" ", 1)[1]
+
+
+def test_connection_requires_a_valid_token(api_client):
+    for url in ("/ws/notifications", "/ws/notifications?token=no-es-un-jwt"):
+        with pytest.raises(WebSocketDisconnect) as rejected:
+            with api_client.websocket_connect(url):
+                pass
+        assert rejected.value.code == 1008
+
+
+def test_connection_is_closed_when_the_token_expires(api_client):
+    user, _ = register_and_login(api_client)
+    token = create_access_token({"sub": user["username"]}, expires_delta=timedelta(seconds=2))
+    started = time.monotonic()
+    with api_client.websocket_connect(f"/ws/notifications?token={token}") as socket:
+        with pytest.raises(WebSocketDisconnect) as closed:
+            socket.receive_json()
+    assert closed.value.code == 1008 and time.monotonic() - started < 5
+    assert notification_hub.stats()["connections"] == 0
+
+
+@pytest.mark.parametrize("deactivate", [
+    lambda client, headers: client.delete("/api/users/me", headers=headers),
+    lambda client, headers: client.put("/api/users/me", json={"is_active": False}, headers=headers),
+])
+def test_deactivating_the_account_closes_its_connections(api_client, deactivate):
+    _, headers = register_and_login(api_client)
+    _, other_headers = register_and_login(api_client)
+    with api_client.websocket_connect("/ws/notifications", headers=headers) as socket, \
+            api_client.websocket_connect("/ws/notifications", headers=other_headers) as other_socket:
+        assert deactivate(api_client, headers).status_code in (200, 204)
+        with pytest.raises(WebSocketDisconnect) as closed:
+            socket.receive_json()
+        assert closed.value.code == 1008
+        assert notification_hub.stats()["connections"] == 1
+        other_socket.close()
+
+
+def test_follower_and_like_events(api_client):
+    author, author_headers = register_and_login(api_client)
+    fan, fan_headers = register_and_login(api_client)
+    post = api_client.post("/api/posts/", json={"title": "t", "content": "c"}, headers=author_headers).json()
+
+    with api_client.websocket_connect(f"/ws/notifications?token={token_of(author_headers)}") as socket:
+        assert api_client.post(f"/api/users/{author['id']}/follow", headers=fan_headers).status_code == 201
+        event = socket.receive_json()
+        assert event["type"] == "follower"
+        assert (event["user_id"], event["username"]) == (fan["id"], fan["username"])
+
+        # Sus propios likes no se notifican
+        assert api_client.post(f"/api/posts/{post['id']}/like", headers=author_headers).status_code == 201
+        assert api_client.post(f"/api/posts/{post['id']}/like", headers=fan_headers).status_code == 201
+        event = socket.receive_json()
+        assert (event["type"], event["post_id"], event["user_id"]) == ("like", post["id"], fan["id"])
+    assert notification_hub.stats()["connections"] == 0
+
+
+def test_new_posts_reach_connected_followers(api_client):
+    author, author_headers = register_and_login(api_client)
+    follower, follower_headers = register_and_login(api_client)
+    _, stranger_headers = register_and_login(api_client)
+    api_client.post(f"/api/users/{author['id']}/follow", headers=follower_headers)
+
+    # El seguidor con la cabecera Authorization; el otro usuario por ?token=
+    with api_client.websocket_connect("/ws/notifications", headers=follower_headers) as follower_socket, \
+            api_client.websocket_connect(f"/ws/notifications?token={token_of(stranger_headers)}") as stranger_socket:
+        api_client.post("/api/posts/", json={"title": "borrador", "content": "c", "is_published": False},
+                        headers=author_headers)
+        post = api_client.post("/api/posts/", json={"title": "hola", "content": "c"}, headers=author_headers).json()
+        event = follower_socket.receive_json()
+        assert (event["type"], event["post_id"], event["author_id"], event["title"]) == (
+            "post", post["id"], author["id"], "hola"
+        )
+        assert notification_hub.stats()["users"] == 2
+        stranger_socket.close()
+    assert notification_hub.stats()["fanouts"] >= 1
+
+
+def test_fan_out_in_batches_from_either_side(db_engine, db_session):
+    from app.models.user_models import User, UserFollows
+
+    users = [User(username=f"u{i}", email=f"u{i}@example.com", hashed_password="x") for i in range(8)]
+    db_session.add_all(users)
+    db_session.flush()
+    author = users[0]
+    followers = [user.id for user in users[1:6]]
+    db_session.add_all(UserFollows(follower_id=follower_id, followed_id=author.id) for follower_id in followers)
+    author.follower_count = len(followers)
+    db_session.commit()
+
+    hub = NotificationHub(batch_size=2)
+    hub._channels = {user.id: {object()} for user in users}
+    delivered = []
+    hub.publish_many = lambda user_ids, message: delivered.append(list(user_ids)) or len(user_ids)
+
+    # Más conectados que seguidores: se recorren los seguidores
+    assert hub.notify_followers(db_engine, author.id, "{}") == 5
+    assert sorted(sum(delivered, [])) == followers and all(len(batch) <= 2 for batch in delivered)
+
+    # Menos conectados que seguidores: se consultan solo los conectados
+    delivered.clear()
+    hub._channels = {user_id: {object()} for user_id in (author.id, followers[0], followers[3], users[7].id)}
+    assert hub.notify_followers(db_engine, author.id, "{}") == 2
+    assert sorted(sum(delivered, [])) == [followers[0], followers[3]]
+
+
+class StalledSocket:
+    """Cliente que deja de leer: cada envío se queda esperando"""
+
+    def __init__(self):
+        self.sent = []
+        self.closed_with = None
+
+    async def send_text(self, message):
+        self.sent.append(message)
+        await asyncio.Event().wait()
+
+    async def close(self, code=1000, reason=None):
+        self.closed_with = code
+
+
+def test_slow_consumers_are_evicted():
+    async def scenario():
+        hub = NotificationHub(queue_size=3, send_timeout=30)
+        hub.start()
+        slow, healthy = StalledSocket(), StalledSocket()
+        hub.subscribe(1, slow)
+        hub.subscribe(2, healthy)
+        hub.publish(1, "m0")
+        hub.publish(2, "m0")
+        await asyncio.sleep(0.01)
+        for index in range(1, 5):
+            hub.publish(1, f"m{index}")
+        await asyncio.sleep(0.01)
+        return hub, slow, healthy
+
+    hub, slow, healthy = asyncio.run(scenario())
+    # En la cola caben tres (contando el que está en envío): con el cuarto se cierra con 1013
+    assert slow.sent == ["m0"] and slow.closed_with == CLOSE_TRY_AGAIN_LATER
+    assert healthy.closed_with is None
+    assert hub.stats()["evicted"] == 1 and hub.connected_user_ids() == {2}
+
+
+class ReadingSocket(StalledSocket):
+    async def send_text(self, message):
+        self.sent.append(message)
+
+
+def test_a_stalled_client_does_not_hold_up_its_batch():
+    async def scenario():
+        hub = NotificationHub(send_timeout=30, stall_seconds=0.01)
+        hub.start()
+        stalled, reading = StalledSocket(), ReadingSocket()
+        hub.subscribe(1, stalled)
+        hub.subscribe(2, reading)
+        hub.publish_many([1, 2], "m0")
+        await asyncio.sleep(0.05)
+        hub.publish_many([1, 2], "m1")
+        await asyncio.sleep(0.01)
+        return hub, stalled, reading
+
+    hub, stalled, reading = asyncio.run(scenario())
+    assert reading.sent == ["m0", "m1"]
+    assert stalled.closed_with is None and hub.stats()["connections"] == 2
+
+
+def test_stalled_sends_time_out():
+    async def scenario():
+        hub = NotificationHub(send_timeout=0.05)
+        hub.start()
+        socket = StalledSocket()
+        hub.subscribe(1, socket)
+        hub.publish(1, "m0")
+        await asyncio.sleep(0.2)
+        return hub, socket
+
+    hub, socket = asyncio.run(scenario())
+    assert socket.closed_with == CLOSE_TRY_AGAIN_LATER and hub.stats()["connections"] == 0
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.posts import Post
+from app.models.user_models import User
+from app.utils.pagination import decode_cursor, encode_cursor, paginate
+from tests.conftest import register_and_login
+
+
+def seed_posts(db, count, same_timestamp_every=3):
+    owner = User(username="autor", email="autor@example.com", hashed_password="x")
+    db.add(owner)
+    db.flush()
+    base = datetime(2025, 1, 1)
+    for i in range(count):
+        # Varias publicaciones comparten fecha para comprobar el desempate por id
+        db.add(Post(
+            title=f"Post {i}",
+            content="contenido",
+            owner_id=owner.id,
+            fecha_creacion=base + timedelta(minutes=i // same_timestamp_every),
+        ))
+    db.commit()
+
+
+def test_cursor_roundtrip_keeps_datetimes():
+    values = [datetime(2025, 5, 1, 12, 30), 42]
+    assert decode_cursor(encode_cursor(values)) == values
+    with pytest.raises(ValueError):
+        decode_cursor("no-es-un-cursor")
+
+
+@pytest.mark.parametrize("payload", [[{"dt": 1}, 2], [{"dt": "2025-01-01", "x": 1}, 2], [{"a": 1}, 2], [[1], 2]])
+def test_cursor_rejects_non_scalar_values(payload):
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(payload))
+
+
+def test_keyset_pages_cover_every_row_once(db_session):
+    seed_posts(db_session, 25)
+    keys = (Post.fecha_creacion, Post.id)
+    seen, cursor = [], None
+    while True:
+        page = paginate(db_session.query(Post), limit=7, cursor=cursor, keys=keys)
+        seen.extend(post.id for post in page.items)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert len(seen) == len(set(seen)) == 25
+    expected = [p.id for p in db_session.query(Post).order_by(Post.fecha_creacion.desc(), Post.id.desc())]
+    assert seen == expected
+
+
+def test_offset_pagination_is_unchanged_without_keys(db_session):
+    seed_posts(db_session, 5)
+    assert len(paginate(db_session.query(Post), skip=3, limit=10)) == 2
+
+
+def test_list_posts_returns_next_cursor(api_client):
+    _, headers = register_and_login(api_client)
+    for i in range(3):
+        response = api_client.post("/api/posts/", json={"title": f"T{i}", "content": "c"}, headers=headers)
+        assert response.status_code == 201, response.text
+
+    first = api_client.get("/api/posts/", params={"limit": 2}).json()
+    assert [p["title"] for p in first["posts"]] == ["T2", "T1"]
+    assert first["next_cursor"]
+
+    second = api_client.get("/api/posts/", params={"limit": 2, "cursor": first["next_cursor"]}).json()
+    assert [p["title"] for p in second["posts"]] == ["T0"]
+    assert second["next_cursor"] is None
+
+    assert api_client.get("/api/posts/", params={"cursor": "%%%"}).status_code == 400
+    assert api_client.get("/api/posts/", params={"cursor": encode_cursor([{"dt": 1}, 2])}).status_code == 400
@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from app.security import get_password_hash
+from app.services.password_hashing import PasswordHasher, PasswordHasherBusy
+
+
+def test_inline_hash_and_verify():
+    hasher = PasswordHasher(inline=True)
+
+    async def run():
+        hashed = await hasher.hash("Testpassword123!")
+        return (
+            await hasher.verify("Testpassword123!", hashed),
+            await hasher.verify("otra-clave", hashed),
+        )
+
+    assert asyncio.run(run()) == (True, False)
+
+
+def test_process_pool_verifies_existing_hash():
+    hasher = PasswordHasher(max_workers=1, inline=False)
+    hashed = get_password_hash("Testpassword123!")
+    try:
+        assert asyncio.run(hasher.verify("Testpassword123!", hashed)) is True
+        assert hasher.pending == 0
+    finally:
+        hasher.shutdown()
+
+
+def test_queue_depth_limit_rejects_extra_work():
+    hasher = PasswordHasher(max_workers=1, max_pending=1, inline=False)
+
+    async def run():
+        first = asyncio.create_task(hasher.hash("uno"))
+        await asyncio.sleep(0)
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.hash("dos")
+        await first
+
+    try:
+        asyncio.run(run())
+    finally:
+        hasher.shutdown()
@@ -0,0 +1,34 @@
+from app.models.posts import Post
+from app.models.user_models import User, UserProfile
+
+
+def seed_authors_with_posts(db, authors=20, posts_per_author=5):
+    for a in range(authors):
+        user = User(username=f"autor{a}", email=f"autor{a}@example.com", hashed_password="x")
+        user.profile = UserProfile(full_name=f"Autor {a}", avatar_url=f"https://cdn/a{a}.png")
+        db.add(user)
+        db.flush()
+        for p in range(posts_per_author):
+            db.add(Post(title=f"{a}-{p}", content="c", owner_id=user.id))
+    db.commit()
+
+
+def test_post_page_loads_owners_in_constant_queries(api_client, db_session):
+    seed_authors_with_posts(db_session)
+
+    response = api_client.get("/api/posts/", params={"limit": 100})
+    assert response.status_code == 200
+    posts = response.json()["posts"]
+    assert len(posts) == 100
+    assert all(p["owner"]["full_name"].startswith("Autor ") for p in posts)
+    assert int(response.headers["X-SQL-Query-Count"]) <= 3
+
+
+def test_get_post_includes_owner_profile(api_client, db_session):
+    seed_authors_with_posts(db_session, authors=1, posts_per_author=1)
+    post_id = db_session.query(Post.id).scalar()
+
+    response = api_client.get(f"/api/posts/{post_id}")
+    assert response.status_code == 200
+    assert response.json()["owner"]["avatar_url"] == "https://cdn/a0.png"
+    assert int(response.headers["X-SQL-Query-Count"]) <= 2
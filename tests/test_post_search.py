@@ -0,0 +1,59 @@
+from app.services.post_search import fts5_query, tsquery
+from tests.conftest import register_and_login
+
+
+def create_post(client, headers, title, content, is_published=True):
+    response = client.post(
+        "/api/posts/", json={"title": title, "content": content, "is_published": is_published}, headers=headers
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["id"]
+
+
+def search(client, **params):
+    response = client.get("/api/posts/search", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_search_ranks_title_matches_first_and_follows_updates(api_client):
+    author, headers = register_and_login(api_client)
+    other, other_headers = register_and_login(api_client)
+    in_content = create_post(api_client, headers, "Paisaje", "Un vídeo de montañas al atardecer")
+    in_title = create_post(api_client, other_headers, "Montañas nevadas", "Timelapse")
+    create_post(api_client, headers, "Borrador montañas", "x", is_published=False)
+    create_post(api_client, headers, "Ciudad", "Tráfico nocturno")
+
+    ids = [post["id"] for post in search(api_client, q="montanas")["posts"]]
+    assert ids == [in_title, in_content]
+    assert [p["id"] for p in search(api_client, q="montañas", username=author["username"])["posts"]] == [in_content]
+    assert [p["id"] for p in search(api_client, title="montañas")["posts"]] == [in_title]
+
+    # El índice se mantiene al editar y al borrar
+    api_client.put(f"/api/posts/{in_content}", json={"content": "Solo mar"}, headers=headers)
+    assert [p["id"] for p in search(api_client, q="montañas")["posts"]] == [in_title]
+    assert [p["id"] for p in search(api_client, q="mar")["posts"]] == [in_content]
+    api_client.delete(f"/api/posts/{in_title}", headers=other_headers)
+    assert search(api_client, q="montañas")["posts"] == []
+
+
+def test_search_cursor_pagination_and_errors(api_client):
+    _, headers = register_and_login(api_client)
+    created = {create_post(api_client, headers, f"Gato {i}", "gato " * (i + 1)) for i in range(5)}
+
+    seen, cursor = [], None
+    while True:
+        page = search(api_client, q="gato", limit=2, **({"cursor": cursor} if cursor else {}))
+        seen += [post["id"] for post in page["posts"]]
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+    assert len(seen) == 5 and set(seen) == created
+
+    assert api_client.get("/api/posts/search", params={"q": "!!"}).status_code == 400
+    assert api_client.get("/api/posts/search", params={"q": "gato", "cursor": "roto"}).status_code == 400
+
+
+def test_query_builders_strip_engine_syntax():
+    assert fts5_query('gato" OR *', None, "perro") == '"gato" AND "OR" AND content : "perro"'
+    assert tsquery("gato & !perro", "sol", None) == "gato & perro & sol:A"
@@ -0,0 +1,133 @@
+import asyncio
+import io
+import json
+import logging
+import queue
+from logging.handlers import QueueListener
+
+from fastapi import Depends, FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app import logging_config
+from app.logging_config import DroppingQueueHandler, JsonFormatter, RequestIdFilter
+from app.middlewares.request_context import RequestContextMiddleware, get_request_id
+
+
+def build_app():
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware)
+
+    @app.get("/id")
+    async def current_id():
+        return {"request_id": get_request_id()}
+
+    def fake_identity(request: Request):
+        request.state.user_id = 7
+
+    @app.get("/items/{item_id}", dependencies=[Depends(fake_identity)])
+    async def item(item_id: int):
+        return {"id": item_id}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                await asyncio.sleep(0)
+                yield f"{i}\n".encode()
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+def test_request_id_timing_and_single_log_line(caplog):
+    client = TestClient(build_app())
+    with caplog.at_level(logging.INFO, logger="visart-backend"):
+        response = client.get("/id")
+
+    request_id = response.headers["X-Request-ID"]
+    assert response.json() == {"request_id": request_id}
+    assert response.headers["X-Response-Time"].endswith("s")
+    records = [r for r in caplog.records if r.name == "visart-backend"]
+    assert len(records) == 1 and records[0].getMessage().startswith("GET /id 200 ")
+    assert records[0].request_id == request_id
+
+    # Se respeta el id recibido de un proxy
+    assert client.get("/id", headers={"X-Request-ID": "abc123"}).json() == {"request_id": "abc123"}
+
+
+def test_streaming_responses_pass_through():
+    response = TestClient(build_app()).get("/stream")
+    assert response.status_code == 200
+    assert response.text == "0\n1\n2\n"
+    assert "X-Request-ID" in response.headers
+
+
+def test_structured_record_uses_route_template_and_user_id(caplog):
+    client = TestClient(build_app())
+    with caplog.at_level(logging.INFO, logger="visart-backend"):
+        client.get("/items/42")
+
+    [record] = [r for r in caplog.records if r.name == "visart-backend"]
+    assert record.method == "GET"
+    assert record.path == "/items/{item_id}"
+    assert record.status == 200
+    assert record.duration_ms >= 0
+    assert record.user_id == 7
+
+
+def test_2xx_sampling_keeps_errors_and_slow_requests(caplog, monkeypatch):
+    monkeypatch.setattr(logging_config, "LOG_SAMPLE_RATE_2XX", 0.0)
+    client = TestClient(build_app())
+    with caplog.at_level(logging.INFO, logger="visart-backend"):
+        client.get("/id")
+        client.get("/missing")
+        client.get("/items/abc")
+
+    records = [r for r in caplog.records if r.name == "visart-backend"]
+    assert [(r.status, r.levelno) for r in records] == [(404, logging.WARNING), (422, logging.WARNING)]
+
+    assert logging_config.should_log_request(200, logging_config.LOG_SLOW_REQUEST_MS)
+    assert logging_config.should_log_request(503, 1.0)
+    assert not logging_config.should_log_request(200, 1.0)
+
+
+def test_queue_pipeline_writes_json_lines_in_background():
+    stream = io.StringIO()
+    output = logging.StreamHandler(stream)
+    output.setFormatter(JsonFormatter())
+    handler = DroppingQueueHandler(queue.Queue(maxsize=10))
+    handler.addFilter(RequestIdFilter())
+    listener = QueueListener(handler.queue, output)
+
+    log = logging.getLogger("visart-backend.test-queue")
+    log.propagate = False
+    log.addHandler(handler)
+    listener.start()
+    try:
+        log.warning("GET %s %s", "/api/posts/{post_id}", 500, extra={"status": 500, "user_id": None})
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            log.exception("fallo")
+    finally:
+        listener.stop()
+        log.removeHandler(handler)
+
+    first, second = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert first["message"] == "GET /api/posts/{post_id} 500"
+    assert first["level"] == "WARNING" and first["status"] == 500 and first["user_id"] is None
+    assert "RuntimeError: boom" in second["exc_info"]
+
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    log = logging.getLogger("visart-backend.test-full")
+    log.propagate = False
+    log.addHandler(handler)
+    try:
+        log.warning("uno")
+        log.warning("dos")
+    finally:
+        log.removeHandler(handler)
+    assert handler.queue.qsize() == 1 and handler.dropped == 1
@@ -0,0 +1,65 @@
+from app.services.like_counter import like_counter
+from app.services.response_cache import MemoryResponseCache, response_cache
+from tests.conftest import register_and_login
+
+
+def list_page(client, **params):
+    response = client.get("/api/posts/", params=params)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_memory_cache_lru_by_bytes_and_tags():
+    cache = MemoryResponseCache(ttl_seconds=60, max_bytes=10)
+    cache.set("a", b"1234", tags=["post:1"])
+    cache.set("b", b"1234", tags=["post:2"])
+    assert cache.get("a") == b"1234"
+    cache.set("c", b"1234", tags=["post:1"])  # expulsa "b", la menos usada
+
+    assert cache.get("b") is None
+    assert cache.stats()["bytes"] == 8 and cache.stats()["evictions"] == 1
+    cache.invalidate("post:1")
+    assert cache.get("a") is None and cache.get("c") is None
+    assert cache.stats()["bytes"] == 0
+
+
+def test_post_pages_are_cached_and_invalidated_precisely(api_client):
+    _, headers = register_and_login(api_client)
+    ids = [
+        api_client.post("/api/posts/", json={"title": f"T{i}", "content": "c"}, headers=headers).json()["id"]
+        for i in range(4)
+    ]
+
+    first = list_page(api_client, limit=2)
+    assert first.headers["X-Cache"] == "MISS"
+    assert list_page(api_client, limit=2).headers["X-Cache"] == "HIT"
+    cursor = first.json()["next_cursor"]
+    list_page(api_client, limit=2, cursor=cursor)
+
+    # Una publicación nueva solo invalida la primera página
+    new_id = api_client.post("/api/posts/", json={"title": "Nueva", "content": "c"}, headers=headers).json()["id"]
+    refreshed = list_page(api_client, limit=2)
+    assert refreshed.headers["X-Cache"] == "MISS" and refreshed.json()["posts"][0]["id"] == new_id
+    assert list_page(api_client, limit=2, cursor=cursor).headers["X-Cache"] == "HIT"
+
+    # Editar invalida solo las páginas que contienen la publicación
+    api_client.put(f"/api/posts/{ids[0]}", json={"title": "Editado"}, headers=headers)
+    second = list_page(api_client, limit=2, cursor=cursor)
+    assert second.headers["X-Cache"] == "MISS"
+    assert [p["title"] for p in second.json()["posts"]] == ["T1", "Editado"]
+    assert list_page(api_client, limit=2).headers["X-Cache"] == "HIT"
+
+    # Ocultar una publicación invalida todas las páginas de ambas listas
+    api_client.put(f"/api/posts/{ids[3]}", json={"is_published": False}, headers=headers)
+    assert list_page(api_client, limit=2, cursor=cursor).headers["X-Cache"] == "MISS"
+    assert ids[3] in [p["id"] for p in list_page(api_client, is_published=False).json()["posts"]]
+
+    # Volcar likes no cambia nada de lo que muestran las páginas: siguen en caché
+    api_client.post(f"/api/posts/{new_id}/like", headers=headers)
+    list_page(api_client, limit=2)
+    like_counter.flush()
+    assert list_page(api_client, limit=2).headers["X-Cache"] == "HIT"
+
+    api_client.delete(f"/api/posts/{new_id}", headers=headers)
+    assert new_id not in [p["id"] for p in list_page(api_client, limit=2).json()["posts"]]
+    assert response_cache.stats()["hits"] >= 3
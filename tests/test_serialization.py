@@ -0,0 +1,38 @@
+import json
+from datetime import datetime
+
+from fastapi.responses import JSONResponse
+
+from app.models.posts import Post
+from app.models.user_models import User
+from app.schemas.post import PostListResponse
+from app.utils.responses import FastJSONResponse, success_response
+from app.utils.serialization import dump_post_list
+
+
+def test_fast_response_renders_same_json_as_json_response():
+    content = {"success": True, "data": {"id": 1, "title": "Título ñ", "tags": ["a", "b"], "score": 1.5, "x": None}}
+    assert json.loads(FastJSONResponse(content).body) == json.loads(JSONResponse(content).body)
+    assert b" " not in FastJSONResponse({"a": [1, 2]}).body
+
+    response = success_response({"id": 1}, status_code=201)
+    assert response.status_code == 201
+    assert response.headers["content-type"] == "application/json"
+    assert json.loads(response.body) == {"success": True, "data": {"id": 1}}
+
+
+def test_dump_post_list_matches_response_model():
+    now = datetime(2025, 9, 1, 12, 30)
+    owner = User(id=3, username="autora", email="autora@example.com", fecha_creacion=now)
+    posts = [
+        Post(
+            id=i, title=f"t{i}", content="c", is_published=True, owner_id=3, owner=owner,
+            fecha_creacion=now, fecha_actualizacion=now,
+        )
+        for i in (2, 1)
+    ]
+
+    body = dump_post_list(posts, 10, "cursor")
+    expected = PostListResponse.model_validate({"posts": posts, "page_size": 10, "next_cursor": "cursor"})
+    assert json.loads(body) == expected.model_dump(mode="json")
+    assert json.loads(body)["posts"][0]["owner"]["username"] == "autora"
@@ -0,0 +1,53 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.utils.singleflight import SingleFlight
+
+
+def run_concurrently(flight, fn, workers=20):
+    barrier = threading.Barrier(workers)
+
+    def call():
+        barrier.wait()
+        return flight.do("clave", fn)
+
+    with ThreadPoolExecutor(workers) as pool:
+        return [f.result() if not f.exception() else f.exception() for f in [pool.submit(call) for _ in range(workers)]]
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    def slow_fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"id": 1}
+
+    results = run_concurrently(flight, slow_fetch)
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {"enabled": True, "in_flight": 0, "executions": 1, "shared": 19}
+
+    # No es una caché: una llamada posterior vuelve a ejecutarse
+    flight.do("clave", slow_fetch)
+    assert len(calls) == 2
+
+
+def test_errors_are_shared_and_disabled_flight_passes_through():
+    flight = SingleFlight()
+
+    def failing():
+        time.sleep(0.2)
+        raise LookupError("no existe")
+
+    results = run_concurrently(flight, failing, workers=5)
+    assert all(isinstance(result, LookupError) for result in results)
+    assert flight.stats()["executions"] == 1
+
+    disabled = SingleFlight(enabled=False)
+    with pytest.raises(LookupError):
+        disabled.do("clave", failing)
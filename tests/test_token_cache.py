@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from app import security
+
+
+def test_verified_token_is_served_from_cache():
+    security.clear_token_cache()
+    token = security.create_access_token({"sub": "ana", "is_admin": True})
+    before = security.token_cache_stats()
+
+    assert security.get_username_from_token(token) == "ana"
+    assert security.validate_token(token) is True
+    assert security.is_admin_user(token) is True
+
+    after = security.token_cache_stats()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 2
+
+
+def test_cached_payload_cannot_be_mutated_by_callers():
+    security.clear_token_cache()
+    token = security.create_access_token({"sub": "ana"})
+    security.verify_token(token)["sub"] = "otro"
+    assert security.verify_token(token)["sub"] == "ana"
+
+
+def test_expired_and_tampered_tokens_are_rejected():
+    security.clear_token_cache()
+    expired = security.create_access_token({"sub": "ana"}, expires_delta=timedelta(seconds=-1))
+    assert security.verify_token(expired) is None
+
+    token = security.create_access_token({"sub": "ana"})
+    assert security.verify_token(token.rsplit(".", 1)[0] + ".firmainvalida") is None
+    assert security.token_cache_stats()["size"] == 0
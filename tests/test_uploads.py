@@ -0,0 +1,112 @@
+import hashlib
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.media_models import Upload
+from app.services.uploads import claim_chunk, release_claim
+from tests.conftest import put_chunk, register_and_login, start_upload, upload_checksum
+
+
+pytestmark = pytest.mark.usefixtures("media_root")
+
+
+def test_chunked_upload_resumes_and_stores_by_content(api_client, media_root):
+    _, headers = register_and_login(api_client)
+    data = os.urandom(300_000)
+    upload = start_upload(api_client, headers, data)
+    assert upload["offset"] == 0 and upload["url"] is None
+
+    assert put_chunk(api_client, upload, 0, data[:100_000], headers).json()["offset"] == 100_000
+    # Reanudar: el servidor dice desde dónde seguir
+    status = api_client.get(upload["upload_url"], headers=headers)
+    assert status.json()["offset"] == 100_000 and status.headers["Upload-Offset"] == "100000"
+    # Un fragmento fuera de sitio no se escribe
+    conflict = put_chunk(api_client, upload, 0, data[:100_000], headers)
+    assert conflict.status_code == 409 and conflict.headers["Upload-Offset"] == "100000"
+
+    done = put_chunk(api_client, upload, 100_000, data[100_000:], headers).json()
+    sha256 = hashlib.sha256(data).hexdigest()
+    assert (done["status"], done["offset"], done["sha256"]) == ("complete", len(data), sha256)
+    assert done["url"] == f"/api/assets/{sha256}.mp4"
+    assert (media_root / "assets" / sha256[:2] / sha256[2:4] / f"{sha256}.mp4").read_bytes() == data
+    assert os.listdir(media_root / "uploads") == []
+
+
+def test_bad_checksum_discards_the_chunk(api_client, media_root):
+    _, headers = register_and_login(api_client)
+    data = os.urandom(50_000)
+    upload = start_upload(api_client, headers, data)
+
+    rejected = put_chunk(api_client, upload, 0, data, headers, checksum=upload_checksum(b"otra cosa"))
+    assert rejected.status_code == 400
+    assert api_client.get(upload["upload_url"], headers=headers).json()["offset"] == 0
+    assert os.path.getsize(media_root / "uploads" / f"{upload['upload_id']}.part") == 0
+    assert put_chunk(api_client, upload, 0, data, headers,
+                     checksum="sha256 " + hashlib.sha256(data).hexdigest()).json()["status"] == "complete"
+
+
+def test_identical_content_is_deduplicated(api_client, media_root):
+    _, headers = register_and_login(api_client)
+    _, other_headers = register_and_login(api_client)
+    data = os.urandom(20_000)
+    first = start_upload(api_client, headers, data)
+    url = put_chunk(api_client, first, 0, data, headers).json()["url"]
+
+    # Anunciando el hash no hay nada que enviar
+    known = start_upload(api_client, other_headers, data, sha256=hashlib.sha256(data).hexdigest())
+    assert (known["status"], known["url"]) == ("complete", url)
+    # Sin anunciarlo se envía, pero se guarda una sola copia
+    again = start_upload(api_client, other_headers, data)
+    assert put_chunk(api_client, again, 0, data, other_headers).json()["url"] == url
+    assert sum(len(files) for _, _, files in os.walk(media_root / "assets")) == 1
+
+
+def test_uploads_are_private_and_validated(api_client):
+    _, headers = register_and_login(api_client)
+    _, other_headers = register_and_login(api_client)
+    data = b"x" * 10
+    upload = start_upload(api_client, headers, data)
+    assert api_client.get(upload["upload_url"], headers=other_headers).status_code == 404
+    assert put_chunk(api_client, upload, 0, data, other_headers).status_code == 404
+    assert put_chunk(api_client, upload, 0, data + b"y", headers).status_code == 413
+
+    for media_type in ("application/octet-stream", "image/svg+xml", "text/html", "video/x-unknown"):
+        body = {"filename": "a.svg", "media_type": media_type, "size": 10}
+        assert api_client.post("/api/uploads", json=body, headers=headers).status_code == 415
+    body = {"filename": "a.mp4", "media_type": "Video/MP4; codecs=avc1", "size": 10}
+    assert api_client.post("/api/uploads", json=body, headers=headers).json()["media_type"] == "video/mp4"
+    assert api_client.delete(upload["upload_url"], headers=headers).status_code == 204
+    assert api_client.get(upload["upload_url"], headers=headers).status_code == 404
+
+
+def test_only_one_put_writes_at_a_time(api_client, db_session, media_root):
+    _, headers = register_and_login(api_client)
+    data = os.urandom(40_000)
+    upload = start_upload(api_client, headers, data)
+    assert put_chunk(api_client, upload, 0, data[:20_000], headers).status_code == 200
+
+    # Otro PUT del mismo fragmento sigue escribiendo: el reintento no toca el fichero
+    token = claim_chunk(db_session, upload["upload_id"], 20_000)
+    assert token is not None and claim_chunk(db_session, upload["upload_id"], 20_000) is None
+    retry = put_chunk(api_client, upload, 20_000, data[20_000:], headers)
+    assert retry.status_code == 409 and retry.headers["Upload-Offset"] == "20000"
+    assert os.path.getsize(media_root / "uploads" / f"{upload['upload_id']}.part") == 20_000
+
+    # Un fallo del que tiene la reserva la libera sin mover el offset
+    failed = put_chunk(api_client, upload, 20_000, data[20_000:], headers, checksum=upload_checksum(b"x"))
+    assert failed.status_code == 409
+    release_claim(db_session, upload["upload_id"], token)
+    failed = put_chunk(api_client, upload, 20_000, data[20_000:], headers, checksum=upload_checksum(b"x"))
+    assert failed.status_code == 400
+    assert api_client.get(upload["upload_url"], headers=headers).json()["offset"] == 20_000
+
+    # Una reserva vencida (el proceso que la tenía murió) se puede retomar
+    assert claim_chunk(db_session, upload["upload_id"], 20_000) is not None
+    db_session.query(Upload).filter_by(id=upload["upload_id"]).update(
+        {Upload.writing_until: datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db_session.commit()
+    done = put_chunk(api_client, upload, 20_000, data[20_000:], headers).json()
+    assert (done["status"], done["sha256"]) == ("complete", hashlib.sha256(data).hexdigest())
@@ -0,0 +1,53 @@
+import csv
+import io
+import json
+
+from app.models.posts import Post
+from app.services import user_export
+from tests.conftest import register_and_login
+
+
+def test_ndjson_export_streams_all_sections_in_batches(api_client, db_session, monkeypatch):
+    monkeypatch.setattr(user_export, "EXPORT_BATCH_SIZE", 2)
+    user, headers = register_and_login(api_client)
+    other, other_headers = register_and_login(api_client)
+    db_session.add_all(
+        [Post(title=f"p{i}", content="c", owner_id=user["id"]) for i in range(5)]
+        + [Post(title="ajena", content="c", owner_id=other["id"])]
+    )
+    db_session.commit()
+    assert api_client.post(f"/api/users/{other['id']}/follow", headers=headers).status_code == 201
+    assert api_client.post(f"/api/users/{user['id']}/follow", headers=other_headers).status_code == 201
+
+    response = api_client.get("/api/users/me/export", headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert "attachment" in response.headers["content-disposition"]
+
+    records = [json.loads(line) for line in response.text.splitlines()]
+    by_type = {}
+    for record in records:
+        by_type.setdefault(record["type"], []).append(record)
+    assert [r["username"] for r in by_type["profile"]] == [user["username"]]
+    assert [r["title"] for r in by_type["posts"]] == [f"p{i}" for i in range(5)]
+    assert [r["username"] for r in by_type["following"]] == [other["username"]]
+    assert [r["username"] for r in by_type["followers"]] == [other["username"]]
+
+
+def test_csv_export_of_one_section(api_client, db_session):
+    user, headers = register_and_login(api_client)
+    db_session.add_all([Post(title="uno, dos", content="línea\nsegunda", owner_id=user["id"])])
+    db_session.commit()
+
+    response = api_client.get("/api/users/me/export", params={"format": "csv", "section": "posts"}, headers=headers)
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [(r["title"], r["content"]) for r in rows] == [("uno, dos", "línea\nsegunda")]
+
+    empty = api_client.get("/api/users/me/export", params={"format": "csv", "section": "followers"}, headers=headers)
+    assert empty.text.strip() == "user_id,username,fecha_creacion"
+
+    assert api_client.get("/api/users/me/export", params={"format": "xml"}, headers=headers).status_code == 400
+    assert api_client.get("/api/users/me/export", params={"format": "csv", "section": "x"}, headers=headers).status_code == 400
+    assert api_client.get("/api/users/me/export").status_code == 401
@@ -0,0 +1,64 @@
+from app.models.user_models import User, UserProfile
+from app.schemas.user_schemas import UserSearchFilters
+from app.services.user_search import UserPrefixIndex, search_users, user_index
+from tests.conftest import register_and_login
+
+
+def usernames(client, headers, **params):
+    response = client.get("/api/users/search", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+    return [user["username"] for user in response.json()["users"]]
+
+
+def test_prefix_index_orders_and_updates_incrementally():
+    index = UserPrefixIndex()
+    index.upsert(1, "anabel", "Ana Belén")
+    index.upsert(2, "Ana", None)
+    index.upsert(3, "bruno", "Ángela Ruiz")
+    index.upsert(4, "carlos", "Ana García")
+
+    # Primero los username que encajan (orden alfabético), después los nombres
+    assert index.search("ana") == [2, 1, 4]
+    assert index.search("ANA GAR") == [4]
+    assert index.search("ruiz") == [3]
+    assert index.search("angel", limit=1) == [3]
+
+    index.upsert(2, "zoe", None)
+    index.upsert(1, "anabel", "Ana Belén", is_active=False)
+    assert index.search("ana") == [4]
+    index.remove(4)
+    assert index.search("ana") == [] and len(index) == 2
+
+
+def test_search_endpoint_uses_index_and_db_fallback(api_client, db_session):
+    _, headers = register_and_login(api_client, username="marta_r")
+    register_and_login(api_client, username="martin")
+    register_and_login(api_client, username="pablo")
+
+    user = db_session.query(User).filter(User.username == "pablo").one()
+    db_session.add(UserProfile(user_id=user.id, full_name="Pablo Martínez", location="Madrid"))
+    db_session.commit()
+
+    # Sin índice cargado: consulta a la base de datos
+    user_index.clear()
+    assert usernames(api_client, headers, q="mart") == ["marta_r", "martin", "pablo"]
+
+    user_index.rebuild_from_bind()
+    assert usernames(api_client, headers, q="Mart", limit=2) == ["marta_r", "martin"]
+    assert usernames(api_client, headers, q="martinez") == ["pablo"]
+    assert usernames(api_client, headers, q="mart", location="mad") == ["pablo"]
+
+    # El registro actualiza el índice sin reconstruirlo
+    register_and_login(api_client, username="martina")
+    assert usernames(api_client, headers, q="martin") == ["martin", "martina", "pablo"]
+
+    api_client.delete("/api/users/me", headers=headers)
+    _, other_headers = register_and_login(api_client)
+    assert usernames(api_client, other_headers, q="marta") == []
+    # Los filtros que revelan cuentas son solo para administradores
+    for params in ({"is_active": False}, {"email": "marta_r@example.com"}):
+        forbidden = api_client.get("/api/users/search", params={"q": "marta", **params}, headers=other_headers)
+        assert forbidden.status_code == 403
+    inactive = search_users(db_session, "marta", UserSearchFilters(is_active=False))
+    assert [user.username for user in inactive] == ["marta_r"]
+    assert api_client.get("/api/users/search", params={"q": "m"}).status_code == 401
@@ -0,0 +1,45 @@
+from app.models.user_models import User
+from app.services.user_stats import reconcile_user_stats
+from tests.conftest import register_and_login
+
+
+def read_stats(client, user_id):
+    response = client.get(f"/api/users/{user_id}/stats")
+    assert response.status_code == 200, response.text
+    data = response.json()
+    return data["post_count"], data["follower_count"], data["following_count"]
+
+
+def test_counters_follow_posts_and_follows(api_client):
+    author, author_headers = register_and_login(api_client)
+    reader, reader_headers = register_and_login(api_client)
+
+    post_ids = [
+        api_client.post("/api/posts/", json={"title": f"T{i}", "content": "c"}, headers=author_headers).json()["id"]
+        for i in range(3)
+    ]
+    api_client.post(f"/api/users/{author['id']}/follow", headers=reader_headers)
+    assert read_stats(api_client, author["id"]) == (3, 1, 0)
+    assert read_stats(api_client, reader["id"]) == (0, 0, 1)
+
+    api_client.delete(f"/api/posts/{post_ids[0]}", headers=author_headers)
+    api_client.delete(f"/api/users/{author['id']}/follow", headers=reader_headers)
+    assert read_stats(api_client, author["id"]) == (2, 0, 0)
+    assert read_stats(api_client, reader["id"]) == (0, 0, 0)
+
+    assert api_client.get("/api/users/999999/stats").status_code == 404
+
+
+def test_reconciliation_fixes_drift_in_batches(api_client, db_session):
+    author, author_headers = register_and_login(api_client)
+    reader, reader_headers = register_and_login(api_client)
+    api_client.post("/api/posts/", json={"title": "T", "content": "c"}, headers=author_headers)
+    api_client.post(f"/api/users/{author['id']}/follow", headers=reader_headers)
+
+    db_session.query(User).update({User.post_count: 40, User.follower_count: 0, User.following_count: 7})
+    db_session.commit()
+
+    assert reconcile_user_stats(db_session, batch_size=1) == 2
+    assert read_stats(api_client, author["id"]) == (1, 1, 0)
+    assert read_stats(api_client, reader["id"]) == (0, 0, 1)
+    assert reconcile_user_stats(db_session, batch_size=1) == 0
@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+
+import pytest
+
+import app.jobs  # noqa: F401  (registra los handlers, como hace el worker)
+from app.models.posts import Post
+from app.routes import videos as video_routes
+from app.services import videos
+from app.services.job_queue import claim_jobs, run_job
+from app.services.video_renderer import RenderRequest, render_placeholder
+from tests.conftest import register_and_login
+
+
+@pytest.fixture(autouse=True)
+def fast_events(media_root, monkeypatch):
+    monkeypatch.setattr(video_routes, "VIDEO_EVENTS_POLL_SECONDS", 0.01)
+
+
+def run_pending_video_jobs(db_session):
+    for job in claim_jobs(db_session, "test-worker", kinds=[videos.VIDEO_JOB_KIND]):
+        assert run_job(db_session, job)
+
+
+def test_submitted_video_is_rendered_and_published(api_client, db_session, media_root):
+    user, headers = register_and_login(api_client)
+    response = api_client.post("/api/videos", json={"prompt": "un gato en la luna", "duration_seconds": 1},
+                               headers=headers)
+    assert response.status_code == 202, response.text
+    job = response.json()
+    assert job["status"] == "queued" and job["post_id"] is None
+    assert job["status_url"] == f"/api/videos/{job['job_id']}"
+
+    run_pending_video_jobs(db_session)
+
+    done = api_client.get(job["status_url"], headers=headers).json()
+    assert (done["status"], done["progress"]) == ("succeeded", 100)
+    post = db_session.get(Post, done["post_id"])
+    assert post.owner_id == user["id"] and post.video_url == done["video_url"]
+    assert api_client.get(f"/api/posts/{post.id}", headers=headers).json()["video_url"] == done["video_url"]
+
+    # Nombre = SHA-256 del contenido; se sirve como asset
+    video = api_client.get(done["video_url"])
+    assert video.status_code == 200 and video.headers["content-type"] == "video/x-yuv4mpeg"
+    assert done["video_url"] == f"/api/assets/{hashlib.sha256(video.content).hexdigest()}.y4m"
+    assert os.listdir(media_root / "uploads") == []
+
+
+def test_placeholder_renderer_is_deterministic(tmp_path):
+    request = RenderRequest(prompt="olas", width=64, height=36, fps=4, duration_seconds=1)
+    outputs, progress = [], []
+    for name in ("a.y4m", "b.y4m"):
+        with open(tmp_path / name, "wb") as output:
+            result = render_placeholder(request, output, progress.append)
+        outputs.append((tmp_path / name).read_bytes())
+    assert result.frames == 4 and progress[:4] == [0.25, 0.5, 0.75, 1.0]
+    assert outputs[0] == outputs[1] and outputs[0].startswith(b"YUV4MPEG2 W64 H36")
+
+
+def test_backpressure_limits_pending_videos(api_client, monkeypatch):
+    _, headers = register_and_login(api_client)
+    _, other_headers = register_and_login(api_client)
+    monkeypatch.setattr(videos, "VIDEO_MAX_PENDING_PER_USER", 1)
+    monkeypatch.setattr(videos, "VIDEO_MAX_PENDING_JOBS", 2)
+
+    assert api_client.post("/api/videos", json={"prompt": "uno"}, headers=headers).status_code == 202
+    per_user = api_client.post("/api/videos", json={"prompt": "dos"}, headers=headers)
+    assert per_user.status_code == 429 and "Retry-After" in per_user.headers
+
+    assert api_client.post("/api/videos", json={"prompt": "tres"}, headers=other_headers).status_code == 202
+    _, third_headers = register_and_login(api_client)
+    full = api_client.post("/api/videos", json={"prompt": "cuatro"}, headers=third_headers)
+    assert full.status_code == 503 and "Retry-After" in full.headers
+
+
+def test_events_stream_ends_with_done(api_client, db_session):
+    _, headers = register_and_login(api_client)
+    _, other_headers = register_and_login(api_client)
+    job = api_client.post("/api/videos", json={"prompt": "bosque", "duration_seconds": 1}, headers=headers).json()
+    assert api_client.get(job["events_url"], headers=other_headers).status_code == 404
+    run_pending_video_jobs(db_session)
+
+    with api_client.stream("GET", job["events_url"], headers=headers) as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        body = "".join(response.iter_text())
+    event, data = body.strip().split("\n")[-2:]
+    assert event == "event: done"
+    assert json.loads(data.removeprefix("data: "))["status"] == "succeeded"